@@ -0,0 +1,35 @@
+"""add domain refresh tracking and expiration index
+
+Revision ID: c4e8a1d93b27
+Revises: a7961fbff1b5
+Create Date: 2025-06-02 10:14:37.512903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1d93b27'
+down_revision: Union[str, None] = 'a7961fbff1b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('domains', sa.Column('last_checked_at', sa.DateTime(), nullable=True))
+    op.add_column('domains', sa.Column('last_changed_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_domains_user_type_expiration',
+        'domains',
+        ['user_id', 'type', 'expiration_date'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_domains_user_type_expiration', table_name='domains')
+    op.drop_column('domains', 'last_changed_at')
+    op.drop_column('domains', 'last_checked_at')
@@ -0,0 +1,31 @@
+"""add dashboard listing index
+
+Revision ID: e2b7f0c91d48
+Revises: c4e8a1d93b27
+Create Date: 2025-06-09 16:42:08.230117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7f0c91d48'
+down_revision: Union[str, None] = 'c4e8a1d93b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_dashboards_user_created',
+        'dashboards',
+        ['user_id', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dashboards_user_created', table_name='dashboards')
@@ -0,0 +1,29 @@
+"""add dashboard version
+
+Revision ID: f5a3c8e27b10
+Revises: e2b7f0c91d48
+Create Date: 2025-06-16 11:05:52.874411
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a3c8e27b10'
+down_revision: Union[str, None] = 'e2b7f0c91d48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'dashboards',
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('dashboards', 'version')
@@ -10,6 +10,7 @@ from . import deribit
 from . import economic
 from . import vix
 from . import auth
+from . import social
 from fastapi import APIRouter
 from .auth import router as auth_router
 from .dashboard import router as dashboard_router
@@ -24,6 +25,7 @@ from .vix import router as vix_router
 from .truthsocial import router as truthsocial_router
 from .ai_chat import router as ai_chat_router
 from .domains import router as domains_router
+from .social import router as social_router
 
 # Export routers
 market_data = market_data
@@ -36,6 +38,7 @@ deribit = deribit
 economic = economic
 vix = vix
 auth = auth
+social = social
 
 router = APIRouter()
 
@@ -52,3 +55,4 @@ router.include_router(vix_router, prefix="/vix", tags=["vix"])
 router.include_router(truthsocial_router, prefix="/truthsocial", tags=["truthsocial"])
 router.include_router(ai_chat_router, prefix="/ai-chat", tags=["ai-chat"])
 router.include_router(domains_router, prefix="/domains", tags=["domains"])
+router.include_router(social_router, prefix="/social", tags=["social"])
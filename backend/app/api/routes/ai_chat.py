@@ -1,4 +1,6 @@
+import json
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from app.api.services.ai_service import AIService
 
@@ -18,3 +20,24 @@ async def chat(message: ChatMessage):
         return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/stream")
+async def chat_stream(message: ChatMessage):
+    """Stream the reply as server-sent events: token, component, done or error"""
+
+    async def events():
+        async for event, data in ai_service.stream_chat_message(message.message):
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/cache/stats")
+async def chat_cache_stats():
+    """Hit rates and size of the prompt-response cache"""
+    return ai_service.cache.get_stats()
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, Depends
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from app.api.services.dashboard_service import DashboardService, VersionConflict
 from app.db.session import get_db
 from app.models.dashboard import Dashboard
 from app.models.user import User
@@ -28,6 +30,42 @@ class DashboardResponse(BaseModel):
     name: str
     components: List[DashboardComponent]
     layouts: Dict[str, List[Dict[str, Any]]]
+    version: int = 1
+
+
+class PatchOperation(BaseModel):
+    """A JSON Patch operation, or add/update/remove_component by id"""
+
+    op: str
+    path: Optional[str] = None
+    value: Any = None
+    from_: Optional[str] = Field(None, alias="from")
+    id: Optional[str] = None
+    component: Optional[Dict[str, Any]] = None
+    props: Optional[Dict[str, Any]] = None
+    layout: Optional[Dict[str, Any]] = None
+
+
+class DashboardPatch(BaseModel):
+    version: int
+    operations: List[PatchOperation]
+
+
+class DashboardPatchResult(BaseModel):
+    id: int
+    version: int
+
+
+class DashboardSummary(BaseModel):
+    id: int
+    name: str
+    component_count: int
+    updated_at: Optional[datetime]
+
+
+class DashboardSummaryPage(BaseModel):
+    data: List[DashboardSummary]
+    next_cursor: Optional[str]
 
 
 @router.post("/", response_model=DashboardResponse)
@@ -49,6 +87,20 @@ async def create_dashboard(
     return db_dashboard
 
 
+@router.get("/summary", response_model=DashboardSummaryPage)
+async def list_dashboard_summaries(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """List the current user's dashboards without components or layouts"""
+    try:
+        return DashboardService(db).list_summaries(current_user.id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/{dashboard_id}", response_model=DashboardResponse)
 async def get_dashboard(
     dashboard_id: int,
@@ -110,12 +162,38 @@ async def update_dashboard(
     db_dashboard.name = dashboard_update.name
     db_dashboard.components = components_data
     db_dashboard.layouts = dashboard_update.layouts
+    db_dashboard.version = Dashboard.version + 1
 
     db.commit()
     db.refresh(db_dashboard)
     return db_dashboard
 
 
+@router.patch("/{dashboard_id}", response_model=DashboardPatchResult)
+async def patch_dashboard(
+    dashboard_id: int,
+    dashboard_patch: DashboardPatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Apply small edits to a dashboard, if it is still at the given version"""
+    operations = [
+        op.model_dump(by_alias=True, exclude_unset=True)
+        for op in dashboard_patch.operations
+    ]
+    try:
+        result = DashboardService(db).patch_dashboard(
+            dashboard_id, current_user.id, dashboard_patch.version, operations
+        )
+    except VersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Dashboard not found")
+    return result
+
+
 @router.delete("/{dashboard_id}")
 async def delete_dashboard(
     dashboard_id: int,
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.api.services.domain_service import DomainService
+from app.api.services.domain_service import (
+    DomainService,
+    parse_domain_csv,
+    refresh_domains,
+)
+from app.api.services.jobs import job_manager
 from app.core.auth import get_current_user
 from app.db.session import get_db
 from app.models.domain import Domain, DomainType
@@ -29,6 +35,16 @@ class DomainResponse(BaseModel):
         from_attributes = True
 
 
+class DomainImport(BaseModel):
+    names: List[str]
+    type: DomainType
+
+
+class BulkRefreshRequest(BaseModel):
+    domain_ids: Optional[List[int]] = None
+    domain_type: Optional[DomainType] = None
+
+
 @router.post("", response_model=DomainResponse)
 def create_domain(
     domain: DomainCreate,
@@ -74,3 +90,84 @@ def refresh_domain_info(
     if domain:
         return domain
     raise HTTPException(status_code=404, detail="Domain not found")
+
+
+@router.post("/refresh")
+async def refresh_all_domains(
+    request: Optional[BulkRefreshRequest] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Start a background WHOIS refresh of many domains; poll the job for progress"""
+    request = request or BulkRefreshRequest()
+    service = DomainService(db)
+    targets = await asyncio.to_thread(
+        service.get_refresh_targets,
+        current_user.id,
+        request.domain_ids,
+        request.domain_type,
+    )
+    job = job_manager.submit(
+        "domain_refresh",
+        lambda job: refresh_domains(job, targets),
+        key=f"domain_refresh:{current_user.id}",
+        owner_id=current_user.id,
+    )
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}")
+def get_domain_job(job_id: str, current_user=Depends(get_current_user)):
+    job = job_manager.get(job_id)
+    if job is None or job.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+async def _start_import(
+    names: List[str], domain_type: DomainType, db: Session, user_id: int
+):
+    service = DomainService(db)
+    try:
+        imported = await asyncio.to_thread(
+            service.import_domains, names, domain_type, user_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    targets = imported["targets"]
+    job = job_manager.submit(
+        "domain_import",
+        lambda job: refresh_domains(job, targets),
+        owner_id=user_id,
+    )
+    return {
+        "job": job.to_dict(),
+        "imported": [name for _, name in targets],
+        "existing": imported["existing"],
+        "invalid": imported["invalid"],
+    }
+
+
+@router.post("/import")
+async def import_domains(
+    request: DomainImport,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Track many domains at once; WHOIS data fills in through the returned job"""
+    return await _start_import(request.names, request.type, db, current_user.id)
+
+
+@router.post("/import/csv")
+async def import_domains_csv(
+    file: UploadFile = File(...),
+    type: DomainType = Form(...),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Track the domains listed in a registrar CSV export"""
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+    return await _start_import(parse_domain_csv(text), type, db, current_user.id)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 from ..services.fred_service import FREDService
 import logging
@@ -16,7 +16,7 @@ async def get_series(series_id: str, limit: int = 10):
             f"Received request for FRED series - series_id: {series_id}, limit: {limit}"
         )
 
-        observations = fred_service.get_series(series_id, limit)
+        observations = await fred_service.get_series(series_id, limit)
         logger.info(f"Successfully retrieved {len(observations)} observations")
 
         return {"data": observations}
@@ -27,6 +27,40 @@ async def get_series(series_id: str, limit: int = 10):
         )
 
 
+@router.get("/batch")
+async def get_series_batch(
+    series_ids: str,
+    frequency: Optional[str] = None,
+    aggregation: str = "mean",
+    fill: Optional[str] = None,
+    spreads: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+):
+    try:
+        logger.info(
+            f"Received request for FRED series batch - series_ids: {series_ids}, "
+            f"frequency: {frequency}, fill: {fill}, spreads: {spreads}"
+        )
+        id_list = [s.strip() for s in series_ids.split(",") if s.strip()]
+        spread_list = [s.strip() for s in (spreads or "").split(",") if s.strip()]
+
+        data = await fred_service.get_series_batch(
+            id_list, frequency, aggregation, fill, spread_list, start, end
+        )
+        logger.info(f"Successfully aligned {len(id_list)} series")
+
+        return {"data": data}
+    except ValueError as e:
+        logger.error(f"Validation error in get_series_batch endpoint: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in get_series_batch endpoint: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Failed to fetch FRED data: {str(e)}"
+        )
+
+
 @router.get("/search")
 async def search_series(search_text: str, limit: int = 10):
     try:
@@ -34,7 +68,7 @@ async def search_series(search_text: str, limit: int = 10):
             f"Received search request - search_text: {search_text}, limit: {limit}"
         )
 
-        results = fred_service.search_series(search_text, limit)
+        results = await fred_service.search_series(search_text, limit)
         logger.info(f"Successfully retrieved {len(results)} search results")
 
         return {"data": results}
@@ -46,12 +80,17 @@ async def search_series(search_text: str, limit: int = 10):
 
 
 @router.get("/releases/upcoming")
-async def get_upcoming_releases(filter_names: Optional[List[str]] = None):
+async def get_upcoming_releases(
+    filter_names: Optional[List[str]] = Query(None),
+    limit: Optional[int] = None,
+    days: Optional[int] = None,
+):
     try:
         logger.info(
-            f"Received request for upcoming FRED releases. Filter: {filter_names}"
+            f"Received request for upcoming FRED releases. Filter: {filter_names}, "
+            f"limit: {limit}, days: {days}"
         )
-        releases = fred_service.get_upcoming_releases(filter_names)
+        releases = await fred_service.get_upcoming_releases(filter_names, limit, days)
         logger.info(f"Successfully retrieved {len(releases)} releases")
         return {"data": releases}
     except Exception as e:
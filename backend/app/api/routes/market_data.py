@@ -1,13 +1,25 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from app.api.services.market_data_service import MarketDataService
+from app.api.services.fx_service import fx_service
 
 router = APIRouter()
-market_data_service = MarketDataService()
+market_data_service = MarketDataService(fx_service)
+
+
+def validate_currency(currency: str) -> str:
+    if not fx_service.supports(currency):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported currency: {currency}. "
+            f"Supported currencies: {', '.join(fx_service.currencies)}",
+        )
+    return currency.upper()
 
 
 @router.get("/prices")
 async def get_prices(symbols: str, currency: str = "CAD"):
     """Get current prices for given symbols"""
+    currency = validate_currency(currency)
     symbol_list = [s.strip() for s in symbols.split(",")]
     prices = await market_data_service.get_current_prices(symbol_list, currency)
     return {"prices": prices}
@@ -18,6 +30,7 @@ async def get_historical_data(
     symbol: str, timeframe: str = "1d", limit: int = 100, currency: str = "CAD"
 ):
     """Get historical OHLCV data for a symbol"""
+    currency = validate_currency(currency)
     data = await market_data_service.get_historical_data(
         symbol, timeframe, limit, currency
     )
@@ -33,3 +46,23 @@ async def get_technical_indicators(
         symbol, timeframe, limit
     )
     return {"indicators": indicators}
+
+
+@router.get("/indicators")
+async def get_technical_indicators_batch(
+    symbols: str, timeframe: str = "1d", limit: int = 100
+):
+    """Get technical indicators for several symbols at once"""
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()]
+    indicators = await market_data_service.get_technical_indicators_batch(
+        symbol_list, timeframe, limit
+    )
+    return {"indicators": indicators}
+
+
+@router.get("/fx-rates")
+async def get_fx_rates(base: str = "USD"):
+    """Get cached conversion rates from a base currency to every supported currency"""
+    base = validate_currency(base)
+    await fx_service.ensure_loaded()
+    return {"base": base, "rates": fx_service.rates_from(base)}
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from ..services.social_service import social_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def _split(values: Optional[str]) -> List[str]:
+    return [v.strip() for v in (values or "").split(",") if v.strip()]
+
+
+@router.get("/timeline")
+async def get_social_timeline(
+    twitter: Optional[str] = Query(
+        None, description="Comma-separated Twitter usernames"
+    ),
+    truthsocial: Optional[str] = Query(
+        None, description="Comma-separated Truth Social usernames or profile URLs"
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    try:
+        logger.info(
+            f"Received request for social timeline - twitter: {twitter}, "
+            f"truthsocial: {truthsocial}, limit: {limit}, cursor: {cursor}"
+        )
+        return await social_service.get_timeline(
+            _split(twitter), _split(truthsocial), limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in get_social_timeline endpoint: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Failed to fetch social timeline: {str(e)}"
+        )
@@ -1,12 +1,11 @@
-import os
-import requests
 from fastapi import APIRouter, HTTPException, Query
-from typing import List
+from typing import List, Optional
+from ..services.truthsocial_service import truthsocial_service
+import logging
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
-APIFY_API_TOKEN = os.getenv("APIFY_API_TOKEN")
-APIFY_ACTOR_ID = "louisdeconinck~truth-social-scraper"
+router = APIRouter()
 
 
 @router.get("/posts")
@@ -14,19 +13,39 @@ async def get_truthsocial_posts(
     identifiers: List[str] = Query(
         ..., description="List of Truth Social usernames or profile URLs"
     ),
+    limit: Optional[int] = None,
 ):
-    if not APIFY_API_TOKEN:
+    if not truthsocial_service.api_token:
         raise HTTPException(
             status_code=500, detail="APIFY_API_TOKEN not set in environment"
         )
 
-    url = f"https://api.apify.com/v2/acts/{APIFY_ACTOR_ID}/run-sync-get-dataset-items?token={APIFY_API_TOKEN}"
-    payload = {"identifiers": identifiers}
     try:
-        response = requests.post(url, json=payload, timeout=60)
-        response.raise_for_status()
-        return response.json()
+        return await truthsocial_service.get_posts(identifiers, limit)
     except Exception as e:
+        logger.error(f"Error in get_truthsocial_posts endpoint: {str(e)}")
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch Truth Social posts: {str(e)}"
         )
+
+
+@router.post("/refresh")
+async def refresh_truthsocial_posts(
+    identifiers: List[str] = Query(
+        ..., description="List of Truth Social usernames or profile URLs"
+    ),
+):
+    """Start a background scrape and return its job"""
+    if not truthsocial_service.api_token:
+        raise HTTPException(
+            status_code=500, detail="APIFY_API_TOKEN not set in environment"
+        )
+    return truthsocial_service.refresh(identifiers).to_dict()
+
+
+@router.get("/jobs/{job_id}")
+async def get_truthsocial_job(job_id: str):
+    job = truthsocial_service.jobs.get(job_id)
+    if job is None or job.kind != "truthsocial":
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
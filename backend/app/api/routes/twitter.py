@@ -1,20 +1,28 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
-from ..services.twitter_service import TwitterService
+from ..services.twitter_service import twitter_service
+from ..services.tweet_filter import parse_filters
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-twitter_service = TwitterService()
 
 
 @router.get("/tweets")
-async def get_user_tweets(usernames: str, limit: int = 10, hours: Optional[int] = None):
+async def get_user_tweets(
+    usernames: str,
+    limit: int = 10,
+    hours: Optional[int] = None,
+    filters: Optional[List[str]] = Query(None),
+    whole_words: bool = False,
+):
+    """``filters`` are repeated ``username:kw1,kw2,-excluded`` values"""
     try:
         logger.info(
-            f"Received request for tweets - usernames: {usernames}, limit: {limit}, hours: {hours}"
+            f"Received request for tweets - usernames: {usernames}, limit: {limit}, hours: {hours}, filters: {filters}"
         )
+        filter_map = parse_filters(filters)
 
         # Split usernames by comma and trim whitespace
         username_list = [u.strip() for u in usernames.split(",")]
@@ -22,10 +30,15 @@ async def get_user_tweets(usernames: str, limit: int = 10, hours: Optional[int]
 
         # Get tweets from service
         logger.info("Calling TwitterService.get_user_tweets")
-        tweets = twitter_service.get_user_tweets(username_list, limit, hours)
+        tweets = await twitter_service.get_user_tweets(
+            username_list, limit, hours, filter_map, whole_words
+        )
         logger.info(f"Successfully retrieved {len(tweets)} tweets")
 
         return {"data": tweets}
+    except ValueError as e:
+        logger.error(f"Invalid tweet filters: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_user_tweets endpoint: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch tweets: {str(e)}")
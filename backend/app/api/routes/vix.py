@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException
-from ..services.vix_service import VIXService
+from ..services.vix_service import vix_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,12 +11,27 @@ async def get_vix_data():
     """Get VIX data including current value and historical data."""
     try:
         logger.info("Handling request for VIX data")
-        async with VIXService() as service:
-            data = await service.get_vix_data()
-            return data
+        # Shared instance so the market-hours cache survives across requests
+        return await vix_service.get_vix_data()
     except ValueError as e:
         logger.error(f"Value error in VIX data request: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching VIX data: {str(e)}")
         raise HTTPException(status_code=500, detail="Error fetching VIX data")
+
+
+@router.get("/complex")
+async def get_volatility_complex():
+    """Get VIX9D/VIX/VIX3M/VIX6M term structure, VVIX and derived ratios."""
+    try:
+        logger.info("Handling request for volatility complex data")
+        return await vix_service.get_volatility_complex()
+    except ValueError as e:
+        logger.error(f"Value error in volatility complex request: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching volatility complex data: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail="Error fetching volatility complex data"
+        )
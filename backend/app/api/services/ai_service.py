@@ -1,10 +1,23 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+import logging
 import openai
 from app.core.config import settings
+from app.api.services.component_parser import (
+    ComponentBlockParser,
+    parse_component_blocks,
+)
+from app.api.services.prompt_cache import PromptCache, parameter_tokens
+from app.api.services.symbol_resolver import SymbolResolver, symbol_resolver
+
+logger = logging.getLogger(__name__)
 
 
 class AIService:
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[PromptCache] = None,
+        resolver: Optional[SymbolResolver] = None,
+    ):
         openai.api_key = settings.OPENAI_API_KEY
         self.system_prompt = """You are an AI assistant for a trading dashboard. Your role is to:
         1. Understand user requests for dashboard components
@@ -20,52 +33,132 @@ class AIService:
         - News feeds
         - Custom metrics
         
-        Always respond with structured data that can be used to create dashboard components."""
+        Always respond with structured data that can be used to create dashboard components.
+        Put each component in its own fenced ```json block of the form
+        {"type": "<component type>", "config": {...}}."""
+        self.model = "gpt-4"
+        self.temperature = 0.7
+        self.cache = cache or PromptCache()
+        self.resolver = resolver or symbol_resolver
+
+    def _cache_guard(self, message: str) -> frozenset:
+        """Prompts share a response only if they name the same symbols and numbers"""
+        return frozenset(self._extract_symbols(message)) | parameter_tokens(message)
+
+    def _messages(self, message: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": message},
+        ]
 
     async def process_chat_message(self, message: str) -> Dict[str, Any]:
+        guard = self._cache_guard(message)
+        cached = self.cache.get(message, guard)
+        if cached is not None:
+            return cached
+
         try:
             response = await openai.ChatCompletion.acreate(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": message},
-                ],
-                temperature=0.7,
+                model=self.model,
+                messages=self._messages(message),
+                temperature=self.temperature,
             )
 
             # Parse the response and generate component configurations
             components = self._parse_ai_response(response.choices[0].message.content)
 
-            return {
+            result = {
                 "message": response.choices[0].message.content,
                 "components": components,
             }
+            self.cache.put(message, result, guard)
+            return result
         except Exception as e:
             raise Exception(f"Error processing chat message: {str(e)}")
 
+    async def stream_chat_message(
+        self, message: str
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Stream ``(event, data)`` pairs while the completion is generated.
+
+        ``token`` events carry each text delta and ``component`` events each
+        component as soon as its JSON block closes. A final ``done`` event
+        has the full message and all components, like ``process_chat_message``.
+        """
+        guard = self._cache_guard(message)
+        cached = self.cache.get(message, guard)
+        if cached is not None:
+            yield "token", {"content": cached["message"]}
+            for component in cached["components"]:
+                yield "component", component
+            yield "done", cached
+            return
+
+        parser = ComponentBlockParser()
+        components: List[Dict[str, Any]] = []
+        chunks = []
+        try:
+            stream = await openai.ChatCompletion.acreate(
+                model=self.model,
+                messages=self._messages(message),
+                temperature=self.temperature,
+                stream=True,
+            )
+            async for chunk in stream:
+                choices = chunk["choices"]
+                content = choices[0]["delta"].get("content") if choices else None
+                if not content:
+                    continue
+                chunks.append(content)
+                yield "token", {"content": content}
+                for component in parser.feed(content):
+                    components.append(component)
+                    yield "component", component
+        except Exception as e:
+            logger.error(f"Error streaming chat message: {str(e)}")
+            yield "error", {"detail": f"Error processing chat message: {str(e)}"}
+            return
+
+        text = "".join(chunks)
+        if not components:
+            # No structured blocks: fall back to keyword parsing of the whole reply
+            components = self._parse_ai_response(text)
+            for component in components:
+                yield "component", component
+        result = {"message": text, "components": components}
+        self.cache.put(message, result, guard)
+        yield "done", result
+
     def _parse_ai_response(self, response: str) -> List[Dict[str, Any]]:
+        components = parse_component_blocks(response)
+        if components:
+            return components
+
         # This is a simplified version - in reality, you'd want more sophisticated parsing
         # and validation of the AI's response
         components = []
+        lowered = response.lower()
+        # Both components price through an exchange
+        symbols = self._extract_symbols(response, crypto=True)
 
         # Example parsing logic (to be enhanced based on your needs)
-        if "price" in response.lower() or "ticker" in response.lower():
+        if "price" in lowered or "ticker" in lowered:
             components.append(
                 {
                     "type": "price_ticker",
                     "config": {
-                        "symbols": self._extract_symbols(response),
+                        "symbols": symbols,
                         "currency": "CAD",
                     },
                 }
             )
 
-        if "chart" in response.lower():
+        if "chart" in lowered:
             components.append(
                 {
                     "type": "candlestick_chart",
                     "config": {
-                        "symbols": self._extract_symbols(response),
+                        "symbols": list(symbols),
                         "timeframe": "1d",
                         "currency": "CAD",
                     },
@@ -74,13 +167,5 @@ class AIService:
 
         return components
 
-    def _extract_symbols(self, text: str) -> List[str]:
-        # Simple symbol extraction - enhance based on your needs
-        symbols = []
-        common_symbols = ["BTC", "ETH", "LTC", "MSTR"]
-
-        for symbol in common_symbols:
-            if symbol in text.upper():
-                symbols.append(symbol)
-
-        return symbols
+    def _extract_symbols(self, text: str, crypto: bool = False) -> List[str]:
+        return self.resolver.resolve(text, crypto=crypto)
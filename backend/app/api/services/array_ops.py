@@ -0,0 +1,54 @@
+import numpy as np
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs down each column of a (time, series) array."""
+    mask = np.isnan(values)
+    idx = np.where(~mask, np.arange(values.shape[0])[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return values[idx, np.arange(values.shape[1])]
+
+
+def period_start(dates: np.ndarray, frequency: str) -> np.ndarray:
+    """Map datetime64[D] dates to the first day of their W/M/Q/A period."""
+    dates = dates.astype("datetime64[D]")
+    if frequency == "W":
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        weekday = (dates.astype(np.int64) + 3) % 7
+        return dates - weekday.astype("timedelta64[D]")
+    if frequency == "M":
+        return dates.astype("datetime64[M]").astype("datetime64[D]")
+    if frequency == "Q":
+        months = dates.astype("datetime64[M]").astype(np.int64)
+        return (months - months % 3).astype("datetime64[M]").astype("datetime64[D]")
+    if frequency == "A":
+        return dates.astype("datetime64[Y]").astype("datetime64[D]")
+    raise ValueError(f"Unsupported frequency '{frequency}', use one of W, M, Q, A")
+
+
+def group_reduce(
+    values: np.ndarray, groups: np.ndarray, n_groups: int, how: str = "mean"
+) -> np.ndarray:
+    """Reduce rows of a (time, series) array by group id, ignoring NaNs.
+
+    ``how`` is ``"mean"``, ``"sum"`` or ``"last"`` (last non-NaN value).
+    """
+    valid = ~np.isnan(values)
+    shape = (n_groups, values.shape[1])
+    if how == "last":
+        rows = np.where(valid, np.arange(values.shape[0])[:, None], -1)
+        last = np.full(shape, -1)
+        np.maximum.at(last, groups, rows)
+        out = values[np.clip(last, 0, None), np.arange(values.shape[1])]
+        return np.where(last >= 0, out, np.nan)
+
+    sums = np.zeros(shape)
+    counts = np.zeros(shape)
+    np.add.at(sums, groups, np.where(valid, values, 0.0))
+    np.add.at(counts, groups, valid)
+    if how == "sum":
+        return np.where(counts > 0, sums, np.nan)
+    if how == "mean":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, np.nan)
+    raise ValueError(f"Unsupported aggregation '{how}', use mean, sum or last")
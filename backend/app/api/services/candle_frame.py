@@ -0,0 +1,101 @@
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+PRICE_ROWS = slice(1, 5)
+
+
+class CandleFrame:
+    """OHLCV candles held as one contiguous (6, n) float64 array.
+
+    Currency conversion, timestamp formatting and float coercion are column
+    operations on the array; rows only materialize as Python objects at
+    serialization time.
+    """
+
+    def __init__(self, data: np.ndarray):
+        self.data = np.ascontiguousarray(data, dtype=np.float64)
+
+    @classmethod
+    def from_ohlcv(cls, ohlcv: Sequence[Sequence[Any]]) -> "CandleFrame":
+        """Build a frame from ccxt-style ``[timestamp, o, h, l, c, v]`` rows.
+
+        Numeric strings (as returned by some venues) are coerced in the same
+        pass as the array construction.
+        """
+        rows = np.asarray(ohlcv, dtype=np.float64).reshape(-1, len(COLUMNS))
+        return cls(rows.T)
+
+    def __len__(self) -> int:
+        return self.data.shape[1]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.data[0].astype(np.int64)
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.data[1]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.data[2]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.data[3]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.data[4]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.data[5]
+
+    def convert(self, rate: float) -> "CandleFrame":
+        """Return a copy with open/high/low/close multiplied by ``rate``"""
+        data = self.data.copy()
+        data[PRICE_ROWS] *= rate
+        return CandleFrame(data)
+
+    def format_times(self, unit: str = "D") -> np.ndarray:
+        """UTC ISO timestamps truncated to ``unit`` (``"D"`` gives YYYY-MM-DD)"""
+        return np.datetime_as_string(
+            self.timestamps.astype("datetime64[ms]"), unit=unit
+        )
+
+    def _time_column(self, time_unit: Optional[str]) -> List[Any]:
+        if time_unit is None:
+            return self.timestamps.tolist()
+        return self.format_times(time_unit).tolist()
+
+    def _value_rows(self) -> List[List[Any]]:
+        # Missing values (e.g. a ``None`` volume) become NaN in the array;
+        # serialize them back as None so the result stays valid JSON
+        values = self.data[1:]
+        return np.where(np.isnan(values), None, values).tolist()
+
+    def to_records(self, time_unit: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Serialize as ``{"time", "open", ...}`` dicts.
+
+        ``time`` is the millisecond timestamp, or a formatted string when
+        ``time_unit`` is given.
+        """
+        times = self._time_column(time_unit)
+        values = self._value_rows()
+        keys = ("time",) + COLUMNS[1:]
+        return [dict(zip(keys, row)) for row in zip(times, *values)]
+
+    def to_rows(self) -> List[List[Any]]:
+        """Serialize back to ccxt-style rows with an integer timestamp"""
+        times = self.timestamps.tolist()
+        values = self._value_rows()
+        return [[t, *row] for t, *row in zip(times, *values)]
+
+    def to_columns(self, time_unit: Optional[str] = None) -> Dict[str, List[Any]]:
+        """Serialize as one list per column"""
+        columns = {"time": self._time_column(time_unit)}
+        for name, values in zip(COLUMNS[1:], self._value_rows()):
+            columns[name] = values
+        return columns
@@ -0,0 +1,69 @@
+import json
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+FENCE = "```"
+
+
+def parse_component_block(block: str) -> List[Dict[str, Any]]:
+    """Components from one fenced JSON block.
+
+    Accepts a single ``{"type", "config"}`` object, a list of them, or
+    ``{"components": [...]}``; anything else yields no components.
+    """
+    try:
+        data = json.loads(block)
+    except json.JSONDecodeError:
+        logger.warning(f"Ignoring malformed component block: {block[:80]!r}")
+        return []
+    if isinstance(data, dict) and "components" in data:
+        data = data["components"]
+    items = data if isinstance(data, list) else [data]
+    return [
+        {"type": item["type"], "config": item.get("config") or {}}
+        for item in items
+        if isinstance(item, dict) and isinstance(item.get("type"), str)
+    ]
+
+
+def parse_component_blocks(text: str) -> List[Dict[str, Any]]:
+    parser = ComponentBlockParser()
+    return parser.feed(text)
+
+
+class ComponentBlockParser:
+    """Incrementally finds fenced JSON blocks in streamed model output.
+
+    ``feed`` takes each text delta and returns the components of every
+    block that completed within it, so they can be sent before the rest of
+    the response has been generated.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0  # everything before this has been scanned
+
+    def feed(self, delta: str) -> List[Dict[str, Any]]:
+        self.text += delta
+        components = []
+        while True:
+            start = self.text.find(FENCE, self.pos)
+            if start < 0:
+                # Keep a possible partial fence for the next delta
+                self.pos = max(self.pos, len(self.text) - len(FENCE) + 1)
+                return components
+            header_end = self.text.find("\n", start)
+            if header_end < 0:
+                self.pos = start
+                return components
+            end = self.text.find(FENCE, header_end)
+            if end < 0:
+                self.pos = start
+                return components
+
+            language = self.text[start + len(FENCE) : header_end].strip().lower()
+            if language in ("json", ""):
+                components.extend(parse_component_block(self.text[header_end:end]))
+            self.pos = end + len(FENCE)
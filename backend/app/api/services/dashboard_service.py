@@ -0,0 +1,296 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import JSON, Text, cast, func, literal, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Update
+from app.api.services.json_patch import (
+    COMPONENT_OPS,
+    apply_patch,
+    expand_component_ops,
+    is_array_index,
+    parse_pointer,
+)
+from app.models.dashboard import Dashboard
+
+# (created_at, id) of the last dashboard on a page
+DashboardKey = Tuple[datetime, int]
+
+
+def encode_cursor(key: DashboardKey) -> str:
+    created_at, dashboard_id = key
+    raw = f"{created_at.isoformat()}|{dashboard_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> DashboardKey:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, dashboard_id = (
+            base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+        )
+        return datetime.fromisoformat(created_at), int(dashboard_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+
+# Top-level members of the patchable dashboard document
+PATCH_FIELDS = ("name", "components", "layouts")
+
+
+CONFLICT = "Dashboard was modified; reload and retry"
+
+
+class VersionConflict(Exception):
+    """The dashboard changed since the client read the given version"""
+
+
+def validate_field(field: str, value: Any):
+    if field == "name" and (not isinstance(value, str) or not value):
+        raise ValueError("Dashboard name must be a non-empty string")
+    if field == "components" and (
+        not isinstance(value, list)
+        or not all(
+            isinstance(c, dict) and isinstance(c.get("type"), str) for c in value
+        )
+    ):
+        raise ValueError("Components must be objects with a type")
+    if field == "layouts" and not isinstance(value, dict):
+        raise ValueError("Layouts must be an object")
+
+
+def validate_document(document: Dict[str, Any]):
+    for field in PATCH_FIELDS:
+        validate_field(field, document.get(field))
+
+
+def _patch_target(operation: Dict[str, Any]) -> Tuple[str, List[str]]:
+    tokens = parse_pointer(operation.get("path"))
+    if not tokens or tokens[0] not in PATCH_FIELDS:
+        raise ValueError(
+            f"Patch paths must start with one of {', '.join(PATCH_FIELDS)}"
+        )
+    op = operation.get("op")
+    if op in ("add", "replace", "test") and "value" not in operation:
+        raise ValueError(f"'{op}' operation needs a value")
+    return tokens[0], tokens[1:]
+
+
+def _component_member(tokens: List[str]) -> bool:
+    # What update_component sets: a prop, or the whole layout
+    return is_array_index(tokens[0]) and (
+        tokens[1:] == ["layout"] or (tokens[1:2] == ["props"] and len(tokens) > 2)
+    )
+
+
+def supports_in_database(operation: Dict[str, Any]) -> bool:
+    """Whether ``jsonb_set`` can run the operation as ``apply_patch`` would.
+
+    That holds for setting a whole field to a valid value and for adding
+    object members under ``layouts`` or a component's props and layout,
+    given that ``database_update`` checks their parents are objects.
+    ``jsonb_set`` silently skips a missing target, so nested replacements
+    go to Python along with array changes, moves, removals and tests.
+    Raises ValueError for malformed operations and invalid fields.
+    """
+    field, tokens = _patch_target(operation)
+    op = operation.get("op")
+    if op not in ("add", "replace"):
+        return False
+    if not tokens:
+        validate_field(field, operation["value"])
+        return True
+    if op != "add" or field == "name":
+        return False
+    if field == "components":
+        return _component_member(tokens)
+    return tokens[-1] != "-" and not tokens[-1].isdigit()
+
+
+def database_update(
+    dashboard_id: int, user_id: int, version: int, patch: List[Dict[str, Any]]
+) -> Update:
+    """An UPDATE applying ``patch`` with Postgres ``jsonb_set``.
+
+    Only the changed values are sent. It matches no row when the stored
+    version is not ``version``, or when the stored document lacks an
+    object where a member is added.
+    """
+    values: Dict[str, Any] = {"version": Dashboard.version + 1}
+    documents: Dict[str, Any] = {}
+    parents = []
+    for operation in patch:
+        field, tokens = _patch_target(operation)
+        value = operation["value"]
+        if len(tokens) > 1:
+            stored = cast(getattr(Dashboard, field), JSONB)
+            parent = stored.op("#>")(cast(array(tokens[:-1]), ARRAY(Text)))
+            parents.append(func.jsonb_typeof(parent) == "object")
+        if field == "name":
+            values["name"] = value
+        elif not tokens:
+            documents[field] = cast(literal(json.dumps(value)), JSONB)
+        else:
+            documents[field] = func.jsonb_set(
+                documents.get(field, cast(getattr(Dashboard, field), JSONB)),
+                cast(array(tokens), ARRAY(Text)),
+                cast(literal(json.dumps(value)), JSONB),
+                operation["op"] == "add",
+            )
+    for field, document in documents.items():
+        values[field] = cast(document, JSON)
+    return (
+        update(Dashboard)
+        .where(
+            Dashboard.id == dashboard_id,
+            Dashboard.user_id == user_id,
+            Dashboard.version == version,
+            *parents,
+        )
+        .values(**values)
+    )
+
+
+class DashboardService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_summaries(
+        self, user_id: int, limit: int = 50, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """One page of a user's dashboards without their JSON bodies.
+
+        Pages are ordered newest first and continue from ``cursor`` with a
+        keyset condition on ``(created_at, id)``, so each page is a range
+        scan of the ``(user_id, created_at)`` index however deep it is.
+        """
+        query = self.db.query(
+            Dashboard.id,
+            Dashboard.name,
+            func.json_array_length(Dashboard.components).label("component_count"),
+            func.coalesce(Dashboard.updated_at, Dashboard.created_at).label(
+                "updated_at"
+            ),
+            Dashboard.created_at,
+        ).filter(Dashboard.user_id == user_id)
+        if cursor:
+            query = query.filter(
+                tuple_(Dashboard.created_at, Dashboard.id) < decode_cursor(cursor)
+            )
+        rows = (
+            query.order_by(Dashboard.created_at.desc(), Dashboard.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor((last.created_at, last.id))
+        return {
+            "data": [
+                {
+                    "id": row.id,
+                    "name": row.name,
+                    "component_count": row.component_count or 0,
+                    "updated_at": row.updated_at,
+                }
+                for row in page
+            ],
+            "next_cursor": next_cursor,
+        }
+
+    def _execute_versioned(self, statement: Update):
+        result = self.db.execute(statement)
+        if result.rowcount == 0:
+            self.db.rollback()
+            raise VersionConflict(CONFLICT)
+        self.db.commit()
+
+    def _version_and_ids(
+        self, dashboard_id: int, user_id: int, operations: List[Dict[str, Any]]
+    ):
+        """The stored version, plus component ids when operations need them"""
+        ids = literal(None)
+        if any(op.get("op") in COMPONENT_OPS for op in operations):
+            ids = func.jsonb_path_query_array(
+                cast(Dashboard.components, JSONB), "$[*].id"
+            )
+        return (
+            self.db.query(Dashboard.version, ids.label("ids"))
+            .filter(Dashboard.id == dashboard_id, Dashboard.user_id == user_id)
+            .first()
+        )
+
+    def patch_dashboard(
+        self,
+        dashboard_id: int,
+        user_id: int,
+        version: int,
+        operations: List[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """Apply JSON Patch and per-component operations to a dashboard.
+
+        ``version`` is the version the client last read; the write only
+        succeeds if it is still current, otherwise VersionConflict is
+        raised. On Postgres, patches made of whole-field sets and member
+        adds run as ``jsonb_set`` in the UPDATE itself; anything else, or
+        a patch whose parents turn out to be missing, is applied to the
+        loaded document, validated and written back under the same
+        version check. Returns the new version, or None if there is no
+        such dashboard.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            # Read only the version and component ids, not the documents
+            row = self._version_and_ids(dashboard_id, user_id, operations)
+            if row is None:
+                return None
+            if row.version != version:
+                raise VersionConflict(CONFLICT)
+            patch = expand_component_ops(operations, row.ids or [])
+            if all(supports_in_database(op) for op in patch):
+                result = self.db.execute(
+                    database_update(dashboard_id, user_id, version, patch)
+                )
+                if result.rowcount:
+                    self.db.commit()
+                    return {"id": dashboard_id, "version": version + 1}
+                # A parent is missing or the version moved; the Python path
+                # reports which
+                self.db.rollback()
+
+        dashboard = (
+            self.db.query(Dashboard)
+            .filter(Dashboard.id == dashboard_id, Dashboard.user_id == user_id)
+            .first()
+        )
+        if dashboard is None:
+            return None
+        if dashboard.version != version:
+            raise VersionConflict(CONFLICT)
+        document = {
+            "name": dashboard.name,
+            "components": dashboard.components,
+            "layouts": dashboard.layouts,
+        }
+        patch = expand_component_ops(
+            operations, [c.get("id") for c in dashboard.components or []]
+        )
+        for operation in patch:
+            _patch_target(operation)
+        document = apply_patch(document, patch)
+        validate_document(document)
+
+        self._execute_versioned(
+            update(Dashboard)
+            .where(
+                Dashboard.id == dashboard_id,
+                Dashboard.user_id == user_id,
+                Dashboard.version == version,
+            )
+            .values(version=Dashboard.version + 1, **document)
+        )
+        return {"id": dashboard_id, "version": version + 1}
@@ -0,0 +1,181 @@
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.api.services.domain_service import apply_whois_info, utc_now
+from app.api.services.whois_service import (
+    WhoisService,
+    normalize_domain,
+    whois_service,
+)
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.domain import Domain
+
+# How often to check a domain, by days left until it expires
+EXPIRY_INTERVALS = (
+    (7, timedelta(hours=6)),  # includes expired domains that may drop or renew
+    (30, timedelta(days=1)),
+    (90, timedelta(days=3)),
+)
+STABLE_INTERVAL = timedelta(days=14)
+UNKNOWN_INTERVAL = timedelta(days=1)  # no expiration date on record
+# Domains whose WHOIS data changed recently are polled more often
+CHANGED_WINDOW = timedelta(days=7)
+CHANGED_INTERVAL = timedelta(hours=12)
+
+logger = logging.getLogger(__name__)
+
+# (due at, domain id, domain name)
+Entry = Tuple[datetime, int, str]
+
+
+def refresh_interval(
+    expiration_date: Optional[datetime],
+    last_changed_at: Optional[datetime],
+    now: datetime,
+) -> timedelta:
+    if expiration_date is None:
+        interval = UNKNOWN_INTERVAL
+    else:
+        days_left = (expiration_date - now).days
+        interval = next(
+            (i for limit, i in EXPIRY_INTERVALS if days_left <= limit),
+            STABLE_INTERVAL,
+        )
+    if last_changed_at is not None and now - last_changed_at < CHANGED_WINDOW:
+        interval = min(interval, CHANGED_INTERVAL)
+    return interval
+
+
+def schedule_entry(domain: Any, now: datetime) -> Entry:
+    """When ``domain`` is next due; never-checked domains come first"""
+    if domain.last_checked_at is None:
+        due = datetime.min
+    else:
+        due = domain.last_checked_at + refresh_interval(
+            domain.expiration_date, domain.last_changed_at, now
+        )
+    return (due, domain.id, domain.name)
+
+
+class DomainRefreshScheduler:
+    """Keeps tracked domains' WHOIS data fresh within an hourly lookup budget.
+
+    Domains sit in a min-heap keyed by when they are next due, which depends
+    on how close they are to expiring and whether their data changed
+    recently. Every ``tick`` the scheduler earns ``budget_per_hour`` / 3600
+    lookups per second, spends them on the most overdue domains and writes
+    the results in one commit. The heap is rebuilt from the database every
+    ``reload_interval`` to pick up added, deleted and manually refreshed
+    domains.
+    """
+
+    def __init__(
+        self,
+        lookups: WhoisService = whois_service,
+        session_factory: Callable[[], Session] = SessionLocal,
+        budget_per_hour: int = settings.DOMAIN_REFRESH_BUDGET_PER_HOUR,
+        tick: float = 60,
+        reload_interval: float = 15 * 60,
+    ):
+        self.lookups = lookups
+        self.session_factory = session_factory
+        self.budget_per_hour = budget_per_hour
+        self.tick = tick
+        self.reload_interval = reload_interval
+        self._queue: List[Entry] = []
+        self._allowance = 0.0
+        self._loaded_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _load(self) -> List[Entry]:
+        now = utc_now()
+        db = self.session_factory()
+        try:
+            rows = db.query(
+                Domain.id,
+                Domain.name,
+                Domain.expiration_date,
+                Domain.last_checked_at,
+                Domain.last_changed_at,
+            ).all()
+        finally:
+            db.close()
+        queue = [schedule_entry(row, now) for row in rows]
+        heapq.heapify(queue)
+        return queue
+
+    async def reload(self):
+        self._queue = await asyncio.to_thread(self._load)
+        self._loaded_at = time.monotonic()
+
+    def _write(self, results: Dict[int, Dict[str, Any]]) -> List[Entry]:
+        """Store results in one commit and return the domains' next slots"""
+        now = utc_now()
+        db = self.session_factory()
+        try:
+            domains = db.query(Domain).filter(Domain.id.in_(results)).all()
+            for domain in domains:
+                apply_whois_info(domain, results[domain.id], now)
+            db.commit()
+            # Deleted domains are not rescheduled
+            return [schedule_entry(domain, now) for domain in domains]
+        finally:
+            db.close()
+
+    def _take_due(self, now: datetime, limit: int) -> List[Entry]:
+        due = []
+        while self._queue and len(due) < limit and self._queue[0][0] <= now:
+            due.append(heapq.heappop(self._queue))
+        return due
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """Refresh the most overdue domains the budget allows; returns how many"""
+        if (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= self.reload_interval
+        ):
+            await self.reload()
+
+        # Unspent allowance carries over only up to one lookup, so bursts
+        # never exceed the hourly rate
+        per_tick = self.budget_per_hour * self.tick / 3600
+        self._allowance = min(self._allowance + per_tick, max(per_tick, 1.0))
+        batch = self._take_due(now or utc_now(), int(self._allowance))
+        if not batch:
+            return 0
+        self._allowance -= len(batch)
+
+        records = await self.lookups.lookup_many(name for _, _, name in batch)
+        results = {
+            domain_id: records[normalize_domain(name)] for _, domain_id, name in batch
+        }
+        for entry in await asyncio.to_thread(self._write, results):
+            heapq.heappush(self._queue, entry)
+        logger.info(f"Refreshed WHOIS data for {len(batch)} domains")
+        return len(batch)
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Error refreshing domains: {str(e)}")
+            await asyncio.sleep(self.tick)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+# Create a single instance of the service
+domain_scheduler = DomainRefreshScheduler()
@@ -1,27 +1,78 @@
-import whois
-from datetime import datetime
-from typing import List, Dict, Optional
+import asyncio
+import csv
+import io
+import re
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Dict, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from app.api.services.jobs import Job
+from app.api.services.whois_service import (
+    WhoisService,
+    normalize_domain,
+    whois_service,
+)
+from app.db.session import SessionLocal
 from app.models.domain import Domain, DomainType
 
+WHOIS_FIELDS = ("registrar", "creation_date", "expiration_date", "status")
+MAX_IMPORT = 5000
+DOMAIN_NAME = re.compile(r"^(?=.{1,253}$)([a-z0-9-]{1,63}\.)+[a-z0-9-]{2,63}$")
+# Column headers registrar exports use for the domain name
+CSV_NAME_COLUMNS = ("domain", "domain name", "domain_name", "domainname", "name")
+
+
+def parse_domain_csv(text: str) -> List[str]:
+    """Domain names from a registrar CSV export or a one-name-per-line list."""
+    rows = [row for row in csv.reader(io.StringIO(text)) if any(c.strip() for c in row)]
+    if not rows:
+        return []
+    header = [c.strip().lower() for c in rows[0]]
+    column = next((header.index(c) for c in CSV_NAME_COLUMNS if c in header), None)
+    if column is None:
+        column = 0
+    else:
+        rows = rows[1:]
+    return [row[column].strip() for row in rows if len(row) > column]
+
+
+def utc_now() -> datetime:
+    """The current UTC time, naive like the domain columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def apply_whois_info(
+    domain: Domain, info: Dict[str, Any], now: Optional[datetime] = None
+) -> bool:
+    """Copy a WHOIS result onto ``domain`` and stamp the check.
+
+    Failed lookups only update ``last_checked_at``. ``last_changed_at`` is
+    set when a previously checked domain's fields differ, which the refresh
+    scheduler uses to poll domains in flux more often.
+    """
+    now = now or utc_now()
+    previously_checked = domain.last_checked_at is not None
+    domain.last_checked_at = now
+    if "error" in info:
+        return False
+    changed = False
+    for field in WHOIS_FIELDS:
+        value = info.get(field)
+        if getattr(domain, field) != value:
+            setattr(domain, field, value)
+            changed = True
+    if changed and previously_checked:
+        domain.last_changed_at = now
+    return True
+
 
 class DomainService:
     def __init__(self, db: Session):
         self.db = db
 
     def get_domain_info(self, domain_name: str) -> Dict:
-        """Get WHOIS information for a domain."""
-        try:
-            domain_info = whois.whois(domain_name)
-            return {
-                "domain": domain_name,
-                "registrar": domain_info.registrar,
-                "creation_date": domain_info.creation_date,
-                "expiration_date": domain_info.expiration_date,
-                "status": domain_info.status,
-            }
-        except Exception as e:
-            return {"error": str(e)}
+        """Get current WHOIS information for a domain, bypassing the cache."""
+        return whois_service.lookup_sync(domain_name, use_cache=False)
 
     def add_domain(
         self, domain_name: str, domain_type: DomainType, user_id: int
@@ -29,15 +80,8 @@ class DomainService:
         """Add a new domain to track."""
         domain_info = self.get_domain_info(domain_name)
 
-        domain = Domain(
-            name=domain_name,
-            type=domain_type,
-            user_id=user_id,
-            registrar=domain_info.get("registrar"),
-            creation_date=domain_info.get("creation_date"),
-            expiration_date=domain_info.get("expiration_date"),
-            status=domain_info.get("status"),
-        )
+        domain = Domain(name=domain_name, type=domain_type, user_id=user_id)
+        apply_whois_info(domain, domain_info)
 
         self.db.add(domain)
         self.db.commit()
@@ -100,12 +144,108 @@ class DomainService:
 
         if domain:
             domain_info = self.get_domain_info(domain.name)
-            domain.registrar = domain_info.get("registrar")
-            domain.creation_date = domain_info.get("creation_date")
-            domain.expiration_date = domain_info.get("expiration_date")
-            domain.status = domain_info.get("status")
+            apply_whois_info(domain, domain_info)
 
             self.db.commit()
             self.db.refresh(domain)
             return domain
         return None
+
+    def get_refresh_targets(
+        self,
+        user_id: int,
+        domain_ids: Optional[List[int]] = None,
+        domain_type: Optional[DomainType] = None,
+    ) -> List[Tuple[int, str]]:
+        """``(id, name)`` of the user's domains selected for a bulk refresh."""
+        query = self.db.query(Domain.id, Domain.name).filter(Domain.user_id == user_id)
+        if domain_ids:
+            query = query.filter(Domain.id.in_(domain_ids))
+        if domain_type:
+            query = query.filter(Domain.type == domain_type)
+        return [(row.id, row.name) for row in query.order_by(Domain.id)]
+
+    def import_domains(
+        self, domain_names: List[str], domain_type: DomainType, user_id: int
+    ) -> Dict[str, Any]:
+        """Insert placeholders for new names in one batch, without WHOIS data.
+
+        Returns the ``(id, name)`` targets to look up, plus the names skipped
+        as already tracked or invalid.
+        """
+        if len(domain_names) > MAX_IMPORT:
+            raise ValueError(f"Cannot import more than {MAX_IMPORT} domains at once")
+        names: Dict[str, None] = {}
+        invalid = []
+        for raw in domain_names:
+            name = normalize_domain(raw)
+            if DOMAIN_NAME.match(name):
+                names.setdefault(name)
+            elif raw.strip():
+                invalid.append(raw.strip())
+
+        existing = set()
+        if names:
+            existing = {
+                name
+                for (name,) in self.db.query(func.lower(Domain.name)).filter(
+                    Domain.user_id == user_id, func.lower(Domain.name).in_(names)
+                )
+            }
+        domains = [
+            Domain(name=name, type=domain_type, user_id=user_id)
+            for name in names
+            if name not in existing
+        ]
+        targets = []
+        if domains:
+            self.db.add_all(domains)
+            # Ids come back from the batched INSERT; read them before commit
+            # expires the objects
+            self.db.flush()
+            targets = [(domain.id, domain.name) for domain in domains]
+            self.db.commit()
+        return {
+            "targets": targets,
+            "existing": sorted(existing),
+            "invalid": invalid,
+        }
+
+    def apply_whois_results(self, results: Dict[int, Dict[str, Any]]) -> int:
+        """Write WHOIS results keyed by domain id in a single commit.
+
+        Returns how many domains received fresh data.
+        """
+        if not results:
+            return 0
+        now = utc_now()
+        domains = self.db.query(Domain).filter(Domain.id.in_(results)).all()
+        updated = sum(apply_whois_info(d, results[d.id], now) for d in domains)
+        self.db.commit()
+        return updated
+
+
+async def refresh_domains(
+    job: Job,
+    targets: List[Tuple[int, str]],
+    lookups: WhoisService = whois_service,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> Dict[str, Any]:
+    """Bulk refresh job: concurrent WHOIS lookups, then one batched write."""
+    records = await lookups.lookup_many(
+        (name for _, name in targets), on_progress=job.progress
+    )
+    results = {
+        domain_id: records[normalize_domain(name)] for domain_id, name in targets
+    }
+    failed = {name: info["error"] for name, info in records.items() if "error" in info}
+
+    def write() -> int:
+        db = session_factory()
+        try:
+            return DomainService(db).apply_whois_results(results)
+        finally:
+            db.close()
+
+    updated = await asyncio.to_thread(write)
+    return {"requested": len(targets), "updated": updated, "failed": failed}
@@ -1,16 +1,21 @@
+import asyncio
 import aiohttp
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, timedelta
 import logging
 from app.core.config import settings
+from app.api.services.economic_store import CalendarStore
 
 logger = logging.getLogger(__name__)
 
 
 class EconomicService:
-    def __init__(self):
+    def __init__(self, store: Optional[CalendarStore] = None):
         self.api_key = settings.FINNHUB_API_KEY
         self.base_url = "https://finnhub.io/api/v1"
+        self.store = store or CalendarStore()
+        self._lock: Optional[asyncio.Lock] = None
+        self._session: Optional[aiohttp.ClientSession] = None
 
         # Add debug logging
         logger.info(f"FINNHUB_API_KEY value length: {len(self.api_key)}")
@@ -21,96 +26,132 @@ class EconomicService:
                 "FINNHUB_API_KEY not set. Economic data will not be available."
             )
 
-    async def get_economic_calendar(
-        self, from_date: str = None, to_date: str = None
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session, created lazily inside the running loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _fetch_calendar(
+        self, from_date: str, to_date: str
     ) -> List[Dict[str, Any]]:
-        """Fetch economic calendar data from Finnhub"""
-        if not self.api_key:
-            raise ValueError("FINNHUB_API_KEY not set. Economic data is not available.")
+        """Download one date range of the Finnhub economic calendar"""
+        url = f"{self.base_url}/calendar/economic"
+        params = {"token": self.api_key, "from": from_date, "to": to_date}
 
-        try:
-            # If dates not provided, default to next 30 days
-            if not from_date:
-                from_date = datetime.now().strftime("%Y-%m-%d")
-            if not to_date:
-                to_date = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
-
-            url = f"{self.base_url}/calendar/economic"
-            params = {"token": self.api_key, "from": from_date, "to": to_date}
-
-            # Log request details (without the full API key)
-            masked_key = f"{self.api_key[:4]}...{self.api_key[-4:]}"
-            logger.info(f"Making request to {url}")
-            logger.info(
-                f"With params: from={from_date}, to={to_date}, token={masked_key}"
-            )
+        # Log request details (without the full API key)
+        masked_key = f"{self.api_key[:4]}...{self.api_key[-4:]}"
+        logger.info(f"Making request to {url}")
+        logger.info(f"With params: from={from_date}, to={to_date}, token={masked_key}")
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    response_text = await response.text()
-                    if response.status == 200:
-                        data = await response.json()
-                        # Filter and format the events
-                        events = []
-                        for event in data.get("economicCalendar", []):
-                            events.append(
-                                {
-                                    "event": event.get("event"),
-                                    "date": event.get("date"),
-                                    "country": event.get("country"),
-                                    "actual": event.get("actual"),
-                                    "previous": event.get("previous"),
-                                    "estimate": event.get("estimate"),
-                                    "impact": event.get("impact"),
-                                    "unit": event.get("unit"),
-                                }
-                            )
-                        return events
-                    elif response.status == 403:
-                        error_msg = (
-                            "Access denied. The economic calendar endpoint requires a paid "
-                            "Finnhub subscription (Starter tier or above). Please upgrade your "
-                            "plan at https://finnhub.io/pricing to access this feature."
-                        )
-                        logger.error(f"{error_msg} Response: {response_text}")
-                        raise ValueError(error_msg)
-                    else:
-                        error_msg = (
-                            f"Error fetching economic calendar: {response.status}. "
-                            f"Response: {response_text}"
+        try:
+            async with self._get_session().get(url, params=params) as response:
+                response_text = await response.text()
+                if response.status == 200:
+                    data = await response.json()
+                    # Filter and format the events
+                    events = []
+                    for event in data.get("economicCalendar", []):
+                        events.append(
+                            {
+                                "event": event.get("event"),
+                                "date": event.get("date") or event.get("time"),
+                                "country": event.get("country"),
+                                "actual": event.get("actual"),
+                                "previous": event.get("previous"),
+                                "estimate": event.get("estimate"),
+                                "impact": event.get("impact"),
+                                "unit": event.get("unit"),
+                            }
                         )
-                        logger.error(error_msg)
-                        raise ValueError(error_msg)
+                    return events
+                elif response.status == 403:
+                    error_msg = (
+                        "Access denied. The economic calendar endpoint requires a paid "
+                        "Finnhub subscription (Starter tier or above). Please upgrade your "
+                        "plan at https://finnhub.io/pricing to access this feature."
+                    )
+                    logger.error(f"{error_msg} Response: {response_text}")
+                    raise ValueError(error_msg)
+                else:
+                    error_msg = (
+                        f"Error fetching economic calendar: {response.status}. "
+                        f"Response: {response_text}"
+                    )
+                    logger.error(error_msg)
+                    raise ValueError(error_msg)
 
         except aiohttp.ClientError as e:
             error_msg = f"Network error while fetching economic calendar: {str(e)}"
             logger.error(error_msg)
             raise ValueError(error_msg)
+
+    async def _ensure_range(self, start: date, end: date):
+        """Fetch only the parts of ``[start, end]`` the store lacks or holds stale"""
+        if not self.store.missing(start, end):
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            gaps = self.store.missing(start, end)
+            results = await asyncio.gather(
+                *(
+                    self._fetch_calendar(lower.isoformat(), upper.isoformat())
+                    for lower, upper in gaps
+                )
+            )
+            for (lower, upper), events in zip(gaps, results):
+                self.store.record(lower, upper, events)
+            logger.info(f"Fetched economic calendar gaps: {gaps}")
+
+    def _date_range(
+        self, from_date: Optional[str], to_date: Optional[str], days: int
+    ) -> Tuple[date, date]:
+        try:
+            start = date.fromisoformat(from_date) if from_date else date.today()
+            end = (
+                date.fromisoformat(to_date)
+                if to_date
+                else date.today() + timedelta(days=days)
+            )
+        except ValueError:
+            raise ValueError("Dates must be formatted as YYYY-MM-DD")
+        if end < start:
+            raise ValueError("to_date must not be before from_date")
+        return start, end
+
+    async def get_economic_calendar(
+        self, from_date: str = None, to_date: str = None
+    ) -> List[Dict[str, Any]]:
+        """Economic calendar events, served from the local calendar store"""
+        if not self.api_key:
+            raise ValueError("FINNHUB_API_KEY not set. Economic data is not available.")
+
+        try:
+            # If dates not provided, default to next 30 days
+            start, end = self._date_range(from_date, to_date, 30)
+            await self._ensure_range(start, end)
+            return self.store.query(start, end)
         except Exception as e:
             logger.error(f"Error in get_economic_calendar: {str(e)}")
             raise
 
     async def get_fomc_meetings(self) -> List[Dict[str, Any]]:
-        """Filter and return only FOMC meetings from economic calendar"""
+        """FOMC meetings over the next 180 days from the category index"""
         if not self.api_key:
             raise ValueError("FINNHUB_API_KEY not set. Economic data is not available.")
 
         try:
-            # Get calendar for next 180 days to ensure we catch upcoming FOMC meetings
-            calendar = await self.get_economic_calendar(
-                from_date=datetime.now().strftime("%Y-%m-%d"),
-                to_date=(datetime.now() + timedelta(days=180)).strftime("%Y-%m-%d"),
-            )
-
-            # Filter for FOMC-related events
-            fomc_events = [
-                event
-                for event in calendar
-                if "FOMC" in event.get("event", "").upper()
-                or "Federal Reserve" in event.get("event", "")
-            ]
-
-            return fomc_events
+            start, end = self._date_range(None, None, 180)
+            await self._ensure_range(start, end)
+            return self.store.query(start, end, category="fomc")
 
         except Exception as e:
             logger.error(f"Error in get_fomc_meetings: {str(e)}")
@@ -0,0 +1,166 @@
+import time
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ONE_DAY = timedelta(days=1)
+
+# Category -> predicate on the event name, evaluated once per stored event
+CATEGORY_RULES: Dict[str, Callable[[str], bool]] = {
+    "fomc": lambda name: "FOMC" in name.upper() or "Federal Reserve" in name,
+}
+
+
+def event_day(event: Dict[str, Any]) -> Optional[str]:
+    value = event.get("date") or event.get("time")
+    return value[:10] if value else None
+
+
+@dataclass
+class Coverage:
+    """A date range that has been fetched, inclusive on both ends"""
+
+    start: date
+    end: date
+    fetched_at: float
+
+
+class CalendarStore:
+    """Economic calendar events indexed by day, with the ranges fetched so far.
+
+    Ranges within ``live_days`` of today go stale after ``live_ttl`` (actuals
+    get filled in); other ranges after ``ttl``. Fetched ranges are split at
+    the live window so a refresh near today never re-downloads far dates.
+    """
+
+    def __init__(
+        self,
+        live_days: int = 7,
+        live_ttl: float = 15 * 60,
+        ttl: float = 24 * 60 * 60,
+    ):
+        self.live_days = live_days
+        self.live_ttl = live_ttl
+        self.ttl = ttl
+        self.coverage: List[Coverage] = []
+        self.days: List[str] = []  # sorted ISO days that have events
+        self.events: Dict[str, List[Dict[str, Any]]] = {}
+        # Per category: sorted days and that day's matching events
+        self.category_days: Dict[str, List[str]] = {name: [] for name in CATEGORY_RULES}
+        self.category_events: Dict[str, Dict[str, List[Dict[str, Any]]]] = {
+            name: {} for name in CATEGORY_RULES
+        }
+
+    def _live_window(self, today: date) -> Tuple[date, date]:
+        span = timedelta(days=self.live_days)
+        return today - span, today + span
+
+    def _is_fresh(self, cover: Coverage, today: date, now: float) -> bool:
+        live_start, live_end = self._live_window(today)
+        live = cover.start <= live_end and cover.end >= live_start
+        return now - cover.fetched_at < (self.live_ttl if live else self.ttl)
+
+    def missing(
+        self,
+        start: date,
+        end: date,
+        today: Optional[date] = None,
+        now: Optional[float] = None,
+    ) -> List[Tuple[date, date]]:
+        """Sub-ranges of ``[start, end]`` without fresh coverage"""
+        today = today or date.today()
+        now = time.time() if now is None else now
+        gaps = []
+        cursor = start
+        for cover in self.coverage:
+            if cover.end < cursor or not self._is_fresh(cover, today, now):
+                continue
+            if cover.start > end:
+                break
+            if cover.start > cursor:
+                gaps.append((cursor, cover.start - ONE_DAY))
+            cursor = max(cursor, cover.end + ONE_DAY)
+            if cursor > end:
+                return gaps
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def record(
+        self,
+        start: date,
+        end: date,
+        events: List[Dict[str, Any]],
+        today: Optional[date] = None,
+        now: Optional[float] = None,
+    ):
+        """Replace everything stored for ``[start, end]`` with ``events``"""
+        today = today or date.today()
+        now = time.time() if now is None else now
+        first, last = start.isoformat(), end.isoformat()
+
+        lo, hi = bisect_left(self.days, first), bisect_right(self.days, last)
+        for day in self.days[lo:hi]:
+            del self.events[day]
+        del self.days[lo:hi]
+        for name, days in self.category_days.items():
+            lo, hi = bisect_left(days, first), bisect_right(days, last)
+            for day in days[lo:hi]:
+                del self.category_events[name][day]
+            del days[lo:hi]
+
+        for event in events:
+            day = event_day(event)
+            if day is None or not first <= day <= last:
+                continue
+            if day not in self.events:
+                self.events[day] = []
+                insort(self.days, day)
+            self.events[day].append(event)
+            for name, rule in CATEGORY_RULES.items():
+                if not rule(event.get("event") or ""):
+                    continue
+                by_day = self.category_events[name]
+                if day not in by_day:
+                    by_day[day] = []
+                    insort(self.category_days[name], day)
+                by_day[day].append(event)
+
+        # Trim existing coverage around the new range, then add it split at
+        # the live window boundaries
+        coverage = []
+        for cover in self.coverage:
+            if cover.end < start or cover.start > end:
+                coverage.append(cover)
+                continue
+            if cover.start < start:
+                coverage.append(
+                    Coverage(cover.start, start - ONE_DAY, cover.fetched_at)
+                )
+            if cover.end > end:
+                coverage.append(Coverage(end + ONE_DAY, cover.end, cover.fetched_at))
+        live_start, live_end = self._live_window(today)
+        bounds = sorted(
+            {start, end + ONE_DAY}
+            | {b for b in (live_start, live_end + ONE_DAY) if start < b <= end}
+        )
+        for lower, upper in zip(bounds, bounds[1:]):
+            coverage.append(Coverage(lower, upper - ONE_DAY, now))
+        self.coverage = sorted(coverage, key=lambda cover: cover.start)
+
+    def query(
+        self, start: date, end: date, category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Stored events between ``start`` and ``end``, in day order"""
+        first, last = start.isoformat(), end.isoformat()
+        if category is None:
+            days, events = self.days, self.events
+        else:
+            days, events = self.category_days[category], self.category_events[category]
+        lo, hi = bisect_left(days, first), bisect_right(days, last)
+
+        results = []
+        for day in days[lo:hi]:
+            results.extend(events[day])
+        return results
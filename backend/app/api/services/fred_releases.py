@@ -0,0 +1,104 @@
+import re
+import time
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
+
+
+@lru_cache(maxsize=256)
+def compile_name_matcher(names: Tuple[str, ...]) -> Pattern:
+    """One case-insensitive alternation for a set of partial release names"""
+    return re.compile("|".join(re.escape(name) for name in names), re.IGNORECASE)
+
+
+class ReleaseCatalog:
+    """FRED releases plus their scheduled dates, indexed by date.
+
+    ``dates`` is the ascending list of release dates and ``date_release_ids``
+    the matching release ids, so any date window is two binary searches.
+    """
+
+    def __init__(
+        self,
+        releases: Sequence[Dict[str, Any]],
+        release_dates: Sequence[Dict[str, Any]],
+        loaded_at: Optional[float] = None,
+    ):
+        self.loaded_at = time.time() if loaded_at is None else loaded_at
+        self.releases: Dict[int, Dict[str, Any]] = {
+            r["id"]: {
+                "id": r["id"],
+                "name": r["name"],
+                "link": r.get("link", None),
+                "notes": r.get("notes", ""),
+            }
+            for r in releases
+        }
+
+        scheduled = sorted(
+            (d["date"], d["release_id"])
+            for d in release_dates
+            if d.get("release_id") in self.releases
+        )
+        self.dates: List[str] = [date for date, _ in scheduled]
+        self.date_release_ids: List[int] = [release_id for _, release_id in scheduled]
+
+        # First scheduled date per release, for catalog-wide listings
+        self.next_date: Dict[int, str] = {}
+        for date, release_id in scheduled:
+            self.next_date.setdefault(release_id, date)
+        self.by_next_date = sorted(
+            self.releases,
+            key=lambda rid: (rid not in self.next_date, self.next_date.get(rid, "")),
+        )
+
+    def _matches(self, release_id: int, matcher: Optional[Pattern]) -> bool:
+        return matcher is None or bool(
+            matcher.search(self.releases[release_id]["name"])
+        )
+
+    def upcoming(
+        self,
+        filter_names: Optional[List[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Scheduled releases between ``start`` and ``end`` (YYYY-MM-DD), by date"""
+        matcher = (
+            compile_name_matcher(tuple(sorted(set(filter_names))))
+            if filter_names
+            else None
+        )
+        lo = bisect_left(self.dates, start) if start else 0
+        hi = bisect_right(self.dates, end) if end else len(self.dates)
+
+        results = []
+        for i in range(lo, hi):
+            release_id = self.date_release_ids[i]
+            if not self._matches(release_id, matcher):
+                continue
+            results.append({**self.releases[release_id], "date": self.dates[i]})
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def catalog(
+        self, filter_names: Optional[List[str]] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Every release once, with its next scheduled date (None if unscheduled)"""
+        matcher = (
+            compile_name_matcher(tuple(sorted(set(filter_names))))
+            if filter_names
+            else None
+        )
+        results = []
+        for release_id in self.by_next_date:
+            if not self._matches(release_id, matcher):
+                continue
+            results.append(
+                {**self.releases[release_id], "date": self.next_date.get(release_id)}
+            )
+            if limit is not None and len(results) >= limit:
+                break
+        return results
@@ -0,0 +1,144 @@
+import re
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+# Frequencies offered by the chart's series picker
+SEARCH_FREQUENCIES = ("Monthly", "Quarterly", "Annual")
+
+# Seed queries for the popular-series catalog
+POPULAR_SEARCH_TERMS = (
+    "gdp",
+    "unemployment",
+    "inflation",
+    "consumer price index",
+    "pce",
+    "interest rate",
+    "treasury",
+    "federal funds",
+    "money supply",
+    "employment",
+    "industrial production",
+    "retail sales",
+    "housing",
+    "consumer sentiment",
+    "exchange rate",
+    "oil",
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text.casefold())
+
+
+def search_record(series: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields returned by series search, from a FRED series object"""
+    return {
+        "id": series["id"],
+        "title": series["title"],
+        "frequency": series.get("frequency", ""),
+        "units": series.get("units", ""),
+        "seasonal_adjustment": series.get("seasonal_adjustment", ""),
+        "last_updated": series.get("last_updated", ""),
+        "notes": series.get("notes", ""),
+        "observation_start": series.get("observation_start", ""),
+        "observation_end": series.get("observation_end", ""),
+    }
+
+
+class SeriesSearchIndex:
+    """In-memory inverted index over FRED series ids and titles.
+
+    ``tokens`` is kept sorted so a query term matches every indexed token it
+    prefixes with one binary search. Results rank exact token matches above
+    prefix matches, and ties by FRED's popularity score.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.popularity: Dict[str, int] = {}
+        self.postings: Dict[str, Set[str]] = {}
+        self.tokens: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, series: Dict[str, Any]):
+        series_id = series["id"]
+        if "popularity" in series or series_id not in self.popularity:
+            self.popularity[series_id] = int(series.get("popularity") or 0)
+        if series_id in self.documents:
+            self.documents[series_id] = search_record(series)
+            return
+
+        self.documents[series_id] = search_record(series)
+        for token in set(tokenize(series_id) + tokenize(series["title"])):
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                insort(self.tokens, token)
+            ids.add(series_id)
+
+    def add_all(self, series: Iterable[Dict[str, Any]]):
+        for s in series:
+            self.add(s)
+
+    def _prefixed(self, term: str) -> List[str]:
+        i = bisect_left(self.tokens, term)
+        matches = []
+        while i < len(self.tokens) and self.tokens[i].startswith(term):
+            matches.append(self.tokens[i])
+            i += 1
+        return matches
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        frequencies: Optional[Iterable[str]] = SEARCH_FREQUENCIES,
+    ) -> List[Dict[str, Any]]:
+        """Series matching every query term as a token or token prefix"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        scores: Optional[Dict[str, float]] = None
+        for term in dict.fromkeys(terms):
+            term_scores: Dict[str, float] = {}
+            for token in self._prefixed(term):
+                weight = 2.0 if token == term else len(term) / len(token)
+                for series_id in self.postings[token]:
+                    if weight > term_scores.get(series_id, 0.0):
+                        term_scores[series_id] = weight
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    series_id: score + term_scores[series_id]
+                    for series_id, score in scores.items()
+                    if series_id in term_scores
+                }
+            if not scores:
+                return []
+
+        allowed = tuple(frequencies) if frequencies else None
+        exact_id = query.strip().upper()
+        ranked = sorted(
+            scores,
+            key=lambda series_id: (
+                series_id != exact_id,
+                -scores[series_id],
+                -self.popularity.get(series_id, 0),
+                series_id,
+            ),
+        )
+        results = []
+        for series_id in ranked:
+            record = self.documents[series_id]
+            if allowed and not record["frequency"].startswith(allowed):
+                continue
+            results.append(record)
+            if len(results) >= limit:
+                break
+        return results
@@ -1,21 +1,152 @@
 import os
-from typing import List, Optional, Dict
-import requests
+import asyncio
+import time
+from typing import List, Optional, Dict, Any
+import aiohttp
 from datetime import datetime, timedelta
 import logging
+import numpy as np
 from app.core.config import settings
+from app.api.services.fred_releases import ReleaseCatalog
+from app.api.services.fred_search import (
+    POPULAR_SEARCH_TERMS,
+    SEARCH_FREQUENCIES,
+    SeriesSearchIndex,
+    tokenize,
+)
+from app.api.services.symbol_resolver import symbol_resolver
+from app.api.services.fred_store import (
+    FREDObservationStore,
+    StoredSeries,
+    align_series,
+    parse_observations,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class FREDService:
-    def __init__(self):
+    def __init__(
+        self,
+        store: Optional[FREDObservationStore] = None,
+        release_catalog_ttl: float = 24 * 60 * 60,
+        release_horizon_days: int = 180,
+        search_ttl: float = 24 * 60 * 60,
+    ):
         self.api_key = settings.FRED_API_KEY
         self.base_url = "https://api.stlouisfed.org/fred"
+        self.store = store or FREDObservationStore()
+        self._sync_locks: Dict[str, asyncio.Lock] = {}
+        self.release_catalog_ttl = release_catalog_ttl
+        self.release_horizon_days = release_horizon_days
+        self._release_catalog: Optional[ReleaseCatalog] = None
+        self._catalog_refresh: Optional[asyncio.Task] = None
+        self.search_index = SeriesSearchIndex()
+        self.search_ttl = search_ttl
+        self.search_fetch_limit = 50
+        self.search_harvest_limit = 200
+        # Normalized queries already sent to FRED, so misses are not repeated
+        self._searched: Dict[str, float] = {}
+        self._harvest_task: Optional[asyncio.Task] = None
+        self._session: Optional[aiohttp.ClientSession] = None
         logger.info(f"Initialized FREDService with base URL: {self.base_url}")
         logger.debug(f"API Key loaded: {'Yes' if self.api_key else 'No'}")
 
-    def get_series(self, series_id: str, limit: int = 10) -> List[dict]:
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session, created lazily inside the running loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60),
+            )
+        return self._session
+
+    async def close(self):
+        if self._harvest_task is not None:
+            self._harvest_task.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _request(self, path: str, params: Dict[str, Any], action: str) -> dict:
+        """GET a FRED endpoint through the pooled session and decode the JSON body"""
+        params = {"api_key": self.api_key, "file_type": "json", **params}
+        async with self._get_session().get(
+            f"{self.base_url}/{path}", params=params
+        ) as response:
+            if response.status != 200:
+                error_data = await response.text()
+                logger.error(f"FRED API error {action}: {error_data}")
+                response.raise_for_status()
+            return await response.json()
+
+    async def _fetch_metadata(self, series_id: str) -> Dict[str, Any]:
+        metadata = await self._request(
+            "series", {"series_id": series_id}, "getting series metadata"
+        )
+        if "seriess" not in metadata or not metadata["seriess"]:
+            raise ValueError(
+                f"Series ID '{series_id}' not found. Please check the series ID and try again."
+            )
+        series = metadata["seriess"][0]
+        self.search_index.add(series)
+        symbol_resolver.add_symbols("fred", [series["id"]])
+        return series
+
+    async def _fetch_observations(
+        self, series_id: str, observation_start: Optional[str] = None
+    ):
+        params = {"series_id": series_id, "sort_order": "asc", "units": "lin"}
+        if observation_start:
+            params["observation_start"] = observation_start
+        data = await self._request(
+            "series/observations", params, "getting observations"
+        )
+        return parse_observations(data.get("observations", []))
+
+    async def sync_series(self, series_id: str) -> StoredSeries:
+        """Bring the local copy of a series up to date and return it.
+
+        A stored series is only re-checked every ``store.check_interval``.
+        A check costs one metadata call, and observations are downloaded
+        only when FRED reports a newer ``last_updated``, starting from the
+        last stored date.
+        """
+        if not self.store.needs_check(series_id):
+            return self.store.get(series_id)
+
+        lock = self._sync_locks.setdefault(series_id, asyncio.Lock())
+        async with lock:
+            if not self.store.needs_check(series_id):
+                return self.store.get(series_id)
+
+            stored = self.store.get(series_id)
+            if stored is None:
+                logger.info(f"Loading full history for FRED series {series_id}")
+                results = await asyncio.gather(
+                    self._fetch_metadata(series_id),
+                    self._fetch_observations(series_id),
+                    return_exceptions=True,
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        raise result
+                metadata, (dates, values) = results
+                return self.store.upsert(series_id, metadata, dates, values)
+
+            metadata = await self._fetch_metadata(series_id)
+            if metadata.get("last_updated") == stored.last_updated:
+                self.store.mark_checked(series_id, metadata)
+                return stored
+
+            start = self.store.sync_start(series_id)
+            logger.info(
+                f"FRED series {series_id} updated at {metadata.get('last_updated')}, "
+                f"fetching observations from {start}"
+            )
+            dates, values = await self._fetch_observations(series_id, start)
+            return self.store.upsert(series_id, metadata, dates, values)
+
+    async def get_series(self, series_id: str, limit: int = 10) -> List[dict]:
         """
         Get economic data series from FRED
         Args:
@@ -24,192 +155,252 @@ class FREDService:
         """
         try:
             logger.info(f"Fetching FRED series: {series_id}, limit: {limit}")
+            stored = await self.sync_series(series_id)
 
-            # First get series metadata
-            metadata_params = {
-                "api_key": self.api_key,
-                "file_type": "json",
-                "series_id": series_id,
-            }
-
-            metadata_response = requests.get(
-                f"{self.base_url}/series", params=metadata_params, timeout=30
-            )
+            dates, values = stored.tail(limit)
+            metadata = stored.metadata
+            return [
+                {
+                    "date": date,
+                    "value": value,
+                    "series_id": series_id,
+                    "title": metadata["title"],
+                    "units": metadata["units"],
+                    "frequency": metadata["frequency"],
+                }
+                for date, value in zip(
+                    np.datetime_as_string(dates, unit="D").tolist(),
+                    np.where(np.isnan(values), None, values).tolist(),
+                )
+            ]
 
-            if metadata_response.status_code != 200:
-                error_data = metadata_response.json()
-                logger.error(f"FRED API error getting series metadata: {error_data}")
-                metadata_response.raise_for_status()
+        except ValueError as ve:
+            logger.error(f"Validation error in get_series: {str(ve)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error in get_series: {str(e)}", exc_info=True)
+            raise
 
-            metadata = metadata_response.json()
-            if "seriess" not in metadata or not metadata["seriess"]:
-                raise ValueError(
-                    f"Series ID '{series_id}' not found. Please check the series ID and try again."
-                )
+    async def get_series_batch(
+        self,
+        series_ids: List[str],
+        frequency: Optional[str] = None,
+        aggregation: str = "mean",
+        fill: Optional[str] = None,
+        spreads: Optional[List[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get several FRED series aligned on one date index, in columnar form
+        Args:
+            series_ids: FRED series IDs to join
+            frequency: Optional W/M/Q/A bucketing of the shared index
+            aggregation: How to reduce each bucket (mean, sum or last)
+            fill: "ffill" to carry observations forward over gaps
+            spreads: Derived differences written as "A-B" (e.g. "DGS10-DGS2")
+            start, end: Optional YYYY-MM-DD bounds on the index
+        """
+        try:
+            spread_pairs = []
+            for spread in spreads or []:
+                parts = spread.split("-")
+                if len(parts) != 2 or not all(parts):
+                    raise ValueError(f"Invalid spread '{spread}', expected A-B")
+                spread_pairs.append((spread, parts[0], parts[1]))
 
-            # Now get the observations
-            params = {
-                "api_key": self.api_key,
-                "file_type": "json",
-                "series_id": series_id,
-                "limit": limit,
-                "sort_order": "desc",  # Most recent first
-                "units": "lin",  # Linear units
-            }
+            # Spread legs are fetched even when not requested as series
+            legs = [leg for _, a, b in spread_pairs for leg in (a, b)]
+            ids = list(dict.fromkeys(series_ids + legs))
+            logger.info(f"Fetching FRED series batch: {ids}")
+            stored = await asyncio.gather(*[self.sync_series(i) for i in ids])
 
-            response = requests.get(
-                f"{self.base_url}/series/observations", params=params, timeout=30
+            dates, values = align_series(
+                stored, frequency, aggregation, fill, start, end
             )
+            column = {series_id: i for i, series_id in enumerate(ids)}
 
-            if response.status_code != 200:
-                error_data = response.json()
-                logger.error(f"FRED API error getting observations: {error_data}")
-                response.raise_for_status()
-
-            data = response.json()
-
-            if "observations" not in data:
-                logger.warning(f"No observations found for series: {series_id}")
-                return []
-
-            # Transform the data into a more usable format
-            observations = []
-            for obs in data["observations"]:
-                try:
-                    value = float(obs["value"]) if obs["value"] != "." else None
-                    observations.append(
-                        {
-                            "date": obs["date"],
-                            "value": value,
-                            "series_id": series_id,
-                            "title": metadata["seriess"][0]["title"],
-                            "units": metadata["seriess"][0]["units"],
-                            "frequency": metadata["seriess"][0]["frequency"],
-                        }
-                    )
-                except (ValueError, TypeError) as e:
-                    logger.warning(
-                        f"Error processing observation for date {obs.get('date')}: {str(e)}"
-                    )
-                    continue
-
-            return observations
+            def to_list(array: np.ndarray) -> List[Optional[float]]:
+                return np.where(np.isnan(array), None, array).tolist()
 
+            return {
+                "dates": np.datetime_as_string(dates, unit="D").tolist(),
+                "series": {
+                    s.series_id: {
+                        "title": s.metadata["title"],
+                        "units": s.metadata["units"],
+                        "frequency": s.metadata["frequency"],
+                        "values": to_list(values[:, column[s.series_id]]),
+                    }
+                    for s in stored
+                    if s.series_id in series_ids
+                },
+                "spreads": {
+                    name: to_list(values[:, column[a]] - values[:, column[b]])
+                    for name, a, b in spread_pairs
+                },
+            }
         except ValueError as ve:
-            logger.error(f"Validation error in get_series: {str(ve)}")
+            logger.error(f"Validation error in get_series_batch: {str(ve)}")
             raise
         except Exception as e:
-            logger.error(f"Error in get_series: {str(e)}", exc_info=True)
+            logger.error(f"Error in get_series_batch: {str(e)}", exc_info=True)
             raise
 
-    def search_series(self, search_text: str, limit: int = 10) -> List[dict]:
+    async def _search_upstream(self, search_text: str, limit: int) -> List[dict]:
+        params = {
+            "search_text": search_text,
+            "limit": limit,
+            "sort_order": "desc",
+            "order_by": "popularity",
+            "filter_variable": "frequency",
+            "filter_value": ",".join(SEARCH_FREQUENCIES),
+        }
+        data = await self._request("series/search", params, "in search")
+        if "seriess" not in data:
+            logger.warning(f"No series found for search: {search_text}")
+        series = data.get("seriess", [])
+        self.search_index.add_all(series)
+        symbol_resolver.add_symbols("fred", (s["id"] for s in series))
+        self._searched[" ".join(tokenize(search_text))] = time.time()
+        return series
+
+    async def harvest_popular_series(self, terms=POPULAR_SEARCH_TERMS):
+        """Seed the local search index with the most popular series per term"""
+        results = await asyncio.gather(
+            *(self._search_upstream(term, self.search_harvest_limit) for term in terms),
+            return_exceptions=True,
+        )
+        for term, result in zip(terms, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to harvest FRED series for '{term}': {result}")
+        logger.info(f"FRED search index holds {len(self.search_index)} series")
+
+    def start_search_harvest(self):
+        """Harvest the popular-series catalog in the background"""
+        if self._harvest_task is None or self._harvest_task.done():
+            self._harvest_task = asyncio.create_task(self.harvest_popular_series())
+
+    async def search_series(self, search_text: str, limit: int = 10) -> List[dict]:
         """
         Search for FRED series by text
         Args:
             search_text: Text to search for in series titles
             limit: Maximum number of results to return
+
+        Answered from the local index; FRED is only asked when the index
+        has fewer than ``limit`` hits and the query was not sent recently.
         """
         try:
             logger.info(f"Searching FRED series for: {search_text}")
 
+            results = self.search_index.search(search_text, limit)
+            key = " ".join(tokenize(search_text))
+            searched_at = self._searched.get(key)
+            if (
+                len(results) >= limit
+                or not key
+                or (searched_at and time.time() - searched_at < self.search_ttl)
+            ):
+                return results
+
+            await self._search_upstream(
+                search_text, max(limit, self.search_fetch_limit)
+            )
+            return self.search_index.search(search_text, limit)
+
+        except Exception as e:
+            logger.error(f"Error in search_series: {str(e)}", exc_info=True)
+            raise
+
+    async def _fetch_release_dates(self, start: str, end: str) -> List[dict]:
+        """All scheduled release dates in a window, following FRED's pagination"""
+        release_dates: List[dict] = []
+        offset = 0
+        while True:
             params = {
-                "api_key": self.api_key,
-                "file_type": "json",
-                "search_text": search_text,
-                "limit": limit,
-                "sort_order": "desc",
-                "order_by": "popularity",
-                "filter_variable": "frequency",
-                "filter_value": "Monthly,Quarterly,Annual",  # Common frequencies
+                "realtime_start": start,
+                "realtime_end": end,
+                "include_release_dates_with_no_data": "true",
+                "order_by": "release_date",
+                "sort_order": "asc",
+                "limit": 1000,
+                "offset": offset,
             }
-
-            response = requests.get(
-                f"{self.base_url}/series/search", params=params, timeout=30
+            data = await self._request(
+                "releases/dates", params, "getting release dates"
             )
+            page = data.get("release_dates", [])
+            release_dates.extend(page)
+            offset += len(page)
+            if not page or offset >= data.get("count", 0):
+                return release_dates
 
-            if response.status_code != 200:
-                error_data = response.json()
-                logger.error(f"FRED API error in search: {error_data}")
-                response.raise_for_status()
+    async def refresh_release_catalog(self) -> ReleaseCatalog:
+        """Download the release list and upcoming release dates together"""
+        today = datetime.now()
+        start = today.strftime("%Y-%m-%d")
+        end = (today + timedelta(days=self.release_horizon_days)).strftime("%Y-%m-%d")
+        logger.info(f"Refreshing FRED release catalog for {start} to {end}")
 
-            data = response.json()
-
-            if "seriess" not in data:
-                logger.warning(f"No series found for search: {search_text}")
-                return []
-
-            # Transform the search results to include more useful information
-            results = []
-            for series in data["seriess"]:
-                results.append(
-                    {
-                        "id": series["id"],
-                        "title": series["title"],
-                        "frequency": series["frequency"],
-                        "units": series["units"],
-                        "seasonal_adjustment": series["seasonal_adjustment"],
-                        "last_updated": series["last_updated"],
-                        "notes": series.get("notes", ""),
-                        "observation_start": series["observation_start"],
-                        "observation_end": series["observation_end"],
-                    }
-                )
+        params = {"sort_order": "asc", "order_by": "release_id", "limit": 1000}
+        data, release_dates = await asyncio.gather(
+            self._request("releases", params, "getting releases"),
+            self._fetch_release_dates(start, end),
+        )
+        if "releases" not in data:
+            logger.warning("No releases found in FRED response.")
+        self._release_catalog = ReleaseCatalog(data.get("releases", []), release_dates)
+        return self._release_catalog
 
-            return results
+    async def get_release_catalog(self) -> ReleaseCatalog:
+        """Cached release catalog, refreshed in the background once a day"""
+        catalog = self._release_catalog
+        if catalog is None:
+            if self._catalog_refresh is None or self._catalog_refresh.done():
+                self._catalog_refresh = asyncio.create_task(
+                    self.refresh_release_catalog()
+                )
+            return await asyncio.shield(self._catalog_refresh)
 
-        except Exception as e:
-            logger.error(f"Error in search_series: {str(e)}", exc_info=True)
-            raise
+        if time.time() - catalog.loaded_at >= self.release_catalog_ttl and (
+            self._catalog_refresh is None or self._catalog_refresh.done()
+        ):
+            # Serve the current catalog while the new one loads
+            self._catalog_refresh = asyncio.create_task(self.refresh_release_catalog())
+        return catalog
 
-    def get_upcoming_releases(
-        self, filter_names: Optional[List[str]] = None
+    async def get_upcoming_releases(
+        self,
+        filter_names: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        days: Optional[int] = None,
     ) -> List[dict]:
         """
-        Fetch all upcoming economic releases from FRED, optionally filtering by release names.
+        Upcoming economic releases from the cached FRED release catalog.
         Args:
             filter_names: Optional list of release names to include (case-insensitive, partial match allowed)
+            limit: Maximum number of results to return
+            days: Only return scheduled dates within this many days; without it
+                every matching release is returned once with its next date
         Returns:
-            List of upcoming releases with name, id, link, and notes
+            List of releases with id, name, link, notes and date, soonest first
         """
         try:
-            logger.info(f"Fetching all FRED releases. Filter: {filter_names}")
-            params = {
-                "api_key": self.api_key,
-                "file_type": "json",
-                "sort_order": "asc",
-                "order_by": "release_id",
-                "limit": 1000,
-            }
-            response = requests.get(
-                f"{self.base_url}/releases", params=params, timeout=30
+            logger.info(
+                f"Querying FRED release catalog. Filter: {filter_names}, days: {days}"
+            )
+            catalog = await self.get_release_catalog()
+            if days is None:
+                return catalog.catalog(filter_names, limit)
+
+            today = datetime.now()
+            return catalog.upcoming(
+                filter_names,
+                start=today.strftime("%Y-%m-%d"),
+                end=(today + timedelta(days=days)).strftime("%Y-%m-%d"),
+                limit=limit,
             )
-            if response.status_code != 200:
-                logger.error(f"FRED API error getting releases: {response.text}")
-                response.raise_for_status()
-            data = response.json()
-            if "releases" not in data:
-                logger.warning("No releases found in FRED response.")
-                return []
-            releases = data["releases"]
-            # Optionally filter by name
-            if filter_names:
-                filter_names_lower = [n.lower() for n in filter_names]
-                releases = [
-                    r
-                    for r in releases
-                    if any(fn in r["name"].lower() for fn in filter_names_lower)
-                ]
-            # Only include future releases if possible (FRED does not provide future dates here, but we can include all for now)
-            # For each release, include id, name, link, notes
-            return [
-                {
-                    "id": r["id"],
-                    "name": r["name"],
-                    "link": r.get("link", None),
-                    "notes": r.get("notes", ""),
-                }
-                for r in releases
-            ]
         except Exception as e:
             logger.error(f"Error in get_upcoming_releases: {str(e)}", exc_info=True)
             raise
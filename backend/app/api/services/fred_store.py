@@ -0,0 +1,152 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from app.api.services.array_ops import forward_fill, group_reduce, period_start
+
+
+@dataclass
+class StoredSeries:
+    series_id: str
+    metadata: Dict[str, Any]
+    dates: np.ndarray  # datetime64[D], ascending
+    values: np.ndarray  # float64, NaN where FRED reports "."
+    checked_at: float
+
+    @property
+    def last_updated(self) -> Optional[str]:
+        return self.metadata.get("last_updated")
+
+    @property
+    def observation_end(self) -> Optional[str]:
+        return self.metadata.get("observation_end")
+
+    def tail(self, limit: int):
+        """Latest ``limit`` observations, most recent first"""
+        limit = max(limit, 0)
+        return self.dates[::-1][:limit], self.values[::-1][:limit]
+
+
+def parse_observations(observations: Iterable[Dict[str, str]]):
+    """Turn FRED observation dicts into (dates, values) arrays in one pass each"""
+    observations = list(observations)
+    dates = np.array([o["date"] for o in observations], dtype="datetime64[D]")
+    raw = np.array([o["value"] for o in observations], dtype=object)
+    values = np.where(raw == ".", "nan", raw).astype(np.float64)
+    return dates, values
+
+
+class FREDObservationStore:
+    """Process-local store of every observation fetched per FRED series.
+
+    Each series keeps its FRED metadata (including ``last_updated`` and
+    ``observation_end``) and the time it was last checked against FRED, so
+    the service can decide when to ask for updates and which
+    ``observation_start`` to request.
+    """
+
+    def __init__(self, check_interval: float = 60 * 60, revision_lookback: int = 3):
+        self.check_interval = check_interval
+        self.revision_lookback = revision_lookback
+        self._series: Dict[str, StoredSeries] = {}
+
+    def get(self, series_id: str) -> Optional[StoredSeries]:
+        return self._series.get(series_id)
+
+    def needs_check(self, series_id: str, now: Optional[float] = None) -> bool:
+        stored = self._series.get(series_id)
+        now = time.time() if now is None else now
+        return stored is None or now - stored.checked_at >= self.check_interval
+
+    def sync_start(self, series_id: str) -> Optional[str]:
+        """``observation_start`` for an incremental fetch.
+
+        Re-requests the last few stored observations as well, so revisions
+        to the most recent prints are picked up with the new data.
+        """
+        stored = self._series.get(series_id)
+        if stored is None or not len(stored.dates):
+            return None
+        index = max(len(stored.dates) - self.revision_lookback, 0)
+        return str(stored.dates[index])
+
+    def mark_checked(
+        self, series_id: str, metadata: Dict[str, Any], now: Optional[float] = None
+    ):
+        stored = self._series[series_id]
+        stored.metadata = metadata
+        stored.checked_at = time.time() if now is None else now
+
+    def upsert(
+        self,
+        series_id: str,
+        metadata: Dict[str, Any],
+        dates: np.ndarray,
+        values: np.ndarray,
+        now: Optional[float] = None,
+    ) -> StoredSeries:
+        """Merge fetched observations; fetched dates replace stored ones"""
+        now = time.time() if now is None else now
+        stored = self._series.get(series_id)
+        if stored is not None and len(dates):
+            keep = stored.dates < dates[0]
+            dates = np.concatenate([stored.dates[keep], dates])
+            values = np.concatenate([stored.values[keep], values])
+        elif stored is not None:
+            dates, values = stored.dates, stored.values
+
+        stored = StoredSeries(
+            series_id=series_id,
+            metadata=metadata,
+            dates=dates,
+            values=values,
+            checked_at=now,
+        )
+        self._series[series_id] = stored
+        return stored
+
+    def series_ids(self) -> List[str]:
+        return list(self._series)
+
+
+def align_series(
+    series: List[StoredSeries],
+    frequency: Optional[str] = None,
+    aggregation: str = "mean",
+    fill: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+):
+    """Outer-join stored series onto one shared date index.
+
+    Returns ``(dates, values)`` where ``values`` is a (dates, series) array
+    with NaN for missing observations. ``frequency`` (W/M/Q/A) buckets the
+    index by period start and reduces each bucket with ``aggregation``;
+    ``fill="ffill"`` carries the last observation forward.
+    """
+    if not series:
+        return np.array([], dtype="datetime64[D]"), np.empty((0, 0))
+
+    dates = np.unique(np.concatenate([s.dates for s in series]))
+    values = np.full((len(dates), len(series)), np.nan)
+    for column, s in enumerate(series):
+        values[np.searchsorted(dates, s.dates), column] = s.values
+
+    if start or end:
+        lower = np.datetime64(start, "D") if start else dates[:1]
+        upper = np.datetime64(end, "D") if end else dates[-1:]
+        keep = (dates >= lower) & (dates <= upper)
+        dates, values = dates[keep], values[keep]
+
+    if frequency:
+        periods, groups = np.unique(
+            period_start(dates, frequency.upper()), return_inverse=True
+        )
+        values = group_reduce(values, groups.ravel(), len(periods), aggregation)
+        dates = periods
+
+    if fill == "ffill" and len(dates):
+        values = forward_fill(values)
+    elif fill:
+        raise ValueError(f"Unsupported fill '{fill}', use ffill")
+    return dates, values
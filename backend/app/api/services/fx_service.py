@@ -0,0 +1,197 @@
+import ccxt.async_support as ccxt
+import asyncio
+import time
+from typing import Dict, List, Optional, Sequence
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Pairs quoted by the FX source exchange. Anything not listed directly is
+# triangulated through the pivot currencies below.
+DEFAULT_FX_PAIRS = [
+    "USDT/USD",
+    "USDC/USD",
+    "USDT/CAD",
+    "USD/CAD",
+    "USDT/EUR",
+    "EUR/USD",
+    "USDT/GBP",
+    "GBP/USD",
+    "AUD/USD",
+    "USD/JPY",
+    "USD/CHF",
+]
+PIVOT_CURRENCIES = ("USDT", "USD")
+
+
+class FXRateService:
+    """Cached matrix of conversion rates, refreshed in the background.
+
+    ``rates[i, j]`` holds how many units of currency ``j`` one unit of
+    currency ``i`` buys. Lookups never hit the network once the matrix has
+    been loaded; a rate older than its max staleness is treated as missing
+    and the conversion falls back to triangulation through USDT/USD.
+    """
+
+    def __init__(
+        self,
+        exchange_id: str = "kraken",
+        pairs: Sequence[str] = DEFAULT_FX_PAIRS,
+        refresh_interval: float = 60.0,
+        max_staleness: float = 300.0,
+        pair_max_staleness: Optional[Dict[str, float]] = None,
+    ):
+        self.exchange_id = exchange_id
+        self.exchange = None
+        self.pairs = list(pairs)
+        self.available_pairs = list(pairs)
+        self.refresh_interval = refresh_interval
+
+        currencies = []
+        for pair in self.pairs:
+            for currency in pair.split("/"):
+                if currency not in currencies:
+                    currencies.append(currency)
+        self.currencies: List[str] = currencies
+        self.index: Dict[str, int] = {c: i for i, c in enumerate(currencies)}
+
+        n = len(currencies)
+        self.rates = np.full((n, n), np.nan)
+        self.updated_at = np.full((n, n), -np.inf)
+        self.max_age = np.full((n, n), float(max_staleness))
+        for pair, seconds in (pair_max_staleness or {}).items():
+            base, quote = pair.split("/")
+            i, j = self.index[base], self.index[quote]
+            self.max_age[i, j] = self.max_age[j, i] = seconds
+        np.fill_diagonal(self.rates, 1.0)
+        np.fill_diagonal(self.updated_at, np.inf)
+
+        self.last_refresh: Optional[float] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def supports(self, currency: str) -> bool:
+        return currency.upper() in self.index
+
+    def update_rates(self, tickers: Dict[str, Dict], now: Optional[float] = None):
+        """Write direct quotes from a ccxt ``fetch_tickers`` result into the matrix"""
+        now = time.time() if now is None else now
+        for pair, ticker in tickers.items():
+            last = ticker.get("last")
+            if pair not in self.pairs or not last:
+                continue
+            base, quote = pair.split("/")
+            i, j = self.index[base], self.index[quote]
+            timestamp = ticker.get("timestamp")
+            quoted_at = timestamp / 1000 if timestamp else now
+            self.rates[i, j] = last
+            self.rates[j, i] = 1.0 / last
+            self.updated_at[i, j] = self.updated_at[j, i] = quoted_at
+        self.last_refresh = now
+
+    def rate_matrix(self, now: Optional[float] = None) -> np.ndarray:
+        """Effective conversion matrix with stale rates dropped and gaps triangulated"""
+        now = time.time() if now is None else now
+        fresh = (now - self.updated_at) <= self.max_age
+        direct = np.where(fresh, self.rates, np.nan)
+        matrix = direct.copy()
+
+        pivots = [self.index[p] for p in PIVOT_CURRENCIES if p in self.index]
+        # One hop: i -> pivot -> j
+        for p in pivots:
+            via = direct[:, p, None] * direct[None, p, :]
+            matrix = np.where(np.isnan(matrix), via, matrix)
+        # Two hops: i -> pivot -> other pivot -> j
+        for p in pivots:
+            for q in pivots:
+                if p == q:
+                    continue
+                via = direct[:, p, None] * direct[p, q] * direct[None, q, :]
+                matrix = np.where(np.isnan(matrix), via, matrix)
+        return matrix
+
+    def get_rate(self, from_currency: str, to_currency: str) -> float:
+        """Units of ``to_currency`` per unit of ``from_currency``"""
+        from_currency, to_currency = from_currency.upper(), to_currency.upper()
+        for currency in (from_currency, to_currency):
+            if not self.supports(currency):
+                raise ValueError(f"Unsupported currency: {currency}")
+        if from_currency == to_currency:
+            return 1.0
+
+        rate = self.rate_matrix()[self.index[from_currency], self.index[to_currency]]
+        if np.isnan(rate):
+            raise ValueError(
+                f"No fresh conversion rate available for {from_currency}/{to_currency}"
+            )
+        return float(rate)
+
+    def rates_from(self, base: str) -> Dict[str, Optional[float]]:
+        """Row of the effective matrix for ``base``, with missing rates as None"""
+        row = self.rate_matrix()[self.index[base.upper()]]
+        return {
+            currency: None if np.isnan(rate) else float(rate)
+            for currency, rate in zip(self.currencies, row)
+        }
+
+    def convert(self, values, from_currency: str, to_currency: str) -> np.ndarray:
+        """Convert an array of amounts with a single vectorized multiply"""
+        return np.asarray(values, dtype=np.float64) * self.get_rate(
+            from_currency, to_currency
+        )
+
+    async def refresh(self):
+        """Fetch every configured pair in one batched ticker call"""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            if self.exchange is None:
+                # Kept only once markets load, so a failed load is retried
+                exchange = getattr(ccxt, self.exchange_id)({"enableRateLimit": True})
+                try:
+                    markets = await exchange.load_markets()
+                except Exception:
+                    await exchange.close()
+                    raise
+                missing = [p for p in self.pairs if p not in markets]
+                if missing:
+                    logger.warning(
+                        f"{self.exchange_id} does not list FX pairs {missing}, "
+                        "they will be triangulated"
+                    )
+                self.available_pairs = [p for p in self.pairs if p in markets]
+                self.exchange = exchange
+
+            tickers = await self.exchange.fetch_tickers(self.available_pairs)
+            self.update_rates(tickers)
+            logger.info(f"Refreshed {len(tickers)} FX rates from {self.exchange_id}")
+
+    async def ensure_loaded(self):
+        """Load the matrix on first use; afterwards the refresh loop keeps it current"""
+        if self.last_refresh is None:
+            await self.refresh()
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing FX rates: {str(e)}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.exchange is not None:
+            await self.exchange.close()
+            self.exchange = None
+
+
+# Create a single instance of the service
+fx_service = FXRateService()
@@ -2,7 +2,8 @@ import ccxt
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 import logging
-import pandas as pd
+import numpy as np
+from app.api.services.candle_frame import CandleFrame
 
 logger = logging.getLogger(__name__)
 
@@ -32,17 +33,7 @@ class HyperliquidService:
             )
 
             # Transform to our expected format
-            transformed_data = [
-                {
-                    "time": candle[0],  # timestamp
-                    "open": float(candle[1]),
-                    "high": float(candle[2]),
-                    "low": float(candle[3]),
-                    "close": float(candle[4]),
-                    "volume": float(candle[5]),
-                }
-                for candle in ohlcv
-            ]
+            transformed_data = CandleFrame.from_ohlcv(ohlcv).to_records()
 
             logger.info(
                 f"Retrieved {len(transformed_data)} candles for {formatted_symbol}"
@@ -72,10 +63,7 @@ class HyperliquidService:
             ohlcv = self.exchange.fetch_ohlcv(
                 formatted_symbol, timeframe="1h", limit=24
             )
-            df = pd.DataFrame(
-                ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]
-            )
-            total_volume = df["volume"].sum()
+            total_volume = np.nansum(CandleFrame.from_ohlcv(ohlcv).volume)
 
             return {
                 "dayNtlVlm": str(total_volume),
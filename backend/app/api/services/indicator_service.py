@@ -0,0 +1,482 @@
+import copy
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Any
+import logging
+import numpy as np
+from app.api.services.candle_frame import CandleFrame
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndicatorConfig:
+    sma_windows: Tuple[int, ...] = (20, 50)
+    ema_spans: Tuple[int, ...] = (12, 26)
+    rsi_period: int = 14
+    macd_fast: int = 12
+    macd_slow: int = 26
+    macd_signal: int = 9
+    bb_window: int = 20
+    bb_stddev: float = 2.0
+    atr_period: int = 14
+
+    @property
+    def ring_size(self) -> int:
+        return max(self.sma_windows + (self.bb_window,))
+
+    @property
+    def warmup(self) -> int:
+        """Candles needed before every indicator has left its seeding phase"""
+        return max(
+            self.ring_size,
+            max(self.ema_spans + (self.macd_slow,)) + self.macd_signal,
+            self.rsi_period + 1,
+            self.atr_period,
+        )
+
+
+# Vectorized kernels. Every function takes arrays shaped (n_symbols, n_candles)
+# and works along the last axis, so a batch of equal-length series is computed
+# with the same NumPy calls as a single one.
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < window:
+        return out
+    csum = np.cumsum(x, axis=-1)
+    csum = np.concatenate([np.zeros(x.shape[:-1] + (1,)), csum], axis=-1)
+    out[..., window - 1 :] = (csum[..., window:] - csum[..., :-window]) / window
+    return out
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    mean = rolling_mean(x, window)
+    mean_sq = rolling_mean(x * x, window)
+    return np.sqrt(np.clip(mean_sq - mean * mean, 0.0, None))
+
+
+def recursive_smooth(
+    x: np.ndarray, alpha: float, period: int, start: int = 0
+) -> np.ndarray:
+    """Exponential smoothing seeded with the SMA of the first ``period`` values.
+
+    ``alpha = 2 / (span + 1)`` gives an EMA and ``alpha = 1 / period`` gives
+    Wilder's smoothing. Values before ``start`` are ignored (e.g. the NaN
+    warmup of an upstream indicator).
+    """
+    out = np.full(x.shape, np.nan)
+    seed = start + period - 1
+    if x.shape[-1] <= seed:
+        return out
+    value = x[..., start : seed + 1].mean(axis=-1)
+    out[..., seed] = value
+    for i in range(seed + 1, x.shape[-1]):
+        value = value + alpha * (x[..., i] - value)
+        out[..., i] = value
+    return out
+
+
+def ema(x: np.ndarray, span: int, start: int = 0) -> np.ndarray:
+    return recursive_smooth(x, 2.0 / (span + 1), span, start)
+
+
+def wilder_averages(close: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Wilder-smoothed average gain and loss, aligned with ``close``"""
+    delta = np.diff(close, axis=-1)
+    pad = np.full(close.shape[:-1] + (1,), np.nan)
+    avg_gain = recursive_smooth(np.clip(delta, 0.0, None), 1.0 / period, period)
+    avg_loss = recursive_smooth(np.clip(-delta, 0.0, None), 1.0 / period, period)
+    return (
+        np.concatenate([pad, avg_gain], axis=-1),
+        np.concatenate([pad, avg_loss], axis=-1),
+    )
+
+
+def rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(
+            avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        )
+    return np.where(np.isnan(avg_gain), np.nan, rsi)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+    tr = np.maximum(
+        high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))
+    )
+    tr[..., 0] = high[..., 0] - low[..., 0]
+    return tr
+
+
+def vwap(high, low, close, volume) -> np.ndarray:
+    typical = (high + low + close) / 3.0
+    cum_volume = np.cumsum(volume, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            cum_volume > 0, np.cumsum(typical * volume, axis=-1) / cum_volume, np.nan
+        )
+
+
+def compute_indicators(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    config: IndicatorConfig = IndicatorConfig(),
+    state_series: Optional[Dict[str, np.ndarray]] = None,
+) -> Dict[str, np.ndarray]:
+    """Compute the full indicator set over (n_symbols, n_candles) arrays.
+
+    If ``state_series`` is given it is filled with the intermediate series
+    (every EMA, RSI averages) needed to seed ``StreamingIndicators``.
+    """
+    out = {}
+    emas = {}
+    for window in config.sma_windows:
+        out[f"sma_{window}"] = rolling_mean(close, window)
+    for span in set(config.ema_spans) | {config.macd_fast, config.macd_slow}:
+        emas[span] = ema(close, span)
+    for span in config.ema_spans:
+        out[f"ema_{span}"] = emas[span]
+
+    avg_gain, avg_loss = wilder_averages(close, config.rsi_period)
+    out["rsi"] = rsi_from_averages(avg_gain, avg_loss)
+
+    macd_line = emas[config.macd_fast] - emas[config.macd_slow]
+    signal = ema(macd_line, config.macd_signal, start=config.macd_slow - 1)
+    out["macd"] = macd_line
+    out["macd_signal"] = signal
+    out["macd_hist"] = macd_line - signal
+
+    middle = rolling_mean(close, config.bb_window)
+    width = config.bb_stddev * rolling_std(close, config.bb_window)
+    out["bb_upper"] = middle + width
+    out["bb_middle"] = middle
+    out["bb_lower"] = middle - width
+
+    out["atr"] = recursive_smooth(
+        true_range(high, low, close), 1.0 / config.atr_period, config.atr_period
+    )
+    out["vwap"] = vwap(high, low, close, volume)
+
+    if state_series is not None:
+        state_series["avg_gain"] = avg_gain
+        state_series["avg_loss"] = avg_loss
+        for span, values in emas.items():
+            state_series[f"ema_{span}"] = values
+    return out
+
+
+class StreamingIndicators:
+    """O(1)-per-candle update state for one symbol.
+
+    Mirrors ``compute_indicators`` exactly: feeding the same candles through
+    ``update`` one by one yields the same values as the vectorized kernels.
+    """
+
+    def __init__(self, config: IndicatorConfig = IndicatorConfig()):
+        self.config = config
+        self.count = 0
+        self.ring = np.zeros(config.ring_size)
+        windows = set(config.sma_windows) | {config.bb_window}
+        self.sums = {w: 0.0 for w in windows}
+        self.bb_sumsq = 0.0
+
+        spans = set(config.ema_spans) | {config.macd_fast, config.macd_slow}
+        self.emas = {s: np.nan for s in spans}
+        self.ema_seed_sums = {s: 0.0 for s in spans}
+        self.macd_count = 0
+        self.macd_seed_sum = 0.0
+        self.signal = np.nan
+
+        self.prev_close = np.nan
+        self.avg_gain = np.nan
+        self.avg_loss = np.nan
+        self.gain_seed_sum = 0.0
+        self.loss_seed_sum = 0.0
+
+        self.atr = np.nan
+        self.tr_seed_sum = 0.0
+
+        self.cum_pv = 0.0
+        self.cum_volume = 0.0
+
+    @classmethod
+    def from_arrays(
+        cls,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        outputs: Dict[str, np.ndarray],
+        state_series: Dict[str, np.ndarray],
+        config: IndicatorConfig = IndicatorConfig(),
+    ) -> "StreamingIndicators":
+        """Build the state left behind by ``compute_indicators`` over 1-D arrays"""
+        state = cls(config)
+        n = close.shape[-1]
+        if n < config.warmup:
+            # Still seeding; replaying the few candles is cheaper than special-casing
+            for i in range(n):
+                state.update(high[i], low[i], close[i], volume[i])
+            return state
+
+        state.count = n
+        tail = close[-config.ring_size :]
+        state.ring = np.roll(tail, n % config.ring_size)
+        for w in state.sums:
+            state.sums[w] = float(close[-w:].sum())
+        state.bb_sumsq = float((close[-config.bb_window :] ** 2).sum())
+
+        for s in state.emas:
+            state.emas[s] = float(state_series[f"ema_{s}"][-1])
+        state.macd_count = n - (config.macd_slow - 1)
+        state.signal = float(outputs["macd_signal"][-1])
+
+        state.prev_close = float(close[-1])
+        state.avg_gain = float(state_series["avg_gain"][-1])
+        state.avg_loss = float(state_series["avg_loss"][-1])
+        state.atr = float(outputs["atr"][-1])
+
+        typical = (high + low + close) / 3.0
+        state.cum_pv = float((typical * volume).sum())
+        state.cum_volume = float(volume.sum())
+        return state
+
+    def _smooth(self, value: float, prev: float, alpha: float) -> float:
+        return prev + alpha * (value - prev)
+
+    def update(
+        self, high: float, low: float, close: float, volume: float
+    ) -> Dict[str, float]:
+        config = self.config
+        n = self.count + 1
+        slot = self.count % config.ring_size
+        for w in self.sums:
+            if self.count >= w:
+                self.sums[w] -= self.ring[(self.count - w) % config.ring_size]
+            self.sums[w] += close
+        if self.count >= config.bb_window:
+            leaving = self.ring[(self.count - config.bb_window) % config.ring_size]
+            self.bb_sumsq -= leaving * leaving
+        self.bb_sumsq += close * close
+        self.ring[slot] = close
+
+        for s in self.emas:
+            if n < s:
+                self.ema_seed_sums[s] += close
+            elif n == s:
+                self.emas[s] = (self.ema_seed_sums[s] + close) / s
+            else:
+                self.emas[s] = self._smooth(close, self.emas[s], 2.0 / (s + 1))
+
+        out = {}
+        for window in config.sma_windows:
+            out[f"sma_{window}"] = self.sums[window] / window if n >= window else np.nan
+        for span in config.ema_spans:
+            out[f"ema_{span}"] = self.emas[span]
+
+        # Wilder RSI over close-to-close deltas
+        if self.count > 0:
+            delta = close - self.prev_close
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            p = config.rsi_period
+            if self.count < p:
+                self.gain_seed_sum += gain
+                self.loss_seed_sum += loss
+            elif self.count == p:
+                self.avg_gain = (self.gain_seed_sum + gain) / p
+                self.avg_loss = (self.loss_seed_sum + loss) / p
+            else:
+                self.avg_gain = self._smooth(gain, self.avg_gain, 1.0 / p)
+                self.avg_loss = self._smooth(loss, self.avg_loss, 1.0 / p)
+        if np.isnan(self.avg_gain):
+            out["rsi"] = np.nan
+        elif self.avg_loss == 0:
+            out["rsi"] = 100.0
+        else:
+            out["rsi"] = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+        # MACD and its signal line, seeded once the slow EMA exists
+        macd_line = self.emas[config.macd_fast] - self.emas[config.macd_slow]
+        if not np.isnan(macd_line):
+            self.macd_count += 1
+            k = config.macd_signal
+            if self.macd_count < k:
+                self.macd_seed_sum += macd_line
+            elif self.macd_count == k:
+                self.signal = (self.macd_seed_sum + macd_line) / k
+            else:
+                self.signal = self._smooth(macd_line, self.signal, 2.0 / (k + 1))
+        out["macd"] = macd_line
+        out["macd_signal"] = self.signal
+        out["macd_hist"] = macd_line - self.signal
+
+        w = config.bb_window
+        if n >= w:
+            middle = self.sums[w] / w
+            variance = max(self.bb_sumsq / w - middle * middle, 0.0)
+            width = config.bb_stddev * np.sqrt(variance)
+            out["bb_upper"], out["bb_middle"], out["bb_lower"] = (
+                middle + width,
+                middle,
+                middle - width,
+            )
+        else:
+            out["bb_upper"] = out["bb_middle"] = out["bb_lower"] = np.nan
+
+        if self.count == 0:
+            tr = high - low
+        else:
+            tr = max(
+                high - low, abs(high - self.prev_close), abs(low - self.prev_close)
+            )
+        p = config.atr_period
+        if n < p:
+            self.tr_seed_sum += tr
+        elif n == p:
+            self.atr = (self.tr_seed_sum + tr) / p
+        else:
+            self.atr = self._smooth(tr, self.atr, 1.0 / p)
+        out["atr"] = self.atr
+
+        self.cum_pv += (high + low + close) / 3.0 * volume
+        self.cum_volume += volume
+        out["vwap"] = self.cum_pv / self.cum_volume if self.cum_volume > 0 else np.nan
+
+        self.prev_close = close
+        self.count = n
+        return out
+
+    def peek(
+        self, high: float, low: float, close: float, volume: float
+    ) -> Dict[str, float]:
+        """Indicator values for a still-forming candle, without committing it"""
+        return copy.deepcopy(self).update(high, low, close, volume)
+
+
+@dataclass
+class _CacheEntry:
+    timestamps: np.ndarray
+    last_candle: np.ndarray
+    outputs: Dict[str, np.ndarray]
+    state: StreamingIndicators = field(repr=False)
+
+
+class IndicatorEngine:
+    """Indicator results cached per series and keyed by the last candle.
+
+    The last candle of an exchange OHLCV response is usually still forming,
+    so the streaming state is committed only up to the previous candle and
+    the forming one is evaluated with ``peek``. A repeat request with the
+    same last candle is a dictionary lookup; a request that adds k closed
+    candles costs k O(1) updates.
+    """
+
+    def __init__(self, config: IndicatorConfig = IndicatorConfig(), max_history=5000):
+        self.config = config
+        self.max_history = max_history
+        self.cache: Dict[Any, _CacheEntry] = {}
+
+    def compute(self, key, ohlcv) -> Dict[str, List[Optional[float]]]:
+        return self.compute_batch({key: ohlcv})[key]
+
+    def compute_batch(self, series: Dict[Any, list]) -> Dict[Any, Dict[str, list]]:
+        """Compute indicators for many series, vectorizing the cold ones together"""
+        results = {}
+        cold: Dict[int, List[Tuple[Any, np.ndarray]]] = {}
+        for key, ohlcv in series.items():
+            if not len(ohlcv):
+                results[key] = {}
+                continue
+            columns = CandleFrame.from_ohlcv(ohlcv).data
+            entry = self.cache.get(key)
+            if entry is not None and self._extend(entry, columns):
+                results[key] = self._serialize(entry, columns)
+            else:
+                cold.setdefault(columns.shape[1], []).append((key, columns))
+
+        for length, group in cold.items():
+            stacked = np.stack([columns for _, columns in group], axis=1)
+            _, _, high, low, close, volume = stacked
+            state_series = {}
+            outputs = compute_indicators(
+                high, low, close, volume, self.config, state_series
+            )
+            for row, (key, columns) in enumerate(group):
+                row_outputs = {name: values[row] for name, values in outputs.items()}
+                committed = slice(0, length - 1)
+                state = StreamingIndicators.from_arrays(
+                    high[row, committed],
+                    low[row, committed],
+                    close[row, committed],
+                    volume[row, committed],
+                    {name: values[committed] for name, values in row_outputs.items()},
+                    {
+                        name: values[row, committed]
+                        for name, values in state_series.items()
+                    },
+                    self.config,
+                )
+                entry = _CacheEntry(
+                    timestamps=columns[0].copy(),
+                    last_candle=columns[:, -1].copy(),
+                    outputs=row_outputs,
+                    state=state,
+                )
+                self.cache[key] = entry
+                results[key] = self._serialize(entry, columns)
+        return results
+
+    def _extend(self, entry: _CacheEntry, columns: np.ndarray) -> bool:
+        """Bring a cached entry up to date with ``columns``; False if it cannot be"""
+        timestamps = columns[0]
+        if timestamps[0] < entry.timestamps[0]:
+            # The cache does not reach back to the start of the window
+            return False
+        if timestamps[-1] == entry.timestamps[-1] and np.array_equal(
+            columns[:, -1], entry.last_candle
+        ):
+            return True
+
+        # The previously forming candle must still be in the new window
+        forming_ts = entry.timestamps[-1]
+        start = int(np.searchsorted(timestamps, forming_ts))
+        if start >= len(timestamps) or timestamps[start] != forming_ts:
+            return False
+
+        # Drop the stale forming value, then commit every candle that has closed
+        outputs = {name: values[:-1] for name, values in entry.outputs.items()}
+        new_rows = {name: [] for name in outputs}
+        for i in range(start, len(timestamps)):
+            _, _, high, low, close, volume = columns[:, i]
+            if i < len(timestamps) - 1:
+                values = entry.state.update(high, low, close, volume)
+            else:
+                values = entry.state.peek(high, low, close, volume)
+            for name, value in values.items():
+                new_rows[name].append(value)
+
+        entry.outputs = {
+            name: np.concatenate([outputs[name], new_rows[name]])[-self.max_history :]
+            for name in outputs
+        }
+        timestamps = np.concatenate([entry.timestamps[:-1], timestamps[start:]])
+        entry.timestamps = timestamps[-self.max_history :]
+        entry.last_candle = columns[:, -1].copy()
+        return True
+
+    @staticmethod
+    def _serialize(entry: _CacheEntry, columns: np.ndarray) -> Dict[str, list]:
+        timestamps, _, high, low, close, volume = columns
+        n = len(timestamps)
+        result = {"time": timestamps.astype(np.int64).tolist()}
+        for name, values in entry.outputs.items():
+            window = values[-n:]
+            if name == "vwap":
+                # Anchored at the first candle of the response, not of the cache
+                window = vwap(high, low, close, volume)
+            result[name] = np.where(np.isnan(window), None, window).tolist()
+        return result
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A background task with progress that clients can poll"""
+
+    id: str
+    kind: str
+    key: Optional[str] = None
+    owner_id: Optional[int] = None
+    status: str = PENDING
+    done: int = 0
+    total: Optional[int] = None
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def progress(self, done: int, total: Optional[int] = None):
+        self.done = done
+        if total is not None:
+            self.total = total
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the job without cancelling it; returns whether it finished"""
+        if self.task is None:
+            return self.finished
+        try:
+            await asyncio.wait_for(asyncio.shield(self.task), timeout)
+        except asyncio.TimeoutError:
+            pass
+        except Exception:
+            # Failures are recorded on the job itself
+            pass
+        return self.finished
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "done": self.done,
+            "total": self.total,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """Runs coroutines as tracked jobs on the event loop.
+
+    Jobs submitted with a ``key`` are deduplicated: while a job with the
+    same key is unfinished, submitting again returns that job. Only the
+    most recent ``max_history`` jobs are kept.
+    """
+
+    def __init__(self, max_history: int = 200):
+        self.max_history = max_history
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: Dict[str, Job] = {}
+
+    def submit(
+        self,
+        kind: str,
+        run: Callable[[Job], Awaitable[Any]],
+        key: Optional[str] = None,
+        owner_id: Optional[int] = None,
+    ) -> Job:
+        if key is not None:
+            active = self._active.get(key)
+            if active is not None and not active.finished:
+                return active
+
+        job = Job(id=uuid.uuid4().hex, kind=kind, key=key, owner_id=owner_id)
+        self._jobs[job.id] = job
+        if key is not None:
+            self._active[key] = job
+        while len(self._jobs) > self.max_history:
+            oldest = next(iter(self._jobs.values()))
+            if not oldest.finished:
+                break
+            self._jobs.popitem(last=False)
+        job.task = asyncio.create_task(self._run(job, run))
+        return job
+
+    async def _run(self, job: Job, run: Callable[[Job], Awaitable[Any]]):
+        job.status = RUNNING
+        try:
+            job.result = await run(job)
+            job.status = SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = FAILED
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.kind} {job.id} failed: {str(e)}", exc_info=True)
+            job.status = FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            if job.key is not None and self._active.get(job.key) is job:
+                del self._active[job.key]
+        return job.result
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(
+        self, kind: Optional[str] = None, owner_id: Optional[int] = None
+    ) -> List[Job]:
+        return [
+            job
+            for job in reversed(self._jobs.values())
+            if (kind is None or job.kind == kind)
+            and (owner_id is None or job.owner_id == owner_id)
+        ]
+
+    async def shutdown(self):
+        tasks = [
+            job.task for job in self._jobs.values() if job.task and not job.finished
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Create a single instance shared by every service that runs background jobs
+job_manager = JobManager()
@@ -0,0 +1,173 @@
+import copy
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Per-component operations accepted next to RFC 6902 JSON Patch operations
+COMPONENT_OPS = ("add_component", "update_component", "remove_component")
+
+
+def escape_token(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Reference tokens of an RFC 6901 JSON pointer"""
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise ValueError(f"Invalid JSON pointer '{pointer}'")
+    if not pointer:
+        return []
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def is_array_index(token: str) -> bool:
+    """Whether ``token`` is an array index in canonical form (no leading zeros)"""
+    return token.isdigit() and not (len(token) > 1 and token.startswith("0"))
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not is_array_index(token):
+        raise ValueError(f"Invalid array index '{token}'")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise ValueError(f"Array index {index} out of range")
+    return index
+
+
+def _resolve(document: Any, tokens: Sequence[str]) -> Any:
+    for token in tokens:
+        if isinstance(document, list):
+            document = document[_index(document, token)]
+        elif isinstance(document, dict) and token in document:
+            document = document[token]
+        else:
+            raise ValueError(f"Path '/{'/'.join(tokens)}' does not exist")
+    return document
+
+
+def _add(document: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], allow_end=True), value)
+    elif isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    else:
+        raise ValueError(f"Cannot add to a {type(parent).__name__}")
+    return document
+
+
+def _remove(document: Any, tokens: List[str]) -> Tuple[Any, Any]:
+    if not tokens:
+        raise ValueError("Cannot remove the whole document")
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, list):
+        return document, parent.pop(_index(parent, tokens[-1]))
+    if isinstance(parent, dict) and tokens[-1] in parent:
+        return document, parent.pop(tokens[-1])
+    raise ValueError(f"Path '/{'/'.join(tokens)}' does not exist")
+
+
+def apply_patch(document: Any, operations: List[Dict[str, Any]]) -> Any:
+    """Apply RFC 6902 operations to a copy of ``document``; raises ValueError"""
+    document = copy.deepcopy(document)
+    for operation in operations:
+        op = operation.get("op")
+        tokens = parse_pointer(operation.get("path"))
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise ValueError(f"'{op}' operation needs a value")
+        if op == "add":
+            document = _add(document, tokens, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            document, _ = _remove(document, tokens)
+        elif op == "replace":
+            if tokens:
+                document, _ = _remove(document, tokens)
+            document = _add(document, tokens, copy.deepcopy(operation["value"]))
+        elif op in ("move", "copy"):
+            source = parse_pointer(operation.get("from"))
+            if op == "move":
+                if tokens[: len(source)] == source and tokens != source:
+                    raise ValueError("Cannot move a value into itself")
+                document, value = _remove(document, source)
+            else:
+                value = copy.deepcopy(_resolve(document, source))
+            document = _add(document, tokens, value)
+        elif op == "test":
+            if _resolve(document, tokens) != operation["value"]:
+                raise ValueError(f"Test failed at '{operation['path']}'")
+        else:
+            raise ValueError(f"Unsupported patch operation '{op}'")
+    return document
+
+
+def _changes_component_list(operation: Dict[str, Any]) -> bool:
+    for key in ("path", "from"):
+        if key in operation:
+            tokens = parse_pointer(operation[key])
+            if tokens[:1] == ["components"] and len(tokens) <= 2:
+                return True
+    return False
+
+
+def expand_component_ops(
+    operations: List[Dict[str, Any]], component_ids: Sequence[Optional[str]]
+) -> List[Dict[str, Any]]:
+    """Rewrite per-component operations as JSON Patch against ``/components``.
+
+    ``update_component`` merges ``props`` key by key and replaces ``layout``,
+    so a prop change patches only that prop. Components are addressed by
+    id, resolved against ``component_ids`` as earlier operations change it.
+    """
+    ids: Optional[List[Optional[str]]] = list(component_ids)
+    patch = []
+    for operation in operations:
+        op = operation.get("op")
+        if op not in COMPONENT_OPS:
+            if op != "test" and _changes_component_list(operation):
+                # Positions may have shifted; later component ops cannot resolve ids
+                ids = None
+            patch.append(operation)
+            continue
+        if ids is None:
+            raise ValueError(
+                "Component operations cannot follow JSON Patch changes "
+                "to the component list"
+            )
+
+        if op == "add_component":
+            component = operation.get("component")
+            if not isinstance(component, dict) or "type" not in component:
+                raise ValueError("add_component needs a component with a type")
+            patch.append({"op": "add", "path": "/components/-", "value": component})
+            ids.append(component.get("id"))
+            continue
+
+        try:
+            index = ids.index(operation.get("id"))
+        except ValueError:
+            raise ValueError(f"Component '{operation.get('id')}' not found")
+        prefix = f"/components/{index}"
+        if op == "remove_component":
+            patch.append({"op": "remove", "path": prefix})
+            del ids[index]
+            continue
+        props = operation.get("props") or {}
+        if not isinstance(props, dict):
+            raise ValueError("update_component props must be an object")
+        if not props and "layout" not in operation:
+            raise ValueError("update_component needs props or a layout")
+        for key, value in props.items():
+            patch.append(
+                {
+                    "op": "add",
+                    "path": f"{prefix}/props/{escape_token(key)}",
+                    "value": value,
+                }
+            )
+        if "layout" in operation:
+            patch.append(
+                {"op": "add", "path": f"{prefix}/layout", "value": operation["layout"]}
+            )
+    return patch
@@ -0,0 +1,120 @@
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import FrozenSet, Optional
+from zoneinfo import ZoneInfo
+
+EASTERN = ZoneInfo("America/New_York")
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th ``weekday`` (Mon=0) of a month; ``n=-1`` is the last one"""
+    if n > 0:
+        first = date(year, month, 1)
+        offset = (weekday - first.weekday()) % 7
+        return first + timedelta(days=offset + 7 * (n - 1))
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: date) -> date:
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=None)
+def market_holidays(year: int) -> FrozenSet[date]:
+    """Full-day closures shared by the CBOE and NYSE calendars"""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),  # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _observed(date(year, 7, 4)),  # Independence Day
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),  # Christmas
+    }
+    # New Year's Day falling on a Saturday is not observed on the Friday before
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.add(_observed(new_year))
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    return frozenset(holidays)
+
+
+class TradingCalendar:
+    """Regular trading session of an exchange in its local timezone.
+
+    ``settle`` extends the session past the closing bell so the final print
+    still refreshes before data is held overnight.
+    """
+
+    def __init__(
+        self,
+        open_time: time,
+        close_time: time,
+        tz: ZoneInfo = EASTERN,
+        settle: timedelta = timedelta(minutes=15),
+    ):
+        self.open_time = open_time
+        self.close_time = close_time
+        self.tz = tz
+        self.settle = settle
+
+    def _local(self, now: Optional[datetime]) -> datetime:
+        if now is None:
+            return datetime.now(self.tz)
+        if now.tzinfo is None:
+            raise ValueError("Calendar times must be timezone-aware")
+        return now.astimezone(self.tz)
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in market_holidays(day.year)
+
+    def is_open(self, now: Optional[datetime] = None) -> bool:
+        now = self._local(now)
+        if not self.is_trading_day(now.date()):
+            return False
+        session_open = datetime.combine(now.date(), self.open_time, self.tz)
+        session_close = datetime.combine(now.date(), self.close_time, self.tz)
+        return session_open <= now < session_close + self.settle
+
+    def next_open(self, now: Optional[datetime] = None) -> datetime:
+        now = self._local(now)
+        day = now.date()
+        if now.time() >= self.open_time:
+            day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return datetime.combine(day, self.open_time, self.tz)
+
+    def cache_ttl(self, open_ttl: float, now: Optional[datetime] = None) -> float:
+        """Seconds to keep data: ``open_ttl`` in session, otherwise until the next open"""
+        now = self._local(now)
+        if self.is_open(now):
+            return open_ttl
+        return max((self.next_open(now) - now).total_seconds(), open_ttl)
+
+
+# VIX and related CBOE indices are disseminated 9:30-16:15 ET
+CBOE_CALENDAR = TradingCalendar(open_time=time(9, 30), close_time=time(16, 15))
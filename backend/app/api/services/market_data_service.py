@@ -1,38 +1,140 @@
-import ccxt
+import ccxt.async_support as ccxt
 import asyncio
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
-import pandas as pd
+from typing import List, Dict, Any, Optional
+import logging
 import numpy as np
+from app.api.services.fx_service import FXRateService, fx_service as default_fx_service
+from app.api.services.candle_frame import CandleFrame
+from app.api.services.indicator_service import IndicatorEngine
+from app.api.services.symbol_resolver import (
+    SymbolResolver,
+    exchange_assets,
+    symbol_resolver,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class MarketDataService:
-    def __init__(self):
+    def __init__(
+        self,
+        fx_service: Optional[FXRateService] = None,
+        resolver: Optional[SymbolResolver] = None,
+        markets_interval: float = 60 * 60,
+    ):
         self.exchange = ccxt.binance(
             {
                 "enableRateLimit": True,
             }
         )
+        self.fx_service = fx_service or default_fx_service
+        self.indicator_engine = IndicatorEngine()
+        self.resolver = resolver or symbol_resolver
+        self.markets_interval = markets_interval
+        self._published: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.exchange.close()
+
+    async def get_conversion_rate(self, currency: str = "CAD") -> float:
+        """Get the USDT -> currency rate from the cached FX matrix"""
+        if currency.upper() == "USDT":
+            return 1.0
+        await self.fx_service.ensure_loaded()
+        return self.fx_service.get_rate("USDT", currency)
+
+    async def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        """The exchange's markets; each new load republishes the assets
+        priced as ``{symbol}/USDT`` as the resolver's crypto symbols"""
+        markets = await self.exchange.load_markets(reload)
+        if markets is not self._published:
+            self.resolver.set_source(
+                self.exchange.id, exchange_assets(markets, quote="USDT"), crypto=True
+            )
+            self._published = markets
+        return markets
+
+    async def _markets_loop(self):
+        reload = False
+        while True:
+            try:
+                await self.load_markets(reload)
+                reload = True
+            except Exception as e:
+                logger.error(f"Error loading markets: {str(e)}")
+            await asyncio.sleep(self.markets_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._markets_loop())
+
+    async def _listed(self, pairs: List[str]) -> List[str]:
+        """Drop pairs the exchange does not list, so one bad symbol cannot
+        fail a batched request"""
+        try:
+            markets = await self.load_markets()
+        except Exception as e:
+            logger.warning(f"Could not load markets: {str(e)}")
+            return pairs
+        return [pair for pair in pairs if pair in markets]
+
+    async def _fetch_tickers(self, pairs: List[str]) -> Dict[str, Any]:
+        listed = await self._listed(pairs)
+        if not listed:
+            return {}
+        try:
+            return await self.exchange.fetch_tickers(listed)
+        except Exception as e:
+            logger.warning(
+                f"Batched ticker fetch failed, fetching one by one: {str(e)}"
+            )
+
+        results = await asyncio.gather(
+            *(self.exchange.fetch_ticker(pair) for pair in listed),
+            return_exceptions=True,
+        )
+        tickers = {}
+        for pair, result in zip(listed, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching ticker for {pair}: {str(result)}")
+            else:
+                tickers[pair] = result
+        return tickers
 
     async def get_current_prices(
         self, symbols: List[str], currency: str = "CAD"
     ) -> Dict[str, float]:
         """Fetch current prices for given symbols"""
-        prices = {}
-        for symbol in symbols:
-            try:
-                ticker = await self.exchange.fetch_ticker(f"{symbol}/USDT")
-                # Convert to CAD if needed
-                if currency == "CAD":
-                    usd_cad = await self.exchange.fetch_ticker("USDT/CAD")
-                    price = ticker["last"] * usd_cad["last"]
-                else:
-                    price = ticker["last"]
-                prices[symbol] = price
-            except Exception as e:
-                print(f"Error fetching price for {symbol}: {str(e)}")
-                prices[symbol] = None
-        return prices
+        pairs = {symbol: f"{symbol}/USDT" for symbol in symbols}
+        try:
+            # One batched ticker call; the FX rate comes from the cached matrix
+            tickers, rate = await asyncio.gather(
+                self._fetch_tickers(list(pairs.values())),
+                self.get_conversion_rate(currency),
+            )
+        except Exception as e:
+            logger.error(f"Error fetching prices for {symbols}: {str(e)}")
+            return {symbol: None for symbol in symbols}
+
+        last = np.array(
+            [(tickers.get(pair) or {}).get("last") for pair in pairs.values()],
+            dtype=np.float64,
+        )
+        converted = last * rate
+        return {
+            symbol: None if np.isnan(price) else float(price)
+            for symbol, price in zip(pairs, converted)
+        }
 
     async def get_historical_data(
         self,
@@ -43,65 +145,50 @@ class MarketDataService:
     ) -> List[Dict[str, Any]]:
         """Fetch historical OHLCV data"""
         try:
-            ohlcv = await self.exchange.fetch_ohlcv(
-                f"{symbol}/USDT", timeframe, limit=limit
+            ohlcv, rate = await asyncio.gather(
+                self.exchange.fetch_ohlcv(f"{symbol}/USDT", timeframe, limit=limit),
+                self.get_conversion_rate(currency),
             )
 
-            # Convert to CAD if needed
-            if currency == "CAD":
-                usd_cad = await self.exchange.fetch_ticker("USDT/CAD")
-                cad_rate = usd_cad["last"]
-            else:
-                cad_rate = 1.0
-
-            data = []
-            for candle in ohlcv:
-                timestamp, open_price, high, low, close, volume = candle
-                # Format time for Lightweight Charts
-                time = datetime.fromtimestamp(timestamp / 1000).strftime("%Y-%m-%d")
-                data.append(
-                    {
-                        "time": time,
-                        "open": open_price * cad_rate,
-                        "high": high * cad_rate,
-                        "low": low * cad_rate,
-                        "close": close * cad_rate,
-                        "volume": volume,
-                    }
-                )
-            return data
+            # Daily dates in the format Lightweight Charts expects
+            return CandleFrame.from_ohlcv(ohlcv).convert(rate).to_records(time_unit="D")
         except Exception as e:
-            print(f"Error fetching historical data for {symbol}: {str(e)}")
+            logger.error(f"Error fetching historical data for {symbol}: {str(e)}")
             return []
 
     async def get_technical_indicators(
         self, symbol: str, timeframe: str = "1d", limit: int = 100
     ) -> Dict[str, List[float]]:
         """Calculate technical indicators"""
-        try:
-            ohlcv = await self.exchange.fetch_ohlcv(
-                f"{symbol}/USDT", timeframe, limit=limit
-            )
-            df = pd.DataFrame(
-                ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]
-            )
+        results = await self.get_technical_indicators_batch([symbol], timeframe, limit)
+        return results.get(symbol, {})
 
-            # Calculate simple moving averages
-            df["sma_20"] = df["close"].rolling(window=20).mean()
-            df["sma_50"] = df["close"].rolling(window=50).mean()
-
-            # Calculate RSI
-            delta = df["close"].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df["rsi"] = 100 - (100 / (1 + rs))
-
-            return {
-                "sma_20": df["sma_20"].tolist(),
-                "sma_50": df["sma_50"].tolist(),
-                "rsi": df["rsi"].tolist(),
-            }
+    async def get_technical_indicators_batch(
+        self, symbols: List[str], timeframe: str = "1d", limit: int = 100
+    ) -> Dict[str, Dict[str, List[float]]]:
+        """Calculate technical indicators for many symbols in one engine pass"""
+        responses = await asyncio.gather(
+            *[
+                self.exchange.fetch_ohlcv(f"{symbol}/USDT", timeframe, limit=limit)
+                for symbol in symbols
+            ],
+            return_exceptions=True,
+        )
+
+        series = {}
+        results = {}
+        for symbol, ohlcv in zip(symbols, responses):
+            if isinstance(ohlcv, Exception):
+                logger.error(f"Error fetching candles for {symbol}: {str(ohlcv)}")
+                results[symbol] = {}
+                continue
+            series[(symbol, timeframe)] = ohlcv
+
+        try:
+            computed = self.indicator_engine.compute_batch(series)
         except Exception as e:
-            print(f"Error calculating indicators for {symbol}: {str(e)}")
-            return {}
+            logger.error(f"Error calculating indicators for {symbols}: {str(e)}")
+            computed = {}
+        for (symbol, _), indicators in computed.items():
+            results[symbol] = indicators
+        return {symbol: results.get(symbol, {}) for symbol in symbols}
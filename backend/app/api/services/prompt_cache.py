@@ -0,0 +1,185 @@
+import copy
+import re
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+import numpy as np
+
+PRIME = (1 << 31) - 1
+WORD = re.compile(r"[\w$]+")
+# Filler words that never change which components a prompt asks for
+STOPWORDS = frozenset(
+    "a an the please me my i can could would you to for of some us".split()
+)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Casefolded words without filler, so phrasing noise does not matter"""
+    return " ".join(w for w in WORD.findall(prompt.casefold()) if w not in STOPWORDS)
+
+
+def parameter_tokens(prompt: str) -> FrozenSet[str]:
+    """Words carrying a number, like "30", "90d" or "4h", which set parameters"""
+    return frozenset(
+        w for w in WORD.findall(prompt.casefold()) if any(c.isdigit() for c in w)
+    )
+
+
+def shingles(text: str, size: int = 4) -> np.ndarray:
+    """CRC32 hashes of the character ``size``-grams of ``text``"""
+    padded = f" {text} "
+    grams = {padded[i : i + size] for i in range(max(len(padded) - size + 1, 1))}
+    return np.fromiter(
+        (zlib.crc32(g.encode()) & PRIME for g in grams),
+        dtype=np.int64,
+        count=len(grams),
+    )
+
+
+class MinHasher:
+    """MinHash signatures from ``num_perm`` universal hash functions"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 7):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, PRIME, size=num_perm, dtype=np.int64)
+        self.b = rng.integers(0, PRIME, size=num_perm, dtype=np.int64)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        # (num_perm, n) products stay below 2**62, within int64
+        return ((self.a[:, None] * hashes[None, :] + self.b[:, None]) % PRIME).min(
+            axis=1
+        )
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    guard: FrozenSet[str]
+    signature: np.ndarray
+    response: Dict[str, Any]
+    expires_at: float
+
+
+class PromptCache:
+    """Responses keyed on normalized prompts with a near-duplicate fallback.
+
+    Lookups try the exact normalized prompt first, then candidates sharing
+    an LSH band with the prompt's MinHash signature. A similar prompt only
+    counts as a hit when its estimated Jaccard similarity reaches
+    ``threshold``. Either way the ``guard`` (symbols and numeric parameters
+    the prompt mentions) must be identical, so "BTC chart" never answers
+    "ETH chart" and "30 days" never answers "90 days". Entries expire
+    after ``ttl`` and the least recently used are evicted beyond
+    ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 500,
+        ttl: float = 60 * 60,
+        threshold: float = 0.75,
+        num_perm: int = 64,
+        bands: int = 16,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, bytes], Set[str]] = {}
+        self.stats = {
+            "exact_hits": 0,
+            "similar_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        for band_key in self._band_keys(entry.signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def _live(self, key: str, now: float) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            self._remove(key)
+            self.stats["expirations"] += 1
+            return None
+        return entry
+
+    def _hit(self, entry: CacheEntry, kind: str) -> Dict[str, Any]:
+        self._entries.move_to_end(entry.key)
+        self.stats[kind] += 1
+        return copy.deepcopy(entry.response)
+
+    def get(
+        self, prompt: str, guard: FrozenSet[str] = frozenset()
+    ) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        key = normalize_prompt(prompt)
+        entry = self._live(key, now)
+        # Normalizing casefolds, so "COIN" and "coin" share a key but not a guard
+        if entry is not None and entry.guard == guard:
+            return self._hit(entry, "exact_hits")
+
+        signature = self.hasher.signature(shingles(key))
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates |= self._buckets.get(band_key, set())
+
+        best, best_score = None, self.threshold
+        for candidate in candidates:
+            entry = self._live(candidate, now)
+            if entry is None or entry.guard != guard:
+                continue
+            score = float(np.mean(entry.signature == signature))
+            if score >= best_score:
+                best, best_score = entry, score
+        if best is not None:
+            return self._hit(best, "similar_hits")
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(
+        self, prompt: str, response: Dict[str, Any], guard: FrozenSet[str] = frozenset()
+    ):
+        key = normalize_prompt(prompt)
+        if key in self._entries:
+            self._remove(key)
+        signature = self.hasher.signature(shingles(key))
+        self._entries[key] = CacheEntry(
+            key, guard, signature, copy.deepcopy(response), time.time() + self.ttl
+        )
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.stats["exact_hits"] + self.stats["similar_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,184 @@
+import asyncio
+import base64
+import heapq
+import logging
+from datetime import datetime, timezone
+from itertools import dropwhile, groupby, islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from app.api.services.truthsocial_service import (
+    TruthSocialService,
+    identifier_key,
+    truthsocial_service,
+)
+from app.api.services.twitter_service import TwitterService, twitter_service
+
+logger = logging.getLogger(__name__)
+
+# Merge key of a post: (epoch seconds, source, id); larger is newer
+PostKey = Tuple[float, str, str]
+
+
+def encode_cursor(key: PostKey) -> str:
+    ts, source, post_id = key
+    raw = f"{ts!r}:{source}:{post_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PostKey:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, source, post_id = base64.urlsafe_b64decode(padded).decode().split(":", 2)
+        return float(ts), source, post_id
+    except Exception:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+
+def _iso(ts: float) -> Optional[str]:
+    if ts == float("-inf"):
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def normalize_tweet(ts: float, tweet: Dict[str, Any]) -> Dict[str, Any]:
+    username = tweet["author"]["username"]
+    return {
+        "id": str(tweet["id"]),
+        "source": "twitter",
+        "username": username,
+        "name": tweet["author"]["name"],
+        "avatar": tweet["author"].get("profile_image_url") or None,
+        "text": tweet["text"],
+        "created_at": _iso(ts),
+        "url": f"https://x.com/{username}/status/{tweet['id']}",
+        "media": [],
+    }
+
+
+def normalize_truth(ts: float, item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(item.get("id")),
+        "source": "truthsocial",
+        "username": item.get("username"),
+        "name": item.get("name"),
+        "avatar": item.get("avatar") or None,
+        "text": item.get("text", ""),
+        "created_at": _iso(ts),
+        "url": item.get("url") or item.get("profileUrl"),
+        "media": item.get("mediaUrls") or [],
+    }
+
+
+NORMALIZERS = {"twitter": normalize_tweet, "truthsocial": normalize_truth}
+
+
+def keyed(
+    source: str, posts: Iterable[Tuple[float, Dict[str, Any]]]
+) -> Iterator[Tuple[PostKey, Dict[str, Any]]]:
+    """Attach merge keys to a newest-first timeline.
+
+    Timelines are ordered by time only, so posts sharing a timestamp are
+    ordered by id here; those groups are tiny.
+    """
+    for _, group in groupby(posts, key=itemgetter(0)):
+        items = [((ts, source, str(post["id"])), post) for ts, post in group]
+        if len(items) > 1:
+            items.sort(key=itemgetter(0), reverse=True)
+        yield from items
+
+
+def older_than(
+    posts: Iterator[Tuple[PostKey, Dict[str, Any]]], cursor: Optional[PostKey]
+) -> Iterator[Tuple[PostKey, Dict[str, Any]]]:
+    """Skip the posts on or before the cursor; no re-sorting of earlier pages"""
+    if cursor is None:
+        return posts
+    return dropwhile(lambda item: item[0] >= cursor, posts)
+
+
+class SocialTimelineService:
+    """One newest-first timeline over the cached Twitter and Truth Social feeds.
+
+    Each source keeps its own ordered cache; pages are produced by a lazy
+    k-way merge and addressed with an opaque ``ts:source:id`` cursor.
+    """
+
+    def __init__(
+        self,
+        twitter: TwitterService = twitter_service,
+        truthsocial: TruthSocialService = truthsocial_service,
+    ):
+        self.twitter = twitter
+        self.truthsocial = truthsocial
+
+    async def _load_sources(
+        self, twitter_usernames: List[str], truth_identifiers: List[str], sync: bool
+    ) -> List[Iterator[Tuple[PostKey, Dict[str, Any]]]]:
+        store = self.twitter.store
+        pending = {}
+        if twitter_usernames and (
+            sync or any(store.get(u) is None for u in twitter_usernames)
+        ):
+            pending["twitter"] = self.twitter.sync_accounts(twitter_usernames)
+        if truth_identifiers and (
+            sync or any(not self.truthsocial.timeline(i) for i in truth_identifiers)
+        ):
+            pending["truthsocial"] = self.truthsocial.ensure_loaded(truth_identifiers)
+        # A failing source leaves its cache as it was; the others still load
+        results = await asyncio.gather(*pending.values(), return_exceptions=True)
+        for source, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error loading {source} posts: {result}")
+
+        sources = []
+        for username in dict.fromkeys(store.key(u) for u in twitter_usernames):
+            timeline = store.get(username)
+            if timeline is not None:
+                # Snapshot so a concurrent sync cannot mutate the deque mid-merge
+                sources.append(keyed("twitter", list(timeline.tweets)))
+        for identifier in dict.fromkeys(identifier_key(i) for i in truth_identifiers):
+            sources.append(keyed("truthsocial", self.truthsocial.timeline(identifier)))
+        return sources
+
+    async def get_timeline(
+        self,
+        twitter_usernames: Optional[List[str]] = None,
+        truth_identifiers: Optional[List[str]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        A page of the merged timeline
+        Args:
+            twitter_usernames: Twitter accounts to include
+            truth_identifiers: Truth Social usernames or profile URLs to include
+            limit: Page size
+            cursor: ``next_cursor`` of the previous page
+        Returns:
+            ``{"data": [...], "next_cursor": ...}``; ``next_cursor`` is None on the last page
+        """
+        after = decode_cursor(cursor) if cursor else None
+        logger.info(
+            f"Building social timeline - twitter: {twitter_usernames}, "
+            f"truthsocial: {truth_identifiers}, limit: {limit}, cursor: {after}"
+        )
+        # Later pages read the caches as they are; only the first page syncs
+        sources = await self._load_sources(
+            twitter_usernames or [], truth_identifiers or [], sync=after is None
+        )
+
+        merged = heapq.merge(
+            *(older_than(source, after) for source in sources),
+            key=itemgetter(0),
+            reverse=True,
+        )
+        page = list(islice(merged, limit + 1))
+        next_cursor = encode_cursor(page[limit - 1][0]) if len(page) > limit else None
+        return {
+            "data": [NORMALIZERS[key[1]](key[0], post) for key, post in page[:limit]],
+            "next_cursor": next_cursor,
+        }
+
+
+# Create a single instance of the service
+social_service = SocialTimelineService()
@@ -0,0 +1,190 @@
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# ``^VIX``, ``EURUSD=X``, ``$BTC`` and plain alphanumeric words
+TOKEN = re.compile(r"\$?(\^?[A-Za-z0-9]+(?:=[A-Za-z])?)")
+
+# Well-known symbols that also match in lower case ("show me eth")
+COMMON_SYMBOLS = ("BTC", "ETH", "LTC", "MSTR", "SOL", "XRP", "DOGE")
+COMMON_CRYPTO = ("BTC", "ETH", "LTC", "SOL", "XRP", "DOGE")
+
+# Fiat currencies and stablecoins. Exchanges list them as bases too
+# ("EUR/USD", "USDT/USD"), but they are what prices are quoted in.
+QUOTE_ASSETS = frozenset(
+    {"USD", "EUR", "GBP", "CAD", "JPY", "CHF", "AUD", "NZD"}
+    | {"USDT", "USDC", "DAI", "TUSD", "PYUSD", "FDUSD", "USDS", "EURT"}
+)
+
+# Shorter exchange bases ("A", "AI", "ME", "GO") are ordinary words
+MIN_EXCHANGE_SYMBOL_LENGTH = 3
+
+# Multi-word names resolve to their symbol, case-insensitively
+ALIASES = {
+    "bitcoin": "BTC",
+    "ethereum": "ETH",
+    "ether": "ETH",
+    "litecoin": "LTC",
+    "solana": "SOL",
+    "ripple": "XRP",
+    "dogecoin": "DOGE",
+    "microstrategy": "MSTR",
+    "strategy inc": "MSTR",
+    "vix": "^VIX",
+    "s p 500": "^GSPC",
+}
+
+# yfinance tickers the dashboard charts directly
+YFINANCE_SYMBOLS = (
+    "^VIX",
+    "^VIX9D",
+    "^VIX3M",
+    "^VIX6M",
+    "^VVIX",
+    "^GSPC",
+    "^NDX",
+    "^DJI",
+    "SPY",
+    "QQQ",
+    "MSTR",
+    "COIN",
+)
+
+_TERMINAL = ""  # key of the match stored in a trie node
+
+
+def exchange_assets(
+    markets: Dict[str, Dict[str, Any]],
+    exclude: Iterable[str] = (),
+    quote: Optional[str] = None,
+) -> Set[str]:
+    """Base assets of active ccxt ``markets`` worth resolving in text.
+
+    With ``quote``, only bases of markets in that quote currency count.
+    """
+    excluded = QUOTE_ASSETS.union(exclude)
+    return {
+        m["base"]
+        for m in markets.values()
+        if m.get("active", True)
+        and (quote is None or m.get("quote") == quote)
+        and len(m["base"]) >= MIN_EXCHANGE_SYMBOL_LENGTH
+        and m["base"] not in excluded
+    }
+
+
+class SymbolResolver:
+    """Finds known ticker symbols in free text in one pass over its tokens.
+
+    Symbols come from named sources (exchange markets, FRED series, yfinance
+    tickers) and are compiled into a trie keyed by token, so matches always
+    fall on token boundaries ("ETHENA" is not ETH) and multi-word aliases
+    work. Uppercase tickers must appear in upper case; ``COMMON_SYMBOLS``
+    and ``ALIASES`` match in any case. The trie is rebuilt lazily after a
+    source changes. Sources registered as crypto hold symbols an exchange
+    can price, so callers can resolve those alone.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, Set[str]] = {
+            "crypto": set(COMMON_CRYPTO),
+            "yfinance": set(YFINANCE_SYMBOLS),
+        }
+        self._crypto_sources: Set[str] = {"crypto"}
+        self._trie: Optional[dict] = None
+        self._depth = 1
+        self._lock = threading.Lock()
+
+    def set_source(self, name: str, symbols: Iterable[str], crypto: bool = False):
+        """Replace the symbols of one source, e.g. after markets reload"""
+        if crypto:
+            self._crypto_sources.add(name)
+        symbols = {s.strip() for s in symbols if s and s.strip()}
+        if self._sources.get(name) != symbols:
+            self._sources[name] = symbols
+            self._trie = None
+
+    def add_symbols(self, name: str, symbols: Iterable[str]):
+        existing = self._sources.setdefault(name, set())
+        new = {s.strip() for s in symbols if s and s.strip()} - existing
+        if new:
+            existing |= new
+            self._trie = None
+
+    def symbols(self, sources: Optional[Iterable[str]] = None) -> Set[str]:
+        names = self._sources if sources is None else sources
+        return set().union(*(self._sources.get(name, ()) for name in names))
+
+    def crypto_symbols(self) -> Set[str]:
+        return self.symbols(self._crypto_sources)
+
+    @staticmethod
+    def _insert(trie: dict, tokens: List[str], match: Tuple[str, bool]):
+        node = trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        # A case-insensitive entry wins over a case-sensitive one
+        if _TERMINAL not in node or not match[1]:
+            node[_TERMINAL] = match
+
+    def _build(self) -> dict:
+        trie: dict = {}
+        depth = 1
+        common = set(COMMON_SYMBOLS)
+        for symbol in self.symbols():
+            tokens = [t.upper() for t in TOKEN.findall(symbol)]
+            if tokens:
+                self._insert(trie, tokens, (symbol, symbol not in common))
+                depth = max(depth, len(tokens))
+        for alias, symbol in ALIASES.items():
+            tokens = [t.upper() for t in TOKEN.findall(alias)]
+            self._insert(trie, tokens, (symbol, False))
+            depth = max(depth, len(tokens))
+        self._depth = depth
+        return trie
+
+    def _compiled(self) -> dict:
+        trie = self._trie
+        if trie is None:
+            with self._lock:
+                if self._trie is None:
+                    self._trie = self._build()
+                trie = self._trie
+        return trie
+
+    def resolve(self, text: str, crypto: bool = False) -> List[str]:
+        """Symbols mentioned in ``text``, in order of first mention.
+
+        With ``crypto``, only symbols listed by a crypto source are kept;
+        a longer match from another source still wins over a shorter one.
+        """
+        trie = self._compiled()
+        tokens = TOKEN.findall(text)
+        found: Dict[str, None] = {}
+        i = 0
+        while i < len(tokens):
+            node, best, best_end = trie, None, i
+            for j in range(i, min(i + self._depth, len(tokens))):
+                node = node.get(tokens[j].upper())
+                if node is None:
+                    break
+                match = node.get(_TERMINAL)
+                if match is not None:
+                    symbol, case_sensitive = match
+                    if not case_sensitive or all(
+                        t == t.upper() for t in tokens[i : j + 1]
+                    ):
+                        best, best_end = symbol, j
+            if best is not None:
+                found.setdefault(best)
+                i = best_end + 1
+            else:
+                i += 1
+        if crypto:
+            allowed = self.crypto_symbols()
+            return [symbol for symbol in found if symbol in allowed]
+        return list(found)
+
+
+# Create a single instance shared by the services that feed and query it
+symbol_resolver = SymbolResolver()
@@ -0,0 +1,257 @@
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+import aiohttp
+from app.core.config import settings
+from app.api.services.jobs import Job, JobManager, job_manager
+
+logger = logging.getLogger(__name__)
+
+APIFY_ACTOR_ID = "louisdeconinck~truth-social-scraper"
+TERMINAL_RUN_STATUSES = {"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"}
+
+# (epoch seconds, Apify dataset item)
+TimedPost = Tuple[float, Dict[str, Any]]
+
+
+def identifier_key(identifier: str) -> str:
+    """Cache key for a username or profile URL (``https://truthsocial.com/@name``)"""
+    identifier = identifier.strip().rstrip("/")
+    if "/" in identifier:
+        identifier = identifier.rsplit("/", 1)[-1]
+    return identifier.lstrip("@").casefold()
+
+
+def post_timestamp(created_at: Optional[str]) -> float:
+    try:
+        return datetime.fromisoformat(created_at.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return float("-inf")
+
+
+class PostTimeline:
+    """Cached posts of one Truth Social account, deduplicated by id"""
+
+    def __init__(self, max_posts: int):
+        self.max_posts = max_posts
+        self.by_id: Dict[str, TimedPost] = {}
+        self.posts: List[TimedPost] = []  # newest first
+        self.fetched_at = 0.0
+
+    def add(self, items: List[Dict[str, Any]]) -> int:
+        added = 0
+        for item in items:
+            post_id = str(item.get("id"))
+            if post_id not in self.by_id:
+                added += 1
+            self.by_id[post_id] = (post_timestamp(item.get("createdAt")), item)
+        self.posts = sorted(self.by_id.values(), key=itemgetter(0), reverse=True)[
+            : self.max_posts
+        ]
+        self.by_id = {str(item.get("id")): (ts, item) for ts, item in self.posts}
+        return added
+
+
+class TruthSocialService:
+    """Truth Social posts scraped by an Apify actor in background jobs.
+
+    Runs are started asynchronously and polled; their dataset items land in
+    a per-account post cache that requests are served from. Accounts older
+    than ``refresh_interval`` are re-scraped in the background; after a
+    failed scrape an account is not retried for ``retry_backoff`` seconds,
+    since every run is billed.
+    """
+
+    def __init__(
+        self,
+        jobs: JobManager = job_manager,
+        refresh_interval: float = 5 * 60,
+        poll_interval: float = 5.0,
+        run_timeout: float = 5 * 60,
+        cold_wait: float = 30.0,
+        max_posts: int = 100,
+        retry_backoff: float = 5 * 60,
+    ):
+        self.api_token = settings.APIFY_API_TOKEN
+        self.base_url = "https://api.apify.com"
+        self.actor_id = APIFY_ACTOR_ID
+        self.jobs = jobs
+        self.refresh_interval = refresh_interval
+        self.poll_interval = poll_interval
+        self.run_timeout = run_timeout
+        self.cold_wait = cold_wait
+        self.max_posts = max_posts
+        self.retry_backoff = retry_backoff
+        self._timelines: Dict[str, PostTimeline] = {}
+        # Account key -> (time, error) of its last failed scrape
+        self._failures: Dict[str, Tuple[float, str]] = {}
+        # Account key -> the job scraping it
+        self._in_flight: Dict[str, Job] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session, created lazily inside the running loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=60),
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        params = {"token": self.api_token, **kwargs.pop("params", {})}
+        async with self._get_session().request(
+            method, f"{self.base_url}/v2/{path}", params=params, **kwargs
+        ) as response:
+            if response.status >= 400:
+                logger.error(f"Apify API error: {await response.text()}")
+                response.raise_for_status()
+            return await response.json()
+
+    async def _start_run(self, identifiers: List[str]) -> Dict[str, Any]:
+        data = await self._request(
+            "POST", f"acts/{self.actor_id}/runs", json={"identifiers": identifiers}
+        )
+        return data["data"]
+
+    async def _wait_for_run(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        """Poll a run until it reaches a terminal status"""
+        deadline = time.time() + self.run_timeout
+        while run.get("status") not in TERMINAL_RUN_STATUSES:
+            if time.time() > deadline:
+                raise TimeoutError(f"Apify run {run['id']} did not finish in time")
+            await asyncio.sleep(self.poll_interval)
+            data = await self._request("GET", f"actor-runs/{run['id']}")
+            run = data["data"]
+        if run["status"] != "SUCCEEDED":
+            raise RuntimeError(f"Apify run {run['id']} ended with {run['status']}")
+        return run
+
+    async def _scrape(self, job: Job, identifiers: List[str]) -> Dict[str, int]:
+        logger.info(f"Starting Truth Social scrape for {identifiers}")
+        keys = [identifier_key(i) for i in identifiers]
+        try:
+            run = await self._wait_for_run(await self._start_run(identifiers))
+            items = await self._request(
+                "GET",
+                f"datasets/{run['defaultDatasetId']}/items",
+                params={"clean": "true", "format": "json"},
+            )
+        except Exception as e:
+            failure = (time.time(), str(e))
+            for key in keys:
+                self._failures[key] = failure
+            raise
+
+        grouped: Dict[str, List[Dict[str, Any]]] = {key: [] for key in keys}
+        for item in items:
+            key = identifier_key(item.get("username") or "")
+            if key not in grouped:
+                # Reposts carry the original author; a single-account run
+                # still belongs to the requested account
+                if len(keys) != 1:
+                    continue
+                key = keys[0]
+            grouped[key].append(item)
+
+        now = time.time()
+        added = {}
+        for key, account_items in grouped.items():
+            timeline = self._timelines.setdefault(key, PostTimeline(self.max_posts))
+            added[key] = timeline.add(account_items)
+            timeline.fetched_at = now
+            self._failures.pop(key, None)
+        job.progress(len(items), len(items))
+        logger.info(f"Cached Truth Social posts: {added}")
+        return added
+
+    def _running(self, key: str) -> Optional[Job]:
+        job = self._in_flight.get(key)
+        return job if job is not None and not job.finished else None
+
+    def needs_refresh(self, identifier: str, now: Optional[float] = None) -> bool:
+        key = identifier_key(identifier)
+        if self._running(key) is not None:
+            return False
+        timeline = self._timelines.get(key)
+        now = time.time() if now is None else now
+        failure = self._failures.get(key)
+        if failure is not None and now - failure[0] < self.retry_backoff:
+            return False
+        return timeline is None or now - timeline.fetched_at >= self.refresh_interval
+
+    def refresh(self, identifiers: List[str]) -> Job:
+        """Start a background scrape of ``identifiers``.
+
+        Accounts another job is already scraping are left to it, so each
+        account is in at most one billed run at a time. Returns the new
+        job, or a running one if every account is already covered.
+        """
+        by_key = {identifier_key(i): i for i in identifiers}
+        pending = sorted(k for k in by_key if self._running(k) is None)
+        if not pending:
+            return self._running(min(by_key))
+        identifiers = [by_key[k] for k in pending]
+        job = self.jobs.submit(
+            "truthsocial",
+            lambda job: self._scrape(job, identifiers),
+            key="truthsocial:" + ",".join(pending),
+        )
+        for key in pending:
+            self._in_flight[key] = job
+        return job
+
+    def timeline(self, identifier: str) -> List[TimedPost]:
+        timeline = self._timelines.get(identifier_key(identifier))
+        return timeline.posts if timeline else []
+
+    async def ensure_loaded(self, identifiers: List[str]):
+        """Refresh stale accounts, waiting only if none has been scraped yet"""
+        keys = [identifier_key(i) for i in identifiers]
+        cold = all(key not in self._timelines for key in keys)
+        stale = [i for i in identifiers if self.needs_refresh(i)]
+        if stale:
+            self.refresh(stale)
+        if not cold:
+            return
+
+        jobs = {job.id: job for job in map(self._running, keys) if job is not None}
+        await asyncio.gather(*(job.wait(self.cold_wait) for job in jobs.values()))
+        if any(key in self._timelines for key in keys) or not all(
+            job.finished for job in jobs.values()
+        ):
+            return
+        # Every scrape failed, now or recently enough to be backing off
+        errors = [job.error for job in jobs.values() if job.error]
+        errors += [self._failures[key][1] for key in keys if key in self._failures]
+        if errors:
+            raise RuntimeError(errors[0])
+
+    async def get_posts(
+        self, identifiers: List[str], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Cached posts for the identifiers, newest first.
+
+        Stale accounts are refreshed in the background. Only when none of
+        the accounts has been scraped yet does the call wait, up to
+        ``cold_wait`` seconds, for the scrape to finish.
+        """
+        await self.ensure_loaded(identifiers)
+        keys = dict.fromkeys(identifier_key(i) for i in identifiers)
+        merged = heapq.merge(
+            *(self.timeline(key) for key in keys), key=itemgetter(0), reverse=True
+        )
+        return [item for _, item in islice(merged, limit)]
+
+
+# Create a single instance of the service
+truthsocial_service = TruthSocialService()
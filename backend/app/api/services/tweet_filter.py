@@ -0,0 +1,119 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class TermMatcher:
+    """Terms matched as a set of whole words plus a trie-shaped regex"""
+
+    words: FrozenSet[str]
+    pattern: Optional[Pattern]
+
+    def search(self, text: str, words: Sequence[str]) -> bool:
+        if not self.words.isdisjoint(words):
+            return True
+        return self.pattern is not None and self.pattern.search(text) is not None
+
+
+@dataclass(frozen=True)
+class KeywordFilter:
+    """A keyword list compiled into include and exclude matchers.
+
+    Text matches when it contains any include term (or there are none) and
+    no exclude term. Matching is on casefolded text.
+    """
+
+    include: Optional[TermMatcher]
+    exclude: Optional[TermMatcher]
+
+    def matches(self, text: str) -> bool:
+        text = text.casefold()
+        words: List[str] = []
+        if (self.include and self.include.words) or (
+            self.exclude and self.exclude.words
+        ):
+            words = WORD.findall(text)
+        if self.exclude is not None and self.exclude.search(text, words):
+            return False
+        return self.include is None or self.include.search(text, words)
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    # A term ends here; the greedy group still prefers the longer terms
+    return f"(?:{pattern})?" if "" in node else pattern
+
+
+def _alternation(terms: Iterable[str], whole_words: bool) -> Optional[Pattern]:
+    """One regex for ``terms`` with shared prefixes factored out.
+
+    A flat ``a|b|c`` alternation tries every term at every position of the
+    text; as a trie, each position follows one branch per next character.
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    if not trie:
+        return None
+    pattern = _trie_pattern(trie)
+    if whole_words:
+        # Lookarounds rather than \b so terms like "$btc" still anchor
+        pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+    return re.compile(pattern)
+
+
+def _matcher(terms: List[str], whole_words: bool) -> Optional[TermMatcher]:
+    if not terms:
+        return None
+    words: FrozenSet[str] = frozenset()
+    if whole_words:
+        # Single-word terms are looked up in the text's word set
+        words = frozenset(term for term in terms if WORD.fullmatch(term))
+        terms = [term for term in terms if term not in words]
+    return TermMatcher(words, _alternation(terms, whole_words))
+
+
+@lru_cache(maxsize=1024)
+def compile_filter(
+    keywords: Tuple[str, ...], whole_words: bool = False
+) -> KeywordFilter:
+    """Compile keywords once; terms prefixed with ``-`` are exclusions"""
+    include, exclude = [], []
+    for keyword in keywords:
+        keyword = keyword.strip().casefold()
+        if keyword.startswith("-"):
+            keyword = keyword[1:].strip()
+            if keyword:
+                exclude.append(keyword)
+        elif keyword:
+            include.append(keyword)
+    return KeywordFilter(_matcher(include, whole_words), _matcher(exclude, whole_words))
+
+
+def parse_filters(values: Optional[List[str]]) -> Dict[str, List[str]]:
+    """Parse ``username:kw1,kw2,-excluded`` query values into a filter map"""
+    filters: Dict[str, List[str]] = {}
+    for value in values or []:
+        username, sep, keywords = value.partition(":")
+        if not sep or not username.strip():
+            raise ValueError(
+                f"Invalid filter '{value}', expected username:keyword1,keyword2"
+            )
+        filters.setdefault(username.strip(), []).extend(
+            keyword.strip() for keyword in keywords.split(",") if keyword.strip()
+        )
+    return filters
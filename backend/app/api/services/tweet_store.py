@@ -0,0 +1,98 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import takewhile
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+# (epoch seconds, transformed tweet)
+TimedTweet = Tuple[float, dict]
+
+
+def _tweet_number(tweet_id: str) -> int:
+    try:
+        return int(tweet_id)
+    except (TypeError, ValueError):
+        return -1
+
+
+@dataclass
+class AccountTimeline:
+    """Recent tweets of one account, newest first.
+
+    ``tweets`` is bounded: adding to the front of a full deque drops the
+    oldest tweet from the back. ``newest_id`` is the cursor for the next
+    incremental fetch.
+    """
+
+    username: str
+    max_tweets: int
+    tweets: Deque[TimedTweet] = field(init=False)
+    newest_id: Optional[str] = None
+    newest_at: float = float("-inf")
+    fetched_at: float = 0.0
+
+    def __post_init__(self):
+        self.tweets = deque(maxlen=self.max_tweets)
+
+    def add(self, fetched: List[TimedTweet]) -> int:
+        """Prepend tweets newer than the cursor; returns how many were added"""
+        cursor = _tweet_number(self.newest_id) if self.newest_id else -1
+        newer = sorted(
+            (
+                (created_at, tweet)
+                for created_at, tweet in fetched
+                if _tweet_number(tweet["id"]) > cursor
+            ),
+            key=lambda item: (item[0], _tweet_number(item[1]["id"])),
+        )
+        for created_at, tweet in newer:
+            self.tweets.appendleft((created_at, tweet))
+        if newer:
+            newest = max(newer, key=lambda item: _tweet_number(item[1]["id"]))
+            self.newest_id = newest[1]["id"]
+            self.newest_at = max(self.newest_at, newer[-1][0])
+        return len(newer)
+
+    def since(self, cutoff: Optional[float] = None) -> Iterator[TimedTweet]:
+        """Tweets at or after ``cutoff`` (epoch seconds), newest first"""
+        if cutoff is None:
+            return iter(self.tweets)
+        return takewhile(lambda item: item[0] >= cutoff, self.tweets)
+
+
+class TweetStore:
+    """Process-wide per-account timelines shared by every feed.
+
+    Accounts are keyed case-insensitively, so feeds with overlapping
+    account lists read the same timelines. An account is re-fetched at most
+    once per ``min_refresh`` seconds.
+    """
+
+    def __init__(self, max_tweets: int = 200, min_refresh: float = 30.0):
+        self.max_tweets = max_tweets
+        self.min_refresh = min_refresh
+        self._timelines: Dict[str, AccountTimeline] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def key(username: str) -> str:
+        return username.strip().lstrip("@").casefold()
+
+    def get(self, username: str) -> Optional[AccountTimeline]:
+        return self._timelines.get(self.key(username))
+
+    def timeline(self, username: str) -> AccountTimeline:
+        key = self.key(username)
+        timeline = self._timelines.get(key)
+        if timeline is None:
+            timeline = self._timelines[key] = AccountTimeline(key, self.max_tweets)
+        return timeline
+
+    def lock(self, username: str) -> asyncio.Lock:
+        return self._locks.setdefault(self.key(username), asyncio.Lock())
+
+    def needs_refresh(self, username: str, now: Optional[float] = None) -> bool:
+        timeline = self.get(username)
+        now = time.time() if now is None else now
+        return timeline is None or now - timeline.fetched_at >= self.min_refresh
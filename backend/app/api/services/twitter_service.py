@@ -1,19 +1,42 @@
 import os
-from typing import List, Optional, Dict
-import requests
-from datetime import datetime, timedelta
+import asyncio
+import time
+import heapq
+from itertools import islice
+from operator import itemgetter
+from typing import List, Optional, Dict, Tuple
+import aiohttp
+from datetime import datetime
 import logging
 from app.core.config import settings
+from app.api.services.tweet_filter import KeywordFilter, compile_filter
+from app.api.services.tweet_store import AccountTimeline, TweetStore
 
 logger = logging.getLogger(__name__)
 
 
 class TwitterService:
-    def __init__(self):
+    def __init__(self, store: Optional[TweetStore] = None, max_pages: int = 5):
         self.api_key = settings.TWITTER_API_KEY
         self.base_url = "https://api.twitterapi.io/twitter/tweet/advanced_search"
         logger.info(f"Initialized TwitterService with base URL: {self.base_url}")
         logger.debug(f"API Key loaded: {'Yes' if self.api_key else 'No'}")
+        self.store = store or TweetStore()
+        self.max_pages = max_pages
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session, created lazily inside the running loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
 
     def parse_twitter_date(self, date_str: str) -> datetime:
         """Parse Twitter's date format to datetime object"""
@@ -24,12 +47,114 @@ class TwitterService:
             logger.warning(f"Error parsing date {date_str}: {e}")
             return datetime.min
 
-    def get_user_tweets(
+    def tweet_timestamp(self, date_str: str) -> float:
+        """Epoch seconds of a Twitter date, -inf if it cannot be parsed"""
+        parsed = self.parse_twitter_date(date_str)
+        return parsed.timestamp() if parsed.tzinfo else float("-inf")
+
+    def transform_tweet(self, tweet: dict) -> dict:
+        return {
+            "id": tweet["id"],
+            "text": tweet["text"],
+            "created_at": tweet["createdAt"],
+            "author": {
+                "username": tweet["author"]["userName"],
+                "name": tweet["author"]["name"],
+                "profile_image_url": tweet["author"]["profilePicture"],
+            },
+            "public_metrics": {
+                "retweet_count": tweet["retweetCount"],
+                "reply_count": tweet["replyCount"],
+                "like_count": tweet["likeCount"],
+                "quote_count": tweet["quoteCount"],
+            },
+        }
+
+    async def _fetch_user_tweets(
+        self, username: str, since_id: Optional[str] = None
+    ) -> List[Tuple[float, dict]]:
+        """One user's tweets newer than ``since_id`` as ``(timestamp, tweet)`` pairs.
+
+        Without a cursor only the latest page is requested; with one, pages
+        are followed (up to ``max_pages``) until every newer tweet is in.
+        """
+        query = f"from:{username}"
+        if since_id:
+            query += f" since_id:{since_id}"
+        headers = {"X-API-Key": self.api_key}
+
+        tweets = []
+        cursor = None
+        for _ in range(self.max_pages if since_id else 1):
+            params = {"query": query, "queryType": "Latest"}
+            if cursor:
+                params["cursor"] = cursor
+
+            logger.info(f"Making request to Twitter API for username: {username}")
+            logger.debug(f"Request params: {params}")
+            async with self._get_session().get(
+                self.base_url, headers=headers, params=params
+            ) as response:
+                logger.info(f"Twitter API response status: {response.status}")
+                if response.status != 200:
+                    logger.error(f"Twitter API error: {await response.text()}")
+                    response.raise_for_status()
+                response_data = await response.json()
+
+            # Check if tweets exist in response
+            if "tweets" not in response_data:
+                logger.warning(
+                    f"No 'tweets' field in response for username: {username}"
+                )
+                break
+            tweets.extend(response_data["tweets"])
+            cursor = response_data.get("next_cursor")
+            if not response_data.get("has_next_page") or not cursor:
+                break
+
+        logger.info(f"Retrieved {len(tweets)} tweets for username: {username}")
+        return [
+            (self.tweet_timestamp(tweet["createdAt"]), self.transform_tweet(tweet))
+            for tweet in tweets
+        ]
+
+    async def sync_account(self, username: str) -> AccountTimeline:
+        """Bring one account's cached timeline up to date"""
+        if not self.store.needs_refresh(username):
+            return self.store.get(username)
+
+        async with self.store.lock(username):
+            if not self.store.needs_refresh(username):
+                return self.store.get(username)
+
+            timeline = self.store.timeline(username)
+            fetched = await self._fetch_user_tweets(username, timeline.newest_id)
+            added = timeline.add(fetched)
+            timeline.fetched_at = time.time()
+            logger.info(f"Cached {added} new tweets for username: {username}")
+            return timeline
+
+    async def sync_accounts(self, usernames: List[str]) -> Dict[str, AccountTimeline]:
+        """Sync several accounts concurrently, keyed by their store key"""
+        accounts = list(dict.fromkeys(self.store.key(u) for u in usernames))
+        timelines = await asyncio.gather(
+            *(self.sync_account(username) for username in accounts)
+        )
+        return dict(zip(accounts, timelines))
+
+    @staticmethod
+    def _filtered(tweets, keyword_filter: KeywordFilter):
+        for item in tweets:
+            if keyword_filter.matches(item[1]["text"]):
+                yield item
+
+    async def get_user_tweets(
         self,
         usernames: List[str],
         limit: int = 10,
         hours: Optional[int] = None,
         filters: Optional[Dict[str, List[str]]] = None,
+        whole_words: bool = False,
     ) -> List[dict]:
         """
         Get tweets from multiple users with optional time filtering and content filtering
@@ -37,102 +162,34 @@ class TwitterService:
             usernames: List of Twitter usernames to fetch tweets from
             limit: Maximum number of tweets to return
             hours: Optional time filter in hours
-            filters: Optional dictionary mapping usernames to lists of keywords to filter by
+            filters: Optional dictionary mapping usernames to lists of keywords to filter by;
+                keywords prefixed with "-" exclude matching tweets
+            whole_words: Match keywords only as whole words
         """
         try:
             logger.info(
                 f"Fetching tweets for usernames: {usernames}, limit: {limit}, hours: {hours}, filters: {filters}"
             )
-            headers = {"X-API-Key": self.api_key}
-            logger.debug(f"Request headers: {headers}")
-            all_tweets = []
-
-            for username in usernames:
-                # Build query parameters - match curl command format exactly
-                query = f"from:{username}"
-
-                # Add time filter if specified
-                if hours:
-                    start_time = datetime.utcnow() - timedelta(hours=hours)
-                    query += f" since:{start_time.strftime('%Y-%m-%d_%H:%M:%S_UTC')}"
-
-                params = {"query": query}
-
-                logger.info(f"Making request to Twitter API for username: {username}")
-                logger.debug(f"Request URL: {self.base_url}")
-                logger.debug(f"Request params: {params}")
-                logger.debug(f"Request headers: {headers}")
-
-                # Make API request
-                response = requests.get(
-                    self.base_url,
-                    headers=headers,
-                    params=params,
-                    timeout=30,
-                )
-
-                logger.info(f"Twitter API response status: {response.status_code}")
-                logger.debug(f"Response headers: {response.headers}")
-                logger.debug(f"Full API response: {response.text}")
-
-                if response.status_code != 200:
-                    logger.error(f"Twitter API error: {response.text}")
-                    response.raise_for_status()
-
-                # Add tweets to collection
-                response_data = response.json()
-                logger.debug(f"Response data structure: {response_data}")
-
-                # Check if tweets exist in response
-                if "tweets" not in response_data:
-                    logger.warning(
-                        f"No 'tweets' field in response for username: {username}"
-                    )
-                    continue
-
-                tweets = response_data["tweets"]
-                logger.info(f"Retrieved {len(tweets)} tweets for username: {username}")
-
-                # Transform tweets to match expected format
-                transformed_tweets = []
-                for tweet in tweets:
-                    # Apply filters if they exist for this username
-                    if filters and username in filters:
-                        keywords = filters[username]
-                        tweet_text = tweet["text"].lower()
-                        if not any(
-                            keyword.lower() in tweet_text for keyword in keywords
-                        ):
-                            continue
-
-                    transformed_tweet = {
-                        "id": tweet["id"],
-                        "text": tweet["text"],
-                        "created_at": tweet["createdAt"],
-                        "author": {
-                            "username": tweet["author"]["userName"],
-                            "name": tweet["author"]["name"],
-                            "profile_image_url": tweet["author"]["profilePicture"],
-                        },
-                        "public_metrics": {
-                            "retweet_count": tweet["retweetCount"],
-                            "reply_count": tweet["replyCount"],
-                            "like_count": tweet["likeCount"],
-                            "quote_count": tweet["quoteCount"],
-                        },
-                    }
-                    transformed_tweets.append(transformed_tweet)
-
-                all_tweets.extend(transformed_tweets)
-
-            # Sort all tweets by date
-            all_tweets.sort(
-                key=lambda x: self.parse_twitter_date(x["created_at"]),
-                reverse=True,  # Most recent first
-            )
-
-            # Limit after sorting all tweets
-            limited_tweets = all_tweets[:limit]
+            filters = {
+                self.store.key(username): compile_filter(tuple(keywords), whole_words)
+                for username, keywords in (filters or {}).items()
+                if keywords
+            }
+            timelines = await self.sync_accounts(usernames)
+
+            cutoff = time.time() - hours * 3600 if hours else None
+            sources = []
+            for username, timeline in timelines.items():
+                tweets = timeline.since(cutoff)
+                keyword_filter = filters.get(username)
+                if keyword_filter:
+                    tweets = self._filtered(tweets, keyword_filter)
+                sources.append(tweets)
+
+            # Each timeline is already newest first, so a k-way merge yields
+            # the overall top ``limit`` without sorting everything
+            merged = heapq.merge(*sources, key=itemgetter(0), reverse=True)
+            limited_tweets = [tweet for _, tweet in islice(merged, limit)]
             logger.info(
                 f"Returning {len(limited_tweets)} tweets after sorting and limiting"
             )
@@ -141,3 +198,7 @@ class TwitterService:
         except Exception as e:
             logger.error(f"Error in get_user_tweets: {str(e)}", exc_info=True)
             raise
+
+
+# Create a single instance of the service
+twitter_service = TwitterService()
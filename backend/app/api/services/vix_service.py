@@ -1,8 +1,12 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+import asyncio
+import time
+from typing import Dict, Any, Tuple
 import logging
+from app.api.services.array_ops import forward_fill
+from app.api.services.market_calendar import CBOE_CALENDAR, TradingCalendar
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +18,42 @@ def clean_float(value: float) -> float:
     return round(float(value), 2)
 
 
+def clean_array(values) -> np.ndarray:
+    """Vectorized ``clean_float`` for a whole column."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isfinite(values), np.round(values, 2), 0.0)
+
+
+# CBOE volatility indices on the S&P 500, keyed by their horizon in days
+TERM_STRUCTURE = {"^VIX9D": 9, "^VIX": 30, "^VIX3M": 93, "^VIX6M": 182}
+VOL_OF_VOL = "^VVIX"
+RATIOS = {
+    "vix9d_vix": ("^VIX9D", "^VIX"),
+    "vix_vix3m": ("^VIX", "^VIX3M"),
+    "vix3m_vix6m": ("^VIX3M", "^VIX6M"),
+}
+
+
+def percentile_rank(history: np.ndarray) -> np.ndarray:
+    """Percent of observations in each column at or below the latest one."""
+    latest = history[-1]
+    valid = ~np.isnan(history)
+    with np.errstate(invalid="ignore"):
+        below = ((history <= latest) & valid).sum(axis=0)
+    return below / np.maximum(valid.sum(axis=0), 1) * 100
+
+
 class VIXService:
-    def __init__(self):
+    def __init__(
+        self,
+        calendar: TradingCalendar = CBOE_CALENDAR,
+        open_ttl: float = 60.0,
+    ):
         self.symbol = "^VIX"
+        self.calendar = calendar
+        self.open_ttl = open_ttl
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
 
     async def __aenter__(self):
         return self
@@ -24,51 +61,161 @@ class VIXService:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         pass
 
-    async def get_vix_data(self) -> Dict[str, Any]:
-        """Get VIX data including current value and historical data."""
-        try:
-            logger.info("Fetching VIX data")
-            vix = yf.Ticker(self.symbol)
-
-            # Get current data
-            current_data = vix.history(period="1d")
-            if current_data.empty:
-                raise ValueError("No VIX data available")
-
-            # Get historical data for the last 30 days
-            historical_data = vix.history(period="30d")
-
-            # Calculate daily changes
-            historical_data["Change"] = historical_data["Close"].pct_change() * 100
-
-            # Format the response
-            current_price = clean_float(current_data["Close"].iloc[-1])
-            previous_close = clean_float(current_data["Open"].iloc[0])
-            daily_change = clean_float(
-                ((current_price - previous_close) / previous_close) * 100
-                if previous_close != 0
-                else 0
+    async def _cached(self, key: str, loader):
+        """Return a cached value, loading it off the event loop once per TTL.
+
+        The TTL follows the CBOE calendar: ``open_ttl`` during the session and
+        until the next open while the market is closed.
+        """
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.time():
+            return cached[1]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > time.time():
+                return cached[1]
+            value = await asyncio.to_thread(loader)
+            ttl = self.calendar.cache_ttl(self.open_ttl)
+            self._cache[key] = (time.time() + ttl, value)
+            logger.info(f"Cached {key} for {ttl:.0f}s")
+            return value
+
+    def _load_vix_data(self) -> Dict[str, Any]:
+        """Download 30 days of VIX history and derive both views from it."""
+        historical_data = yf.Ticker(self.symbol).history(period="30d")
+        if historical_data.empty:
+            raise ValueError("No VIX data available")
+
+        close = historical_data["Close"].to_numpy(dtype=np.float64)
+        change = np.full(close.shape, np.nan)
+        change[1:] = (close[1:] / close[:-1] - 1) * 100
+
+        # The last session's bar is what a 1d history call would return
+        last = historical_data.iloc[-1]
+        current_price = clean_float(last["Close"])
+        previous_close = clean_float(last["Open"])
+        daily_change = clean_float(
+            ((current_price - previous_close) / previous_close) * 100
+            if previous_close != 0
+            else 0
+        )
+
+        dates = historical_data.index.strftime("%Y-%m-%d").tolist()
+        closes = clean_array(close).tolist()
+        changes = clean_array(change).tolist()
+
+        return {
+            "current": {
+                "price": current_price,
+                "change": daily_change,
+                "high": clean_float(last["High"]),
+                "low": clean_float(last["Low"]),
+                "volume": int(clean_float(last["Volume"])),
+            },
+            "historical": [
+                {"Date": d, "Close": c, "Change": ch}
+                for d, c, ch in zip(dates, closes, changes)
+            ],
+        }
+
+    def _load_volatility_complex(self) -> Dict[str, Any]:
+        """One multi-ticker download for the whole volatility panel."""
+        tickers = list(TERM_STRUCTURE) + [VOL_OF_VOL]
+        data = yf.download(
+            tickers, period="1y", interval="1d", progress=False, auto_adjust=False
+        )
+        if data.empty:
+            raise ValueError("No volatility index data available")
+
+        closes = data["Close"].reindex(columns=tickers).dropna(how="all")
+        values = forward_fill(closes.to_numpy(dtype=np.float64))
+        column = {ticker: i for i, ticker in enumerate(tickers)}
+
+        # Least-squares slope of level vs. horizon for every day at once
+        curve = values[:, [column[t] for t in TERM_STRUCTURE]]
+        tenors = np.array(list(TERM_STRUCTURE.values()), dtype=np.float64)
+        centered = tenors - tenors.mean()
+        slope = (curve - curve.mean(axis=1, keepdims=True)) @ centered / (
+            centered @ centered
+        )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = np.column_stack(
+                [
+                    values[:, column[near]] / values[:, column[far]]
+                    for near, far in RATIOS.values()
+                ]
             )
+            change = (values[-1] / values[-2] - 1) * 100 if len(values) > 1 else None
+
+        derived = np.column_stack([slope, ratios])
+        index_ranks = percentile_rank(values)
+        derived_ranks = percentile_rank(derived)
+
+        latest = values[-1]
+        indices = {}
+        for ticker, i in column.items():
+            indices[ticker] = {
+                "tenor_days": TERM_STRUCTURE.get(ticker),
+                "value": clean_float(latest[i]),
+                "change": clean_float(change[i]) if change is not None else 0.0,
+                "percentile": clean_float(index_ranks[i]),
+            }
 
-            # Get historical data points for chart
-            chart_data = historical_data[["Close", "Change"]].reset_index()
-            chart_data["Date"] = chart_data["Date"].dt.strftime("%Y-%m-%d")
-
-            # Clean historical data
-            chart_data["Close"] = chart_data["Close"].apply(clean_float)
-            chart_data["Change"] = chart_data["Change"].apply(clean_float)
-
-            return {
-                "current": {
-                    "price": current_price,
-                    "change": daily_change,
-                    "high": clean_float(current_data["High"].iloc[-1]),
-                    "low": clean_float(current_data["Low"].iloc[-1]),
-                    "volume": int(clean_float(current_data["Volume"].iloc[-1])),
-                },
-                "historical": chart_data.to_dict("records"),
+        ratio_values = {}
+        for j, name in enumerate(RATIOS):
+            ratio_values[name] = {
+                "value": round(float(ratios[-1, j]), 4)
+                if np.isfinite(ratios[-1, j])
+                else None,
+                "percentile": clean_float(derived_ranks[j + 1]),
             }
+        front_ratio = ratios[-1, list(RATIOS).index("vix_vix3m")]
+
+        historical = {"dates": closes.index.strftime("%Y-%m-%d").tolist()}
+        for ticker, i in column.items():
+            historical[ticker] = clean_array(values[:, i]).tolist()
+        historical["slope"] = np.round(
+            np.where(np.isfinite(slope), slope, 0.0), 4
+        ).tolist()
+        historical["vix_vix3m"] = np.round(
+            np.where(np.isfinite(ratios[:, 1]), ratios[:, 1], 0.0), 4
+        ).tolist()
+
+        return {
+            "as_of": historical["dates"][-1],
+            "indices": indices,
+            "term_structure": {
+                "tenors": tenors.astype(int).tolist(),
+                "values": clean_array(curve[-1]).tolist(),
+                "slope": round(float(slope[-1]), 4) if np.isfinite(slope[-1]) else None,
+                "slope_percentile": clean_float(derived_ranks[0]),
+                "structure": (
+                    None
+                    if not np.isfinite(front_ratio)
+                    else "contango" if front_ratio < 1 else "backwardation"
+                ),
+            },
+            "ratios": ratio_values,
+            "historical": historical,
+        }
+
+    async def get_volatility_complex(self) -> Dict[str, Any]:
+        """Get the VIX term structure, VVIX and derived ratios in one call."""
+        try:
+            logger.info("Fetching volatility complex data")
+            return await self._cached("complex", self._load_volatility_complex)
+        except Exception as e:
+            logger.error(f"Error fetching volatility complex data: {str(e)}")
+            raise
 
+    async def get_vix_data(self) -> Dict[str, Any]:
+        """Get VIX data including current value and historical data."""
+        try:
+            logger.info("Fetching VIX data")
+            return await self._cached("vix", self._load_vix_data)
         except Exception as e:
             logger.error(f"Error fetching VIX data: {str(e)}")
             raise
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+import whois
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_domain(domain_name: str) -> str:
+    return domain_name.strip().lower().rstrip(".")
+
+
+def domain_tld(domain_name: str) -> str:
+    """The TLD whose WHOIS server answers for ``domain_name``"""
+    return normalize_domain(domain_name).rsplit(".", 1)[-1]
+
+
+def _first(value: Any) -> Any:
+    # python-whois returns a list when the registry repeats a field
+    if isinstance(value, (list, tuple)):
+        return next((v for v in value if v is not None), None)
+    return value
+
+
+def _naive_utc(value: Any) -> Optional[datetime]:
+    # Domain columns store naive UTC datetimes
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def whois_record(domain_name: str, info: Any) -> Dict[str, Any]:
+    """The fields stored on a ``Domain`` from a WHOIS response"""
+    status = _first(info.status)
+    return {
+        "domain": domain_name,
+        "registrar": _first(info.registrar),
+        "creation_date": _naive_utc(_first(info.creation_date)),
+        "expiration_date": _naive_utc(_first(info.expiration_date)),
+        "status": str(status) if status is not None else None,
+    }
+
+
+class TldRateLimiter:
+    """Spaces out queries to the same WHOIS server by at least ``interval``"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._next: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def wait(self, tld: str):
+        async with self._locks.setdefault(tld, asyncio.Lock()):
+            now = time.monotonic()
+            start = max(now, self._next.get(tld, 0.0))
+            self._next[tld] = start + self.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+
+
+class WhoisService:
+    """WHOIS lookups on a bounded thread pool with a TTL cache.
+
+    ``whois.whois`` blocks on a socket, so lookups run on at most
+    ``max_workers`` threads. Queries to the same TLD are spaced out by
+    ``tld_interval`` so registries do not throttle a bulk refresh, and
+    successful results are reused for ``ttl`` seconds. A lookup takes its
+    TLD slot only once a worker is free for it, so lookups queued behind
+    a busy pool cannot start together.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        ttl: float = 6 * 60 * 60,
+        tld_interval: float = 0.5,
+    ):
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.limiter = TldRateLimiter(tld_interval)
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._workers: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="whois"
+            )
+        return self._executor
+
+    def cached(self, domain_name: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(normalize_domain(domain_name))
+        if entry is None:
+            return None
+        expires_at, record = entry
+        if expires_at <= time.time():
+            self._cache.pop(normalize_domain(domain_name), None)
+            return None
+        return dict(record)
+
+    def _query(self, domain_name: str) -> Dict[str, Any]:
+        try:
+            record = whois_record(domain_name, whois.whois(domain_name))
+        except Exception as e:
+            logger.warning(f"WHOIS lookup for {domain_name} failed: {str(e)}")
+            return {"domain": domain_name, "error": str(e)}
+        self._cache[normalize_domain(domain_name)] = (time.time() + self.ttl, record)
+        return dict(record)
+
+    def lookup_sync(self, domain_name: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Blocking lookup for sync callers, sharing the cache.
+
+        Without ``use_cache`` the registry is always queried; the fresh
+        result still replaces the cached one.
+        """
+        if use_cache:
+            record = self.cached(domain_name)
+            if record is not None:
+                return record
+        return self._query(domain_name)
+
+    async def lookup(self, domain_name: str) -> Dict[str, Any]:
+        record = self.cached(domain_name)
+        if record is not None:
+            return record
+        if self._workers is None:
+            self._workers = asyncio.Semaphore(self.max_workers)
+        async with self._workers:
+            await self.limiter.wait(domain_tld(domain_name))
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), self._query, domain_name
+            )
+
+    async def lookup_many(
+        self,
+        domain_names: Iterable[str],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Look up every distinct name concurrently, reporting ``(done, total)``"""
+        names = list(dict.fromkeys(normalize_domain(n) for n in domain_names))
+        results: Dict[str, Dict[str, Any]] = {}
+        if on_progress:
+            on_progress(0, len(names))
+        for done, future in enumerate(
+            asyncio.as_completed([self.lookup(n) for n in names]), start=1
+        ):
+            record = await future
+            results[normalize_domain(record["domain"])] = record
+            if on_progress:
+                on_progress(done, len(names))
+        return results
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Create a single instance of the service
+whois_service = WhoisService()
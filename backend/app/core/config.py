@@ -30,6 +30,9 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # WHOIS lookups the background domain refresh may spend per hour
+    DOMAIN_REFRESH_BUDGET_PER_HOUR: int = 120
+
     # Apify
     APIFY_API_TOKEN: str
     APIFY_USER_ID: str = ""
@@ -15,7 +15,12 @@ from app.api.routes import (
     truthsocial,
     fred,
     domains,
+    social,
 )
+from app.api.services.fx_service import fx_service
+from app.api.services.domain_scheduler import domain_scheduler
+from app.api.services.jobs import job_manager
+from app.api.services.whois_service import whois_service
 from app.db.session import engine
 from app.models import user as user_model
 from app.models import (
@@ -91,6 +96,28 @@ app.include_router(vix.router, prefix="/api/vix", tags=["vix"])
 app.include_router(truthsocial.router, prefix="/api/truthsocial", tags=["truthsocial"])
 app.include_router(fred.router, prefix="/api/fred", tags=["fred"])
 app.include_router(domains.router, prefix="/api/domains", tags=["domains"])
+app.include_router(social.router, prefix="/api/social", tags=["social"])
+
+
+@app.on_event("startup")
+async def start_background_refresh():
+    fx_service.start()
+    market_data.market_data_service.start()
+    fred.fred_service.start_search_harvest()
+    domain_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    await fx_service.stop()
+    await domain_scheduler.stop()
+    await job_manager.shutdown()
+    await market_data.market_data_service.close()
+    await fred.fred_service.close()
+    await twitter.twitter_service.close()
+    await truthsocial.truthsocial_service.close()
+    await economic.economic_service.close()
+    whois_service.close()
 
 
 @app.get("/")
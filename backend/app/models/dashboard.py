@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -6,12 +6,16 @@ from app.db.base_class import Base
 
 class Dashboard(Base):
     __tablename__ = "dashboards"
+    # Keyset pagination of a user's dashboards, newest first
+    __table_args__ = (Index("ix_dashboards_user_created", "user_id", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     components = Column(JSON, nullable=False, default=list)
     layouts = Column(JSON, nullable=False, default=dict)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Bumped on every write, for optimistic concurrency on PATCH
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 import enum
 from app.db.base_class import Base
@@ -11,6 +11,10 @@ class DomainType(str, enum.Enum):
 
 class Domain(Base):
     __tablename__ = "domains"
+    # Serves the per-user listing sorted by expiration without a sort step
+    __table_args__ = (
+        Index("ix_domains_user_type_expiration", "user_id", "type", "expiration_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
@@ -19,6 +23,8 @@ class Domain(Base):
     creation_date = Column(DateTime, nullable=True)
     expiration_date = Column(DateTime, nullable=True)
     status = Column(String, nullable=True)
+    last_checked_at = Column(DateTime, nullable=True)
+    last_changed_at = Column(DateTime, nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"))
 
     user = relationship("User", back_populates="domains")
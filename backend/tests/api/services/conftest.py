@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.base_class import Base
+from app.models.dashboard import Dashboard  # noqa: F401 (User relationships)
+from app.models.domain import Domain  # noqa: F401 (User relationships)
+from app.models.user import User
+
+
+@pytest.fixture
+def session_factory():
+    """Sessions on a fresh in-memory SQLite database holding users 1 and 2"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = factory()
+    db.add(User(id=1, email="a@example.com", hashed_password="x"))
+    db.add(User(id=2, email="b@example.com", hashed_password="x"))
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
@@ -0,0 +1,178 @@
+import asyncio
+from types import SimpleNamespace
+import openai
+import pytest
+from app.api.services.ai_service import AIService
+from app.api.services.component_parser import ComponentBlockParser
+from app.api.services.prompt_cache import PromptCache
+from app.api.services.symbol_resolver import SymbolResolver, exchange_assets
+
+REPLY = [
+    "Here is your chart.\n``",
+    '`json\n{"type": "candlestick_chart", ',
+    '"config": {"symbols": ["BTC"]}}\n```',
+    "\nAnd a ticker:\n```json\n",
+    '[{"type": "price_ticker", "config": {"symbols": ["ETH"]}}]\n```',
+]
+
+
+class FakeChatCompletion:
+    """Stand-in for the model API that replays ``REPLY`` as deltas"""
+
+    calls = []
+
+    @classmethod
+    async def acreate(cls, **kwargs):
+        cls.calls.append(kwargs)
+        if not kwargs.get("stream"):
+            message = SimpleNamespace(content="".join(REPLY))
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        async def chunks():
+            yield {"choices": [{"delta": {"role": "assistant"}}]}
+            for content in REPLY:
+                await asyncio.sleep(0)
+                yield {"choices": [{"delta": {"content": content}}]}
+            yield {"choices": [{"delta": {}, "finish_reason": "stop"}]}
+
+        return chunks()
+
+
+@pytest.fixture(autouse=True)
+def fake_model(monkeypatch):
+    FakeChatCompletion.calls = []
+    monkeypatch.setattr(openai, "ChatCompletion", FakeChatCompletion, raising=False)
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_components_as_blocks_close():
+    events = [e async for e in AIService().stream_chat_message("add a BTC chart")]
+    kinds = [kind for kind, _ in events]
+
+    assert FakeChatCompletion.calls[0]["stream"] is True
+    # The chart is emitted right after the token that closes its block
+    assert kinds[:4] == ["token", "token", "token", "component"]
+    assert events[3][1] == {
+        "type": "candlestick_chart",
+        "config": {"symbols": ["BTC"]},
+    }
+    assert kinds[-2:] == ["component", "done"]
+    done = events[-1][1]
+    assert done["message"] == "".join(REPLY)
+    assert [c["type"] for c in done["components"]] == [
+        "candlestick_chart",
+        "price_ticker",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_non_streaming_reply_uses_the_same_components():
+    response = await AIService().process_chat_message("add a BTC chart")
+    assert [c["type"] for c in response["components"]] == [
+        "candlestick_chart",
+        "price_ticker",
+    ]
+
+
+def test_block_parser_ignores_other_fences():
+    parser = ComponentBlockParser()
+    assert parser.feed("```python\nprint('hi')\n```\n```json\n{bad json}\n```") == []
+    assert parser.feed('```json\n{"type": "news_feed"}\n```') == [
+        {"type": "news_feed", "config": {}}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_repeated_prompts_are_served_from_cache():
+    service = AIService()
+    first = await service.process_chat_message("Add a BTC chart")
+    again = await service.process_chat_message("add the btc chart!")
+    events = [e async for e in service.stream_chat_message("add BTC chart")]
+
+    assert again == first
+    assert events[-1] == ("done", first)
+    assert len(FakeChatCompletion.calls) == 1
+
+    # Same wording, different symbol: a miss
+    await service.process_chat_message("Add a ETH chart")
+    assert len(FakeChatCompletion.calls) == 2
+    stats = service.cache.get_stats()
+    assert stats["exact_hits"] == 2 and stats["misses"] == 2
+
+
+def test_cache_guard_separates_parameters_and_case():
+    service = AIService(resolver=SymbolResolver())
+    days_30 = service._cache_guard("show me a BTC chart for the last 30 days")
+    days_90 = service._cache_guard("show me a BTC chart for the last 90 days")
+    assert days_30 == {"BTC", "30"} and days_90 == {"BTC", "90"}
+
+    cache = PromptCache()
+    cache.put("add a BTC chart with 1h candles", {"id": 1}, frozenset({"BTC", "1h"}))
+    assert (
+        cache.get("add a BTC chart with 4h candles", frozenset({"BTC", "4h"})) is None
+    )
+    # "COIN price" and "coin price" normalize alike but name different symbols
+    cache.put("COIN price", {"id": 2}, frozenset({"COIN"}))
+    assert cache.get("coin price", frozenset()) is None
+    assert cache.get("Coin price!", frozenset({"COIN"})) == {"id": 2}
+
+
+def test_prompt_cache_similarity_ttl_and_lru():
+    cache = PromptCache(max_entries=2, ttl=60)
+    cache.put("show the bitcoin price chart with volume", {"id": 1}, frozenset({"BTC"}))
+
+    assert cache.get(
+        "show bitcoin price chart with volume bars", frozenset({"BTC"})
+    ) == {"id": 1}
+    assert cache.get("show bitcoin price chart with volume bars") is None
+    assert cache.get_stats()["similar_hits"] == 1
+
+    cache.put("b", {"id": 2})
+    cache.put("c", {"id": 3})
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get("b") == {"id": 2}
+
+    cache.ttl = -1
+    cache.put("d", {"id": 4})
+    assert cache.get("d") is None
+    assert cache.get_stats()["expirations"] == 1
+
+
+def test_symbol_resolver_matches_whole_tokens():
+    resolver = SymbolResolver()
+    resolver.set_source("kraken", ["ADA", "ETHFI", "ONE"])
+    resolver.add_symbols("fred", ["UNRATE"])
+
+    text = "ETHENA and ETHFI vs eth; $ADA, one more: Bitcoin, the VIX and UNRATE"
+    assert resolver.resolve(text) == ["ETHFI", "ETH", "ADA", "BTC", "^VIX", "UNRATE"]
+    assert resolver.resolve("chart ^VIX3M against S&P 500") == ["^VIX3M", "^GSPC"]
+
+    # Sources are recompiled after they change
+    resolver.set_source("kraken", ["ONE"])
+    assert resolver.resolve("ADA ONE") == ["ONE"]
+
+
+def test_exchange_assets_skip_fiat_and_short_bases():
+    markets = {
+        f"{base}/USD": {"base": base, "active": True}
+        for base in ["BTC", "EUR", "USDT", "A", "AI", "ME", "ADA", "CAD"]
+    }
+    markets["OLD/USD"] = {"base": "OLD", "active": False}
+    assert exchange_assets(markets, exclude=["CAD"]) == {"BTC", "ADA"}
+
+
+def test_parse_ai_response_fallback_uses_exchange_symbols():
+    resolver = SymbolResolver()
+    resolver.set_source("kraken", ["ADA", "ETH"], crypto=True)
+    resolver.add_symbols("fred", ["GDP"])
+    service = AIService(resolver=resolver)
+    components = service._parse_ai_response(
+        "Here is a price chart for ETH, ADA and MSTR against GDP"
+    )
+
+    assert [c["type"] for c in components] == ["price_ticker", "candlestick_chart"]
+    # Stocks and FRED series cannot be priced on the exchange
+    assert components[0]["config"]["symbols"] == ["ETH", "ADA"]
+    assert components[1]["config"]["symbols"] == ["ETH", "ADA"]
+    assert resolver.resolve("BTC price ticker in USD", crypto=True) == ["BTC"]
+    assert service._cache_guard("ETH vs MSTR") == {"ETH", "MSTR"}
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from app.api.services.candle_frame import CandleFrame
+
+
+@pytest.fixture
+def ohlcv():
+    return [
+        [1708646400000, "50000.5", "51000.0", "49500.0", "50750.2", "1000.5"],
+        [1708732800000, 50750.2, 52000.0, 50500.0, 51500.3, 1200.7],
+    ]
+
+
+def test_from_ohlcv_coerces_strings(ohlcv):
+    frame = CandleFrame.from_ohlcv(ohlcv)
+    assert len(frame) == 2
+    assert frame.open.dtype == np.float64
+    assert frame.timestamps.tolist() == [1708646400000, 1708732800000]
+
+
+def test_to_records_with_raw_timestamps(ohlcv):
+    records = CandleFrame.from_ohlcv(ohlcv).to_records()
+    assert records[0] == {
+        "time": 1708646400000,
+        "open": 50000.5,
+        "high": 51000.0,
+        "low": 49500.0,
+        "close": 50750.2,
+        "volume": 1000.5,
+    }
+
+
+def test_convert_scales_prices_only(ohlcv):
+    records = CandleFrame.from_ohlcv(ohlcv).convert(2.0).to_records(time_unit="D")
+    assert records[1]["time"] == "2024-02-24"
+    assert records[1]["open"] == pytest.approx(101500.4)
+    assert records[1]["volume"] == pytest.approx(1200.7)
+
+
+def test_empty_frame():
+    frame = CandleFrame.from_ohlcv([])
+    assert len(frame) == 0
+    assert frame.to_records() == []
+    assert frame.to_rows() == []
+
+
+def test_missing_volume_serializes_as_none():
+    frame = CandleFrame.from_ohlcv([[1708646400000, 1.0, 2.0, 0.5, 1.5, None]])
+    assert frame.to_records()[0]["volume"] is None
+    assert frame.to_rows() == [[1708646400000, 1.0, 2.0, 0.5, 1.5, None]]
+    assert frame.to_columns()["volume"] == [None]
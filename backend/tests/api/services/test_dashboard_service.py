@@ -0,0 +1,216 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import false, update
+from sqlalchemy.dialects import postgresql
+from app.api.services import dashboard_service as dashboard_module
+from app.api.services.dashboard_service import (
+    DashboardService,
+    VersionConflict,
+    database_update,
+    supports_in_database,
+)
+from app.api.services.json_patch import apply_patch, expand_component_ops
+from app.models.dashboard import Dashboard
+
+START = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    # Dashboards 3 and 4 share a creation time
+    for i, offset in enumerate([0, 1, 2, 2, 3], start=1):
+        session.add(
+            Dashboard(
+                id=i,
+                name=f"Board {i}",
+                components=[
+                    {"id": str(n), "type": "news_feed", "props": {}} for n in range(i)
+                ],
+                layouts={},
+                user_id=1,
+                created_at=START + timedelta(hours=offset),
+            )
+        )
+    session.add(Dashboard(id=6, name="Other", components=[], layouts={}, user_id=2))
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_summaries_page_newest_first_without_gaps(db):
+    service = DashboardService(db)
+    seen = []
+    cursor = None
+    while True:
+        page = service.list_summaries(1, limit=2, cursor=cursor)
+        seen.extend(page["data"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [d["id"] for d in seen] == [5, 4, 3, 2, 1]
+    assert seen[0] == {
+        "id": 5,
+        "name": "Board 5",
+        "component_count": 5,
+        "updated_at": START + timedelta(hours=3),
+    }
+
+
+def test_summaries_reject_bad_cursor(db):
+    with pytest.raises(ValueError):
+        DashboardService(db).list_summaries(1, cursor="not-a-cursor")
+
+
+def test_json_patch_operations():
+    document = {"a": [1, 2], "b": {"c": "x"}}
+    patched = apply_patch(
+        document,
+        [
+            {"op": "add", "path": "/a/-", "value": 3},
+            {"op": "replace", "path": "/b/c", "value": "y"},
+            {"op": "move", "from": "/a/0", "path": "/b/first"},
+            {"op": "copy", "from": "/b/c", "path": "/b/d~1e"},
+            {"op": "test", "path": "/a", "value": [2, 3]},
+            {"op": "remove", "path": "/a/1"},
+        ],
+    )
+    assert patched == {"a": [2], "b": {"c": "y", "first": 1, "d/e": "y"}}
+    assert document == {"a": [1, 2], "b": {"c": "x"}}
+
+    with pytest.raises(ValueError):
+        apply_patch(document, [{"op": "replace", "path": "/a/5", "value": 0}])
+    with pytest.raises(ValueError):
+        apply_patch(document, [{"op": "test", "path": "/b/c", "value": "z"}])
+
+
+def test_patch_applies_component_ops_with_version_check(db):
+    service = DashboardService(db)
+    result = service.patch_dashboard(
+        3,
+        1,
+        1,
+        [
+            {"op": "update_component", "id": "1", "props": {"symbol": "BTC"}},
+            {"op": "remove_component", "id": "0"},
+            {"op": "add_component", "component": {"id": "9", "type": "chart"}},
+            {"op": "replace", "path": "/name", "value": "Renamed"},
+        ],
+    )
+    assert result == {"id": 3, "version": 2}
+
+    db.expire_all()
+    dashboard = db.get(Dashboard, 3)
+    assert dashboard.name == "Renamed"
+    assert dashboard.version == 2
+    assert [c["id"] for c in dashboard.components] == ["1", "2", "9"]
+    assert dashboard.components[0]["props"] == {"symbol": "BTC"}
+
+    # A stale version is rejected and nothing is written
+    with pytest.raises(VersionConflict):
+        service.patch_dashboard(
+            3, 1, 1, [{"op": "replace", "path": "/name", "value": "Stale"}]
+        )
+    with pytest.raises(ValueError):
+        service.patch_dashboard(3, 1, 2, [{"op": "remove", "path": "/name"}])
+    assert service.patch_dashboard(3, 2, 2, []) is None
+    db.expire_all()
+    assert db.get(Dashboard, 3).name == "Renamed"
+
+
+def test_simple_patches_compile_to_jsonb_set():
+    patch = expand_component_ops(
+        [
+            {"op": "update_component", "id": "b", "props": {"symbol": "ETH"}},
+            {"op": "add", "path": "/layouts/lg/0/x", "value": 4},
+            {"op": "replace", "path": "/name", "value": "Renamed"},
+        ],
+        ["a", "b"],
+    )
+    assert all(supports_in_database(op) for op in patch)
+
+    statement = database_update(3, 1, 7, patch)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.count("jsonb_set(") == 2
+    where = sql.split("WHERE")[1]
+    assert "dashboards.version =" in where
+    # Missing parents match no row instead of being skipped by jsonb_set
+    assert where.count("jsonb_typeof(") == 2
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "add", "path": "/components/-", "value": {"type": "chart"}},
+        {"op": "add", "path": "/components/0", "value": "junk"},
+        {"op": "add", "path": "/components/0/type", "value": 5},
+        {"op": "add", "path": "/components/abc/props/x", "value": 1},
+        {"op": "replace", "path": "/components/9", "value": {"type": "chart"}},
+        {"op": "replace", "path": "/layouts/lg", "value": []},
+        {"op": "remove", "path": "/layouts/lg"},
+    ],
+)
+def test_risky_patches_are_applied_in_python(operation):
+    assert not supports_in_database(operation)
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "add", "path": "/layouts/lg"},
+        {"op": "replace", "path": "/components", "value": ["junk"]},
+        {"op": "replace", "path": "/name", "value": ""},
+    ],
+)
+def test_invalid_patches_are_rejected_before_compiling(operation):
+    with pytest.raises(ValueError):
+        supports_in_database(operation)
+
+
+@pytest.mark.parametrize(
+    "operations",
+    [
+        [{"op": "replace", "path": "/components/0", "value": "junk"}],
+        [{"op": "replace", "path": "/components/9", "value": {"type": "chart"}}],
+        [{"op": "add", "path": "/components/abc", "value": {"type": "chart"}}],
+        [{"op": "add", "path": "/name"}],
+        [{"op": "update_component", "id": "0"}],
+        [{"op": "update_component", "id": "0", "props": ["junk"]}],
+    ],
+)
+def test_invalid_patches_leave_the_dashboard_unchanged(db, operations):
+    with pytest.raises(ValueError):
+        DashboardService(db).patch_dashboard(2, 1, 1, operations)
+    db.expire_all()
+    assert db.get(Dashboard, 2).version == 1
+
+
+def test_missing_parent_falls_back_to_python(db, monkeypatch):
+    """A database update matching no row is retried on the loaded document"""
+    db.get(Dashboard, 2).components = [{"id": "0", "type": "chart"}]
+    db.commit()
+    service = DashboardService(db)
+    monkeypatch.setattr(db.get_bind().dialect, "name", "postgresql")
+    monkeypatch.setattr(
+        service,
+        "_version_and_ids",
+        lambda *args: SimpleNamespace(version=1, ids=["0"]),
+    )
+    monkeypatch.setattr(
+        dashboard_module,
+        "database_update",
+        lambda *args: update(Dashboard).where(false()).values(name="Never"),
+    )
+    with pytest.raises(ValueError, match="does not exist"):
+        service.patch_dashboard(
+            2, 1, 1, [{"op": "update_component", "id": "0", "props": {"a": 1}}]
+        )
+
+    patched = service.patch_dashboard(
+        2, 1, 1, [{"op": "add", "path": "/layouts/lg", "value": {"x": 1}}]
+    )
+    assert patched == {"id": 2, "version": 2}
+    db.expire_all()
+    assert db.get(Dashboard, 2).layouts == {"lg": {"x": 1}}
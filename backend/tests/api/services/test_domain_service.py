@@ -0,0 +1,251 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+import whois
+from app.api.services.domain_scheduler import (
+    DomainRefreshScheduler,
+    refresh_interval,
+)
+from app.api.services.domain_service import (
+    DomainService,
+    apply_whois_info,
+    utc_now,
+    parse_domain_csv,
+    refresh_domains,
+)
+from app.api.services.jobs import JobManager
+from app.api.services.whois_service import WhoisService, whois_service
+from app.models.domain import Domain, DomainType
+
+
+class FakeWhois:
+    """Stand-in for ``whois.whois`` recording calls and peak concurrency"""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, name):
+        with self._lock:
+            self.calls.append((name, time.monotonic()))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if name.startswith("broken"):
+            raise ConnectionError("no whois server")
+        return SimpleNamespace(
+            registrar="Example Registrar",
+            creation_date=[datetime(2020, 1, 1), datetime(2020, 1, 2)],
+            expiration_date=datetime(2030, 1, 1),
+            status=["clientTransferProhibited", "ok"],
+        )
+
+
+@pytest.fixture
+def fake_whois(monkeypatch):
+    fake = FakeWhois()
+    monkeypatch.setattr(whois, "whois", fake)
+    return fake
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    db = session_factory()
+    names = ["a.com", "b.com", "c.net", "d.org", "broken.io"]
+    db.add_all(Domain(name=name, type=DomainType.OWNED, user_id=1) for name in names)
+    db.add(Domain(name="other.com", type=DomainType.OWNED, user_id=2))
+    db.commit()
+    db.close()
+    return session_factory
+
+
+@pytest.mark.asyncio
+async def test_bulk_refresh_writes_results_in_one_job(fake_whois, session_factory):
+    db = session_factory()
+    targets = DomainService(db).get_refresh_targets(1)
+    assert [name for _, name in targets] == [
+        "a.com",
+        "b.com",
+        "c.net",
+        "d.org",
+        "broken.io",
+    ]
+
+    lookups = WhoisService(max_workers=3, tld_interval=0.05)
+    jobs = JobManager()
+    job = jobs.submit(
+        "domain_refresh",
+        lambda job: refresh_domains(job, targets, lookups, session_factory),
+        owner_id=1,
+    )
+    assert await job.wait(5)
+    lookups.close()
+
+    assert job.status == "succeeded"
+    assert (job.done, job.total) == (5, 5)
+    assert job.result == {
+        "requested": 5,
+        "updated": 4,
+        "failed": {"broken.io": "no whois server"},
+    }
+    assert 1 < fake_whois.peak <= 3
+
+    # Same-TLD queries are spaced out by the limiter
+    com = sorted(t for name, t in fake_whois.calls if name.endswith(".com"))
+    assert com[1] - com[0] >= 0.04
+
+    db.expire_all()
+    stored = {d.name: d for d in db.query(Domain).filter(Domain.user_id == 1)}
+    assert stored["a.com"].registrar == "Example Registrar"
+    assert stored["a.com"].creation_date == datetime(2020, 1, 1)
+    assert stored["a.com"].status == "clientTransferProhibited"
+    assert stored["broken.io"].registrar is None
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_queued_lookups_keep_tld_spacing(fake_whois):
+    fake_whois.delay = 0.1
+    lookups = WhoisService(max_workers=2, tld_interval=0.05)
+    # Both workers are busy when the .com lookups are queued
+    await asyncio.gather(
+        *(lookups.lookup(name) for name in ["a.net", "b.org", "c.com", "d.com"])
+    )
+    lookups.close()
+
+    com = sorted(t for name, t in fake_whois.calls if name.endswith(".com"))
+    assert com[1] - com[0] >= 0.04
+    assert fake_whois.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_cached(fake_whois):
+    lookups = WhoisService(tld_interval=0)
+    first = await lookups.lookup_many(["A.com", "a.com.", "b.com"])
+    again = await lookups.lookup("a.com")
+    lookups.close()
+
+    assert sorted(first) == ["a.com", "b.com"]
+    assert again["expiration_date"] == datetime(2030, 1, 1)
+    assert sorted(name for name, _ in fake_whois.calls) == ["a.com", "b.com"]
+
+    # Failures are not cached
+    assert "error" in lookups.lookup_sync("broken.com")
+    assert "error" in lookups.lookup_sync("broken.com")
+    assert len(fake_whois.calls) == 4
+
+
+def test_single_refresh_bypasses_the_cache(fake_whois, session_factory):
+    whois_service.lookup_sync("a.com")
+    db = session_factory()
+    domain = db.query(Domain).filter(Domain.name == "a.com").one()
+
+    assert DomainService(db).update_domain_info(domain.id, 1) is domain
+    assert [name for name, _ in fake_whois.calls] == ["a.com", "a.com"]
+    assert domain.registrar == "Example Registrar"
+    # The fresh result is cached for the bulk refreshes
+    assert whois_service.cached("a.com")["registrar"] == "Example Registrar"
+    db.close()
+
+
+def test_refresh_interval_prefers_near_expiry_and_changed_domains():
+    now = datetime(2025, 1, 1)
+    assert refresh_interval(now + timedelta(days=3), None, now) == timedelta(hours=6)
+    assert refresh_interval(now - timedelta(days=3), None, now) == timedelta(hours=6)
+    assert refresh_interval(now + timedelta(days=60), None, now) == timedelta(days=3)
+    assert refresh_interval(now + timedelta(days=900), None, now) == timedelta(days=14)
+    assert refresh_interval(
+        now + timedelta(days=900), now - timedelta(days=1), now
+    ) == timedelta(hours=12)
+
+
+def test_changes_are_stamped_only_after_the_first_check():
+    now = datetime(2025, 1, 1)
+    domain = Domain(name="a.com")
+    info = {"registrar": "One", "expiration_date": datetime(2030, 1, 1)}
+    assert apply_whois_info(domain, info, now)
+    assert domain.last_checked_at == now and domain.last_changed_at is None
+
+    later = now + timedelta(days=1)
+    apply_whois_info(domain, info, later)
+    assert domain.last_changed_at is None
+    apply_whois_info(domain, {**info, "registrar": "Two"}, later)
+    assert domain.last_changed_at == later
+
+    # Failed lookups keep the stored data
+    assert not apply_whois_info(domain, {"error": "timeout"}, later)
+    assert domain.registrar == "Two"
+
+
+@pytest.mark.asyncio
+async def test_scheduler_spends_hourly_budget_on_most_overdue(
+    fake_whois, session_factory
+):
+    scheduler = DomainRefreshScheduler(
+        lookups=WhoisService(tld_interval=0),
+        session_factory=session_factory,
+        budget_per_hour=180,
+        tick=60,
+    )
+    # 3 lookups per tick: never-checked domains go first
+    assert await scheduler.run_once() == 3
+    assert await scheduler.run_once() == 3
+    assert len(fake_whois.calls) == 6
+    # Everything is fresh; the domain without an expiry is retried daily
+    assert await scheduler.run_once() == 0
+    assert await scheduler.run_once(utc_now() + timedelta(days=2)) == 1
+    assert [name for name, _ in fake_whois.calls][-1] == "broken.io"
+    scheduler.lookups.close()
+
+    db = session_factory()
+    assert db.query(Domain).filter(Domain.last_checked_at.is_(None)).count() == 0
+    db.close()
+
+
+def test_parse_domain_csv_finds_the_name_column():
+    export = "Status,Domain Name,Expires\nActive,Example.com,2030-01-01\n,,\n"
+    assert parse_domain_csv(export) == ["Example.com"]
+    assert parse_domain_csv("a.com\nb.net\n") == ["a.com", "b.net"]
+
+
+@pytest.mark.asyncio
+async def test_import_dedupes_and_fills_whois_asynchronously(
+    fake_whois, session_factory
+):
+    db = session_factory()
+    imported = DomainService(db).import_domains(
+        ["A.com", "new.com", "NEW.com.", "not a domain", "fresh.dev", ""],
+        DomainType.WISHLIST,
+        1,
+    )
+    assert [name for _, name in imported["targets"]] == ["new.com", "fresh.dev"]
+    assert imported["existing"] == ["a.com"]
+    assert imported["invalid"] == ["not a domain"]
+    assert fake_whois.calls == []
+
+    lookups = WhoisService(tld_interval=0)
+    job = JobManager().submit(
+        "domain_import",
+        lambda job: refresh_domains(job, imported["targets"], lookups, session_factory),
+    )
+    assert await job.wait(5)
+    lookups.close()
+
+    assert job.result["updated"] == 2
+    new = db.query(Domain).filter(Domain.name == "new.com").one()
+    assert new.type == DomainType.WISHLIST
+    assert new.expiration_date == datetime(2030, 1, 1)
+    db.close()
+
+    with pytest.raises(ValueError):
+        DomainService(session_factory()).import_domains(
+            ["x.com"] * 5001, DomainType.OWNED, 1
+        )
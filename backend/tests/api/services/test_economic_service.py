@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from app.api.services.economic_service import EconomicService
+from app.api.services.economic_store import CalendarStore
+
+TODAY = date.today()
+
+
+def day(offset: int) -> str:
+    return (TODAY + timedelta(days=offset)).isoformat()
+
+
+EVENTS = [
+    {"event": "CPI YoY", "time": f"{day(2)} 12:30:00", "country": "US"},
+    {"event": "FOMC Rate Decision", "time": f"{day(20)} 18:00:00", "country": "US"},
+    {"event": "Federal Reserve Chair Speech", "time": f"{day(90)} 14:00:00"},
+    {"event": "ECB Rate Decision", "time": f"{day(40)} 12:15:00", "country": "EU"},
+]
+
+
+@pytest_asyncio.fixture
+async def finnhub_api():
+    """Local stand-in for Finnhub's economic calendar"""
+    ranges = []
+
+    async def calendar(request):
+        start, end = request.query["from"], request.query["to"]
+        ranges.append((start, end))
+        events = [e for e in EVENTS if start <= e["time"][:10] <= end]
+        return web.json_response({"economicCalendar": events})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/calendar/economic", calendar)
+    server = TestServer(app)
+    await server.start_server()
+    server.ranges = ranges
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def economic_service(finnhub_api):
+    service = EconomicService()
+    service.api_key = "test-key"
+    service.base_url = str(finnhub_api.make_url("/api/v1"))
+    yield service
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_calendar_fetches_only_missing_ranges(economic_service, finnhub_api):
+    events = await economic_service.get_economic_calendar()
+    assert [e["event"] for e in events] == ["CPI YoY", "FOMC Rate Decision"]
+
+    # A sub-range is answered locally
+    inner = await economic_service.get_economic_calendar(day(10), day(25))
+    assert [e["event"] for e in inner] == ["FOMC Rate Decision"]
+    assert len(finnhub_api.ranges) == 1
+
+    # FOMC reuses the 30 covered days and fetches only the rest
+    fomc = await economic_service.get_fomc_meetings()
+    assert [e["event"] for e in fomc] == [
+        "FOMC Rate Decision",
+        "Federal Reserve Chair Speech",
+    ]
+    assert finnhub_api.ranges[-1] == (day(31), day(180))
+
+
+@pytest.mark.asyncio
+async def test_calendar_rejects_bad_dates(economic_service):
+    with pytest.raises(ValueError):
+        await economic_service.get_economic_calendar("2025-13-01", None)
+    with pytest.raises(ValueError):
+        await economic_service.get_economic_calendar(day(5), day(1))
+
+
+def test_store_refreshes_only_the_live_window():
+    store = CalendarStore(live_days=7, live_ttl=60, ttl=3600)
+    start, end = TODAY, TODAY + timedelta(days=60)
+    store.record(start, end, [], today=TODAY, now=0)
+
+    assert store.missing(start, end, today=TODAY, now=30) == []
+    assert store.missing(start, end, today=TODAY, now=120) == [
+        (TODAY, TODAY + timedelta(days=7))
+    ]
+    assert store.missing(start, end, today=TODAY, now=7200) == [(start, end)]
@@ -0,0 +1,305 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from app.api.services.fred_releases import ReleaseCatalog
+from app.api.services.fred_search import SeriesSearchIndex
+from app.api.services.fred_service import FREDService
+
+SERIES = {
+    "UNRATE": {
+        "id": "UNRATE",
+        "title": "Unemployment Rate",
+        "units": "Percent",
+        "frequency": "Monthly",
+        "last_updated": "2025-05-02 07:48:02-05",
+        "observation_start": "1948-01-01",
+        "observation_end": "2025-04-01",
+    },
+    "DGS10": {
+        "id": "DGS10",
+        "title": "10-Year Treasury",
+        "units": "Percent",
+        "frequency": "Daily",
+        "last_updated": "2025-04-03 15:18:02-05",
+    },
+    "DGS2": {
+        "id": "DGS2",
+        "title": "2-Year Treasury",
+        "units": "Percent",
+        "frequency": "Daily",
+        "last_updated": "2025-04-03 15:18:02-05",
+    },
+}
+OBSERVATIONS = {
+    "UNRATE": [
+        {"date": "2025-02-01", "value": "4.1"},
+        {"date": "2025-03-01", "value": "4.2"},
+        {"date": "2025-04-01", "value": "."},
+    ],
+    "DGS10": [
+        {"date": "2025-03-28", "value": "4.25"},
+        {"date": "2025-03-31", "value": "4.23"},
+        {"date": "2025-04-01", "value": "."},
+        {"date": "2025-04-02", "value": "4.20"},
+    ],
+    "DGS2": [
+        {"date": "2025-03-28", "value": "3.90"},
+        {"date": "2025-03-31", "value": "3.89"},
+        {"date": "2025-04-02", "value": "3.85"},
+    ],
+}
+
+RELEASES = [
+    {"id": 10, "name": "Consumer Price Index", "link": "http://www.bls.gov/cpi/"},
+    {"id": 50, "name": "Employment Situation", "link": "http://www.bls.gov/ces/"},
+    {"id": 53, "name": "Gross Domestic Product"},
+]
+RELEASE_DATES = [
+    {"release_id": 50, "date": "2099-01-09"},
+    {"release_id": 10, "date": "2099-01-14"},
+    {"release_id": 50, "date": "2099-02-06"},
+]
+SEARCH_RESULTS = [
+    {
+        "id": "CPIAUCSL",
+        "title": "Consumer Price Index for All Urban Consumers",
+        "frequency": "Monthly",
+    },
+    {
+        "id": "PCEPI",
+        "title": "Personal Consumption Expenditures: Chain-type Price Index",
+        "frequency": "Monthly",
+    },
+    {"id": "GDP", "title": "Gross Domestic Product", "frequency": "Quarterly"},
+]
+
+
+@pytest_asyncio.fixture
+async def fred_api():
+    """Local stand-in for the FRED API that records every request path"""
+    calls = []
+    params = []
+
+    async def series(request):
+        calls.append(request.path)
+        series = SERIES.get(request.query["series_id"])
+        return web.json_response({"seriess": [series] if series else []})
+
+    async def observations(request):
+        calls.append(request.path)
+        params.append(dict(request.query))
+        start = request.query.get("observation_start", "")
+        rows = [
+            row
+            for row in OBSERVATIONS.get(request.query["series_id"], [])
+            if row["date"] >= start
+        ]
+        return web.json_response({"observations": rows})
+
+    async def search(request):
+        calls.append(request.path)
+        terms = request.query["search_text"].lower().split()
+        matches = [
+            {**series, "popularity": 50}
+            for series in SEARCH_RESULTS
+            if all(
+                term in f"{series['id']} {series['title']}".lower() for term in terms
+            )
+        ]
+        return web.json_response({"seriess": matches})
+
+    async def releases(request):
+        calls.append(request.path)
+        return web.json_response({"releases": RELEASES})
+
+    async def release_dates(request):
+        calls.append(request.path)
+        offset = int(request.query.get("offset", 0))
+        # Two rows per page to exercise pagination
+        page = RELEASE_DATES[offset : offset + 2]
+        return web.json_response({"count": len(RELEASE_DATES), "release_dates": page})
+
+    app = web.Application()
+    app.router.add_get("/fred/series", series)
+    app.router.add_get("/fred/series/observations", observations)
+    app.router.add_get("/fred/series/search", search)
+    app.router.add_get("/fred/releases", releases)
+    app.router.add_get("/fred/releases/dates", release_dates)
+    server = TestServer(app)
+    await server.start_server()
+    server.calls = calls
+    server.params = params
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def fred_service(fred_api):
+    service = FREDService()
+    service.base_url = str(fred_api.make_url("/fred"))
+    yield service
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_get_series_reads_from_store(fred_service, fred_api):
+    first = await fred_service.get_series("UNRATE", limit=2)
+    second = await fred_service.get_series("UNRATE", limit=2)
+
+    assert first == second
+    assert len(first) == 2
+    assert first[0] == {
+        "date": "2025-04-01",
+        "value": None,
+        "series_id": "UNRATE",
+        "title": "Unemployment Rate",
+        "units": "Percent",
+        "frequency": "Monthly",
+    }
+    assert first[1]["value"] == 4.2
+    assert fred_api.calls.count("/fred/series") == 1
+    assert fred_api.calls.count("/fred/series/observations") == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_fetches_only_after_update(fred_service, fred_api, monkeypatch):
+    await fred_service.get_series("UNRATE")
+    fred_service.store.check_interval = 0
+
+    # Unchanged last_updated: metadata check only
+    await fred_service.get_series("UNRATE")
+    assert fred_api.calls.count("/fred/series/observations") == 1
+
+    monkeypatch.setitem(
+        SERIES, "UNRATE", {**SERIES["UNRATE"], "last_updated": "2025-06-06 07:48:02-05"}
+    )
+    monkeypatch.setitem(
+        OBSERVATIONS,
+        "UNRATE",
+        OBSERVATIONS["UNRATE"][:2]
+        + [
+            {"date": "2025-04-01", "value": "4.2"},
+            {"date": "2025-05-01", "value": "4.3"},
+        ],
+    )
+    fred_service.store.revision_lookback = 1
+    observations = await fred_service.get_series("UNRATE", limit=3)
+
+    assert fred_api.params[-1]["observation_start"] == "2025-04-01"
+    assert [o["value"] for o in observations] == [4.3, 4.2, 4.2]
+
+
+@pytest.mark.asyncio
+async def test_get_series_unknown_id(fred_service):
+    with pytest.raises(ValueError):
+        await fred_service.get_series("NOPE")
+
+
+@pytest.mark.asyncio
+async def test_series_batch_aligns_and_derives_spreads(fred_service):
+    data = await fred_service.get_series_batch(
+        ["DGS10", "UNRATE"], fill="ffill", spreads=["DGS10-DGS2"], start="2025-03-01"
+    )
+
+    assert data["dates"] == [
+        "2025-03-01",
+        "2025-03-28",
+        "2025-03-31",
+        "2025-04-01",
+        "2025-04-02",
+    ]
+    assert set(data["series"]) == {"DGS10", "UNRATE"}
+    assert data["series"]["DGS10"]["title"] == "10-Year Treasury"
+    assert data["series"]["DGS10"]["values"] == [None, 4.25, 4.23, 4.23, 4.2]
+    assert data["series"]["UNRATE"]["values"] == [4.2, 4.2, 4.2, 4.2, 4.2]
+    assert data["spreads"]["DGS10-DGS2"] == pytest.approx(
+        [None, 0.35, 0.34, 0.34, 0.35], abs=1e-9
+    )
+
+
+@pytest.mark.asyncio
+async def test_series_batch_monthly_mean(fred_service):
+    data = await fred_service.get_series_batch(["DGS10"], frequency="M")
+
+    assert data["dates"] == ["2025-03-01", "2025-04-01"]
+    assert data["series"]["DGS10"]["values"] == pytest.approx([4.24, 4.2])
+
+
+@pytest.mark.asyncio
+async def test_upcoming_releases_from_catalog(fred_service, fred_api):
+    releases = await fred_service.get_upcoming_releases(["employment", "price"])
+
+    assert [(r["id"], r["date"]) for r in releases] == [
+        (50, "2099-01-09"),
+        (10, "2099-01-14"),
+    ]
+    assert releases[0]["link"] == "http://www.bls.gov/ces/"
+
+    everything = await fred_service.get_upcoming_releases()
+    assert [r["id"] for r in everything] == [50, 10, 53]
+    assert everything[-1]["date"] is None
+
+    assert fred_api.calls.count("/fred/releases") == 1
+    assert fred_api.calls.count("/fred/releases/dates") == 2
+
+
+def test_release_catalog_date_window():
+    catalog = ReleaseCatalog(RELEASES, RELEASE_DATES)
+
+    window = catalog.upcoming(start="2099-01-10", end="2099-02-06")
+    assert [(r["id"], r["date"]) for r in window] == [
+        (10, "2099-01-14"),
+        (50, "2099-02-06"),
+    ]
+    assert catalog.upcoming(["employment"], limit=1)[0]["date"] == "2099-01-09"
+
+
+@pytest.mark.asyncio
+async def test_search_answers_from_local_index(fred_service, fred_api):
+    await fred_service.harvest_popular_series(["price index", "gdp"])
+    assert fred_api.calls.count("/fred/series/search") == 2
+
+    results = await fred_service.search_series("price ind", limit=2)
+    assert {r["id"] for r in results} == {"CPIAUCSL", "PCEPI"}
+    assert [r["id"] for r in await fred_service.search_series("gdp", limit=1)] == [
+        "GDP"
+    ]
+    assert fred_api.calls.count("/fred/series/search") == 2
+
+
+@pytest.mark.asyncio
+async def test_search_falls_back_upstream_once(fred_service, fred_api):
+    results = await fred_service.search_series("consumer price")
+    assert [r["id"] for r in results] == ["CPIAUCSL"]
+
+    # Fewer hits than the limit, but FRED was already asked
+    await fred_service.search_series("Consumer  PRICE")
+    assert fred_api.calls.count("/fred/series/search") == 1
+
+    # Series seen through metadata are indexed too (daily ones are filtered out)
+    await fred_service.sync_series("UNRATE")
+    assert [r["id"] for r in fred_service.search_index.search("unemp")] == ["UNRATE"]
+
+
+def test_search_index_ranks_exact_before_prefix():
+    index = SeriesSearchIndex()
+    index.add(
+        {
+            "id": "A",
+            "title": "Rates of interest",
+            "frequency": "Monthly",
+            "popularity": 90,
+        }
+    )
+    index.add(
+        {"id": "B", "title": "Interest rate", "frequency": "Monthly", "popularity": 10}
+    )
+    index.add(
+        {"id": "C", "title": "Interest rate", "frequency": "Daily", "popularity": 99}
+    )
+
+    assert [r["id"] for r in index.search("interest rate")] == ["B", "A"]
+    assert [r["id"] for r in index.search("b")] == ["B"]
+    assert index.search("interest rate", frequencies=None)[0]["id"] == "C"
+    assert index.search("mortgage") == []
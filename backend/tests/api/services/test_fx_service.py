@@ -0,0 +1,97 @@
+import time
+import ccxt.async_support as ccxt
+import numpy as np
+import pytest
+from app.api.services.fx_service import FXRateService
+
+
+@pytest.fixture
+def fx_service():
+    service = FXRateService(
+        max_staleness=300, pair_max_staleness={"USDT/USD": 60}
+    )
+    service.update_rates(
+        {
+            "USDT/USD": {"last": 1.0, "timestamp": 1_000_000},
+            "USD/CAD": {"last": 1.4, "timestamp": 1_000_000},
+            "EUR/USD": {"last": 1.1, "timestamp": 1_000_000},
+        },
+        now=1_000,
+    )
+    return service
+
+
+def test_direct_and_inverse_rates(fx_service):
+    matrix = fx_service.rate_matrix(now=1_010)
+    usd, cad = fx_service.index["USD"], fx_service.index["CAD"]
+    assert matrix[usd, cad] == pytest.approx(1.4)
+    assert matrix[cad, usd] == pytest.approx(1 / 1.4)
+
+
+def test_triangulates_through_pivots(fx_service):
+    matrix = fx_service.rate_matrix(now=1_010)
+    eur, cad = fx_service.index["EUR"], fx_service.index["CAD"]
+    usdt = fx_service.index["USDT"]
+    assert matrix[eur, cad] == pytest.approx(1.1 * 1.4)
+    assert matrix[usdt, cad] == pytest.approx(1.4)
+
+
+def test_stale_rates_are_dropped(fx_service):
+    # USDT/USD has a 60s bound, everything else 300s
+    matrix = fx_service.rate_matrix(now=1_100)
+    usdt, cad = fx_service.index["USDT"], fx_service.index["CAD"]
+    assert np.isnan(matrix[usdt, cad])
+    assert not np.isnan(matrix[fx_service.index["EUR"], cad])
+
+    matrix = fx_service.rate_matrix(now=1_400)
+    assert np.isnan(matrix[fx_service.index["EUR"], cad])
+
+
+def test_convert_is_vectorized(fx_service, monkeypatch):
+    monkeypatch.setattr("time.time", lambda: 1_010)
+    converted = fx_service.convert([1.0, 2.0, 3.0], "USD", "CAD")
+    np.testing.assert_allclose(converted, [1.4, 2.8, 4.2])
+
+
+def test_unsupported_currency(fx_service):
+    with pytest.raises(ValueError):
+        fx_service.get_rate("USD", "XYZ")
+
+
+class FlakyExchange:
+    """ccxt stand-in whose first ``load_markets`` fails"""
+
+    loads = 0
+
+    def __init__(self, config):
+        self.requested = []
+
+    async def load_markets(self):
+        FlakyExchange.loads += 1
+        if FlakyExchange.loads == 1:
+            raise ConnectionError("markets unavailable")
+        return {"USDT/USD": {"base": "USDT", "active": True}}
+
+    async def fetch_tickers(self, pairs):
+        self.requested.append(pairs)
+        return {"USDT/USD": {"last": 1.0, "timestamp": time.time() * 1000}}
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_failed_market_load_is_retried(monkeypatch):
+    monkeypatch.setattr(ccxt, "kraken", FlakyExchange, raising=False)
+    monkeypatch.setattr(FlakyExchange, "loads", 0)
+    service = FXRateService()
+
+    with pytest.raises(ConnectionError):
+        await service.refresh()
+    assert service.exchange is None
+
+    await service.refresh()
+    assert FlakyExchange.loads == 2
+    # Only the listed pairs are requested
+    assert service.exchange.requested == [["USDT/USD"]]
+    assert service.get_rate("USDT", "USD") == 1.0
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from app.api.services.indicator_service import (
+    IndicatorEngine,
+    StreamingIndicators,
+    compute_indicators,
+    vwap,
+)
+
+
+@pytest.fixture
+def candles():
+    rng = np.random.default_rng(42)
+    n = 200
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.random(n)
+    low = close - rng.random(n)
+    volume = rng.random(n) * 10
+    timestamps = np.arange(n) * 60_000
+    return timestamps, high, low, close, volume
+
+
+def to_ohlcv(timestamps, high, low, close, volume):
+    return np.column_stack([timestamps, close, high, low, close, volume]).tolist()
+
+
+def test_streaming_matches_vectorized(candles):
+    _, high, low, close, volume = candles
+    vectorized = compute_indicators(high[None], low[None], close[None], volume[None])
+
+    state = StreamingIndicators()
+    streamed = [
+        state.update(h, l, c, v) for h, l, c, v in zip(high, low, close, volume)
+    ]
+
+    for name, values in vectorized.items():
+        np.testing.assert_allclose(
+            values[0], [row[name] for row in streamed], err_msg=name
+        )
+
+
+def test_simple_moving_average_window(candles):
+    _, high, low, close, volume = candles
+    sma = compute_indicators(high[None], low[None], close[None], volume[None])["sma_20"]
+    assert np.isnan(sma[0, 18])
+    assert sma[0, 19] == pytest.approx(close[:20].mean())
+    assert sma[0, -1] == pytest.approx(close[-20:].mean())
+
+
+def test_engine_extends_cached_series_incrementally(candles):
+    timestamps, high, low, close, volume = candles
+    ohlcv = to_ohlcv(timestamps, high, low, close, volume)
+    engine = IndicatorEngine()
+
+    engine.compute("BTC", ohlcv[:150])
+    result = engine.compute("BTC", ohlcv[10:160])
+
+    expected = compute_indicators(
+        high[None, :160], low[None, :160], close[None, :160], volume[None, :160]
+    )
+    assert result["time"][0] == timestamps[10]
+    for name, values in expected.items():
+        got = np.array([np.nan if v is None else v for v in result[name]])
+        if name == "vwap":
+            # Anchored at the first candle of the response
+            window = slice(10, 160)
+            values = vwap(high[window], low[window], close[window], volume[window])
+            np.testing.assert_allclose(got, values, err_msg=name)
+        else:
+            np.testing.assert_allclose(got, values[0, 10:160], err_msg=name)
+
+
+def test_engine_recomputes_when_window_starts_before_cache(candles):
+    timestamps, high, low, close, volume = candles
+    ohlcv = to_ohlcv(timestamps, high, low, close, volume)
+    engine = IndicatorEngine()
+
+    small = engine.compute("BTC", ohlcv[100:])
+    large = engine.compute("BTC", ohlcv)
+
+    assert len(small["time"]) == len(small["rsi"]) == 100
+    assert {len(values) for values in large.values()} == {200}
+    expected = compute_indicators(high[None], low[None], close[None], volume[None])
+    for name, values in expected.items():
+        got = np.array([np.nan if v is None else v for v in large[name]])
+        np.testing.assert_allclose(got, values[0], err_msg=name)
+
+
+def test_engine_batch_returns_every_symbol(candles):
+    timestamps, high, low, close, volume = candles
+    engine = IndicatorEngine()
+    results = engine.compute_batch(
+        {
+            "BTC": to_ohlcv(timestamps, high, low, close, volume),
+            "ETH": to_ohlcv(
+                timestamps[:60], high[:60], low[:60], close[:60], volume[:60]
+            ),
+        }
+    )
+    assert len(results["BTC"]["rsi"]) == 200
+    assert len(results["ETH"]["rsi"]) == 60
+    assert results["ETH"]["sma_50"][49] == pytest.approx(close[:50].mean())
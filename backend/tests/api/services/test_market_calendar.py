@@ -0,0 +1,28 @@
+from datetime import date, datetime
+import pytest
+from app.api.services.market_calendar import CBOE_CALENDAR, EASTERN, market_holidays
+
+
+def eastern(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=EASTERN)
+
+
+def test_holidays_include_floating_dates():
+    holidays = market_holidays(2025)
+    assert date(2025, 4, 18) in holidays  # Good Friday
+    assert date(2025, 11, 27) in holidays  # Thanksgiving
+    assert date(2027, 7, 5) in market_holidays(2027)  # July 4th observed
+
+
+def test_session_bounds():
+    assert CBOE_CALENDAR.is_open(eastern("2025-04-21T10:00"))
+    assert not CBOE_CALENDAR.is_open(eastern("2025-04-21T09:00"))
+    assert not CBOE_CALENDAR.is_open(eastern("2025-04-19T12:00"))
+
+
+def test_cache_ttl_holds_until_next_open():
+    # Thursday evening before Good Friday: next open is Monday 9:30
+    now = eastern("2025-04-17T17:00")
+    assert CBOE_CALENDAR.next_open(now) == eastern("2025-04-21T09:30")
+    assert CBOE_CALENDAR.cache_ttl(60, now) == pytest.approx(88.5 * 3600)
+    assert CBOE_CALENDAR.cache_ttl(60, eastern("2025-04-21T11:00")) == 60
@@ -0,0 +1,112 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock
+from app.api.services.fx_service import FXRateService
+from app.api.services.market_data_service import MarketDataService
+from app.api.services.symbol_resolver import SymbolResolver
+
+
+@pytest_asyncio.fixture
+async def market_data_service():
+    fx_service = FXRateService()
+    fx_service.update_rates({"USDT/CAD": {"last": 1.35}, "USDT/USD": {"last": 1.0}})
+    service = MarketDataService(fx_service, resolver=SymbolResolver())
+    service.exchange.load_markets = AsyncMock(
+        return_value={
+            f"{base}/USDT": {"base": base, "quote": "USDT"}
+            for base in ("BTC", "ETH", "LTC")
+        }
+    )
+    yield service
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_batches_requests(market_data_service):
+    market_data_service.exchange.fetch_tickers = AsyncMock(
+        return_value={
+            "BTC/USDT": {"last": 50000.0},
+            "ETH/USDT": {"last": 2500.0},
+        }
+    )
+
+    prices = await market_data_service.get_current_prices(["BTC", "ETH", "LTC"])
+
+    assert prices["BTC"] == pytest.approx(67500.0)
+    assert prices["ETH"] == pytest.approx(3375.0)
+    assert prices["LTC"] is None
+    market_data_service.exchange.fetch_tickers.assert_awaited_once_with(
+        ["BTC/USDT", "ETH/USDT", "LTC/USDT"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_skips_unlisted_symbols(market_data_service):
+    market_data_service.exchange.fetch_tickers = AsyncMock(
+        return_value={"BTC/USDT": {"last": 50000.0}}
+    )
+
+    prices = await market_data_service.get_current_prices(["BTC", "NOPE"])
+
+    assert prices["BTC"] == pytest.approx(67500.0)
+    assert prices["NOPE"] is None
+    market_data_service.exchange.fetch_tickers.assert_awaited_once_with(["BTC/USDT"])
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_falls_back_when_batch_fails(market_data_service):
+    async def fetch_ticker(pair):
+        if pair == "LTC/USDT":
+            raise Exception("BadSymbol")
+        return {"last": 100.0}
+
+    market_data_service.exchange.fetch_tickers = AsyncMock(
+        side_effect=Exception("BadSymbol")
+    )
+    market_data_service.exchange.fetch_ticker = fetch_ticker
+
+    prices = await market_data_service.get_current_prices(["BTC", "LTC"])
+
+    assert prices["BTC"] == pytest.approx(135.0)
+    assert prices["LTC"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_usd(market_data_service):
+    market_data_service.exchange.fetch_tickers = AsyncMock(
+        return_value={"BTC/USDT": {"last": 50000.0}}
+    )
+
+    prices = await market_data_service.get_current_prices(["BTC"], currency="USD")
+
+    assert prices == {"BTC": 50000.0}
+
+
+@pytest.mark.asyncio
+async def test_get_historical_data_converts_candles(market_data_service):
+    market_data_service.exchange.fetch_ohlcv = AsyncMock(
+        return_value=[[1708646400000, 100.0, 110.0, 90.0, 105.0, 12.5]]
+    )
+
+    data = await market_data_service.get_historical_data("BTC", limit=1)
+
+    assert len(data) == 1
+    assert data[0]["open"] == pytest.approx(135.0)
+    assert data[0]["close"] == pytest.approx(141.75)
+    assert data[0]["volume"] == 12.5
+
+
+@pytest.mark.asyncio
+async def test_market_loads_feed_the_resolver(market_data_service):
+    resolver = market_data_service.resolver
+    await market_data_service.load_markets()
+    assert resolver.resolve("LTC and ADA", crypto=True) == ["LTC"]
+
+    # A reload republishes the symbols priced as {symbol}/USDT
+    market_data_service.exchange.load_markets.return_value = {
+        "ADA/USDT": {"base": "ADA", "quote": "USDT"},
+        "KAS/USD": {"base": "KAS", "quote": "USD"},
+    }
+    await market_data_service.load_markets(reload=True)
+    assert resolver.resolve("LTC, ADA and KAS", crypto=True) == ["LTC", "ADA"]
+    assert resolver.symbols(["binance"]) == {"ADA"}
@@ -0,0 +1,107 @@
+import time
+import pytest
+from app.api.services.jobs import JobManager
+from app.api.services.social_service import (
+    SocialTimelineService,
+    decode_cursor,
+    encode_cursor,
+)
+from app.api.services.truthsocial_service import PostTimeline, TruthSocialService
+from app.api.services.twitter_service import TwitterService
+
+
+def tweet(tweet_id: str, username: str):
+    return {
+        "id": tweet_id,
+        "text": f"tweet {tweet_id}",
+        "author": {"username": username, "name": username, "profile_image_url": ""},
+    }
+
+
+@pytest.fixture
+def social_service():
+    """Timeline service over pre-filled caches, so no upstream calls are made"""
+    twitter = TwitterService()
+    timeline = twitter.store.timeline("alice")
+    timeline.add([(100.0, tweet("1", "alice")), (300.0, tweet("3", "alice"))])
+    timeline.add([(500.0, tweet("5", "alice")), (500.0, tweet("6", "alice"))])
+    timeline.fetched_at = time.time()
+
+    truthsocial = TruthSocialService(jobs=JobManager())
+    posts = PostTimeline(max_posts=10)
+    posts.add(
+        [
+            {"id": "t4", "createdAt": "1970-01-01T00:06:40Z", "username": "bob"},
+            {"id": "t2", "createdAt": "1970-01-01T00:03:20Z", "username": "bob"},
+        ]
+    )
+    posts.fetched_at = time.time()
+    truthsocial._timelines["bob"] = posts
+    return SocialTimelineService(twitter, truthsocial)
+
+
+@pytest.mark.asyncio
+async def test_timeline_merges_sources_and_paginates(social_service):
+    seen = []
+    cursor = None
+    while True:
+        page = await social_service.get_timeline(["alice"], ["@Bob"], 2, cursor)
+        seen.extend((post["source"], post["id"]) for post in page["data"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [
+        ("twitter", "6"),
+        ("twitter", "5"),
+        ("truthsocial", "t4"),
+        ("twitter", "3"),
+        ("truthsocial", "t2"),
+        ("twitter", "1"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_timeline_normalizes_posts(social_service):
+    page = await social_service.get_timeline(["alice"], ["bob"], limit=3)
+    tweet_post, _, truth_post = page["data"]
+
+    assert tweet_post["url"] == "https://x.com/alice/status/6"
+    assert tweet_post["created_at"] == "1970-01-01T00:08:20Z"
+    assert truth_post == {
+        "id": "t4",
+        "source": "truthsocial",
+        "username": "bob",
+        "name": None,
+        "avatar": None,
+        "text": "",
+        "created_at": "1970-01-01T00:06:40Z",
+        "url": None,
+        "media": [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_timeline_serves_other_sources_when_one_fails(social_service, caplog):
+    async def unavailable(identifiers):
+        raise RuntimeError("Apify run failed")
+
+    social_service.truthsocial.ensure_loaded = unavailable
+    page = await social_service.get_timeline(["alice"], ["bob"], limit=10)
+
+    assert [(p["source"], p["id"]) for p in page["data"]] == [
+        ("twitter", "6"),
+        ("twitter", "5"),
+        ("truthsocial", "t4"),
+        ("twitter", "3"),
+        ("truthsocial", "t2"),
+        ("twitter", "1"),
+    ]
+    assert "Error loading truthsocial posts: Apify run failed" in caplog.text
+
+
+def test_cursor_round_trip():
+    key = (1712767773.5, "twitter", "1910")
+    assert decode_cursor(encode_cursor(key)) == key
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
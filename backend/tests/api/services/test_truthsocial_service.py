@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from app.api.services.jobs import JobManager
+from app.api.services.truthsocial_service import TruthSocialService, identifier_key
+
+
+def make_post(post_id: str, username: str, created_at: str):
+    return {
+        "id": post_id,
+        "text": f"post {post_id}",
+        "createdAt": created_at,
+        "username": username,
+        "name": username.title(),
+        "profileUrl": f"https://truthsocial.com/@{username}",
+        "mediaUrls": [],
+    }
+
+
+DATASET = [
+    make_post("2", "realDonaldTrump", "2025-04-10T16:49:33.000Z"),
+    make_post("1", "realDonaldTrump", "2025-04-10T10:00:00.000Z"),
+    make_post("3", "WhiteHouse", "2025-04-10T18:00:00.000Z"),
+    make_post("2", "realDonaldTrump", "2025-04-10T16:49:33.000Z"),
+]
+
+
+@pytest_asyncio.fixture
+async def apify_api():
+    """Local stand-in for the Apify actor, run and dataset endpoints"""
+    calls = []
+    runs = {}
+    options = {"fail": False}
+
+    async def start_run(request):
+        calls.append(request.path)
+        if options["fail"]:
+            return web.json_response({"error": "actor unavailable"}, status=500)
+        body = await request.json()
+        runs["run-1"] = {"identifiers": body["identifiers"], "polls": 0}
+        return web.json_response(
+            {"data": {"id": "run-1", "status": "RUNNING", "defaultDatasetId": "ds-1"}},
+            status=201,
+        )
+
+    async def get_run(request):
+        calls.append(request.path)
+        run = runs[request.match_info["run_id"]]
+        run["polls"] += 1
+        status = "SUCCEEDED" if run["polls"] > 1 else "RUNNING"
+        return web.json_response(
+            {"data": {"id": "run-1", "status": status, "defaultDatasetId": "ds-1"}}
+        )
+
+    async def dataset_items(request):
+        calls.append(request.path)
+        requested = {identifier_key(i) for i in runs["run-1"]["identifiers"]}
+        return web.json_response(
+            [item for item in DATASET if identifier_key(item["username"]) in requested]
+        )
+
+    app = web.Application()
+    app.router.add_post("/v2/acts/{actor}/runs", start_run)
+    app.router.add_get("/v2/actor-runs/{run_id}", get_run)
+    app.router.add_get("/v2/datasets/{dataset_id}/items", dataset_items)
+    server = TestServer(app)
+    await server.start_server()
+    server.calls = calls
+    server.runs = runs
+    server.options = options
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def truthsocial_service(apify_api):
+    jobs = JobManager()
+    service = TruthSocialService(jobs=jobs, poll_interval=0)
+    service.base_url = str(apify_api.make_url("")).rstrip("/")
+    yield service
+    await jobs.shutdown()
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_cold_request_waits_for_scrape(truthsocial_service, apify_api):
+    posts = await truthsocial_service.get_posts(
+        ["https://truthsocial.com/@realDonaldTrump", "whitehouse"]
+    )
+
+    assert [p["id"] for p in posts] == ["3", "2", "1"]
+    assert apify_api.runs["run-1"]["polls"] == 2
+    assert apify_api.calls.count("/v2/datasets/ds-1/items") == 1
+
+    # Fresh cache: served without another run
+    limited = await truthsocial_service.get_posts(["realDonaldTrump"], limit=1)
+    assert [p["id"] for p in limited] == ["2"]
+    assert apify_api.calls.count("/v2/datasets/ds-1/items") == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_accounts_refresh_in_background(truthsocial_service, apify_api):
+    await truthsocial_service.get_posts(["realDonaldTrump"])
+    truthsocial_service.refresh_interval = 0
+
+    posts = await truthsocial_service.get_posts(["realDonaldTrump"])
+    assert [p["id"] for p in posts] == ["2", "1"]
+
+    # Concurrent refreshes of the same accounts share one job
+    job = truthsocial_service.refresh(["realDonaldTrump"])
+    assert truthsocial_service.refresh(["@realdonaldtrump"]) is job
+    await asyncio.wait_for(job.wait(), 5)
+    assert job.status == "succeeded"
+    assert job.to_dict()["result"] == {"realdonaldtrump": 0}
+
+
+@pytest.mark.asyncio
+async def test_accounts_in_flight_are_not_scraped_twice(truthsocial_service, apify_api):
+    first = truthsocial_service.refresh(["realDonaldTrump", "WhiteHouse"])
+    assert not truthsocial_service.needs_refresh("realDonaldTrump")
+    assert truthsocial_service.refresh(["@realdonaldtrump"]) is first
+
+    # A cold request for one of the accounts waits for the running scrape
+    posts = await truthsocial_service.get_posts(["realDonaldTrump"])
+    assert [p["id"] for p in posts] == ["2", "1"]
+    runs = "/v2/acts/louisdeconinck~truth-social-scraper/runs"
+    assert apify_api.calls.count(runs) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_scrape_backs_off(truthsocial_service, apify_api):
+    apify_api.options["fail"] = True
+    with pytest.raises(RuntimeError):
+        await truthsocial_service.get_posts(["realDonaldTrump"])
+    # Within the backoff the failure is reported without starting a run
+    with pytest.raises(RuntimeError):
+        await truthsocial_service.get_posts(["realDonaldTrump"])
+    assert (
+        apify_api.calls.count("/v2/acts/louisdeconinck~truth-social-scraper/runs") == 1
+    )
+    assert not truthsocial_service.needs_refresh("realDonaldTrump")
+
+    apify_api.options["fail"] = False
+    truthsocial_service.retry_backoff = 0
+    posts = await truthsocial_service.get_posts(["realDonaldTrump"])
+    assert [p["id"] for p in posts] == ["2", "1"]
+
+
+def test_identifier_key():
+    assert identifier_key("https://truthsocial.com/@WhiteHouse/") == "whitehouse"
+    assert identifier_key(" @WhiteHouse ") == "whitehouse"
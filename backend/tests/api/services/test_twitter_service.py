@@ -0,0 +1,193 @@
+import random
+import string
+import time
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from app.api.services.tweet_filter import compile_filter, parse_filters
+from app.api.services.tweet_store import TweetStore
+from app.api.services.twitter_service import TwitterService
+
+
+def make_tweet(tweet_id: str, username: str, created_at: str, text: str = "gm"):
+    return {
+        "id": tweet_id,
+        "text": text,
+        "createdAt": created_at,
+        "author": {"userName": username, "name": username, "profilePicture": ""},
+        "retweetCount": 0,
+        "replyCount": 0,
+        "likeCount": 0,
+        "quoteCount": 0,
+    }
+
+
+TIMELINES = {
+    "alice": [
+        make_tweet(
+            "3", "alice", "Thu Apr 10 16:49:33 +0000 2025", "Bitcoin breaks out"
+        ),
+        make_tweet("1", "alice", "Thu Apr 10 10:00:00 +0000 2025"),
+    ],
+    "bob": [
+        make_tweet("4", "bob", "Thu Apr 10 18:00:00 +0000 2025"),
+        make_tweet("2", "bob", "Thu Apr 10 12:30:00 +0000 2025", "ETH and bitcoin"),
+        make_tweet("0", "bob", "not a date"),
+    ],
+}
+
+
+@pytest_asyncio.fixture
+async def twitter_api():
+    """Local stand-in for the tweet search API"""
+    queries = []
+
+    async def search(request):
+        query = request.query["query"]
+        queries.append(query)
+        terms = dict(term.split(":", 1) for term in query.split())
+        since_id = int(terms.get("since_id", -1))
+        tweets = [
+            tweet
+            for tweet in TIMELINES.get(terms["from"], [])
+            if int(tweet["id"]) > since_id
+        ]
+        return web.json_response({"tweets": tweets, "has_next_page": False})
+
+    app = web.Application()
+    app.router.add_get("/twitter/tweet/advanced_search", search)
+    server = TestServer(app)
+    await server.start_server()
+    server.queries = queries
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def twitter_service(twitter_api):
+    service = TwitterService()
+    service.base_url = str(twitter_api.make_url("/twitter/tweet/advanced_search"))
+    yield service
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_get_user_tweets_merges_newest_first(twitter_service, twitter_api):
+    tweets = await twitter_service.get_user_tweets(["alice", "bob"], limit=4)
+
+    assert [t["id"] for t in tweets] == ["4", "3", "2", "1"]
+    assert tweets[0]["author"]["username"] == "bob"
+    assert sorted(twitter_api.queries) == ["from:alice", "from:bob"]
+
+    everything = await twitter_service.get_user_tweets(["alice", "bob"], limit=10)
+    assert everything[-1]["id"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_get_user_tweets_applies_keyword_filters(twitter_service):
+    tweets = await twitter_service.get_user_tweets(
+        ["alice", "bob"], filters={"alice": ["BITCOIN"], "bob": ["bitcoin"]}
+    )
+
+    assert [t["id"] for t in tweets] == ["3", "2"]
+
+
+@pytest.mark.asyncio
+async def test_timelines_are_cached_and_synced_incrementally(
+    twitter_service, twitter_api, monkeypatch
+):
+    await twitter_service.get_user_tweets(["alice", "bob"])
+    # Overlapping feed within the refresh interval: no upstream calls
+    await twitter_service.get_user_tweets(["Bob", "carol"])
+    assert sorted(twitter_api.queries) == ["from:alice", "from:bob", "from:carol"]
+
+    monkeypatch.setitem(
+        TIMELINES,
+        "bob",
+        [make_tweet("5", "bob", "Thu Apr 10 19:00:00 +0000 2025")] + TIMELINES["bob"],
+    )
+    twitter_service.store.min_refresh = 0
+    tweets = await twitter_service.get_user_tweets(["bob"], limit=3)
+
+    assert twitter_api.queries[-1] == "from:bob since_id:4"
+    assert [t["id"] for t in tweets] == ["5", "4", "2"]
+
+
+def test_account_timeline_is_bounded_and_filters_by_time():
+    store = TweetStore(max_tweets=2)
+    timeline = store.timeline("@Alice")
+    added = timeline.add(
+        [(30.0, {"id": "3"}), (10.0, {"id": "1"}), (20.0, {"id": "2"})]
+    )
+
+    assert added == 3
+    assert store.get("alice") is timeline
+    assert [tweet["id"] for _, tweet in timeline.since()] == ["3", "2"]
+    assert [tweet["id"] for _, tweet in timeline.since(25.0)] == ["3"]
+    assert timeline.add([(30.0, {"id": "3"})]) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_user_tweets_excludes_and_matches_whole_words(twitter_service):
+    tweets = await twitter_service.get_user_tweets(
+        ["alice", "bob"], filters={"alice": ["bitcoin"], "bob": ["bitcoin", "-eth"]}
+    )
+    assert [t["id"] for t in tweets] == ["3"]
+
+    tweets = await twitter_service.get_user_tweets(
+        ["alice"], filters={"alice": ["break"]}, whole_words=True
+    )
+    assert tweets == []
+
+
+def test_keyword_filter():
+    keyword_filter = compile_filter(("BTC", "$eth", "-scam"), whole_words=True)
+
+    assert keyword_filter.matches("btc to the moon")
+    assert keyword_filter.matches("Long $ETH.")
+    assert not keyword_filter.matches("BTCUSD perp")
+    assert not keyword_filter.matches("BTC SCAM alert")
+    assert compile_filter(("-scam",)).matches("anything else")
+    assert compile_filter(("strasse",)).matches("Hauptstraße")
+    phrase = compile_filter(("rate cut", "cut"), whole_words=True)
+    assert phrase.matches("Fed rate cut today")
+    assert not phrase.matches("rate cuts ahead")
+
+    assert parse_filters(["alice:btc, -eth", "bob:sol", "alice:doge"]) == {
+        "alice": ["btc", "-eth", "doge"],
+        "bob": ["sol"],
+    }
+    with pytest.raises(ValueError):
+        parse_filters(["btc"])
+
+
+def test_keyword_filter_scales_with_many_keywords():
+    rng = random.Random(0)
+    vocabulary = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for _ in range(5000)
+    ]
+    keywords = rng.sample(vocabulary, 300)
+    tweets = [" ".join(rng.choices(vocabulary, k=25)) + "!" for _ in range(3000)]
+    keyword_set = set(keywords)
+
+    started = time.perf_counter()
+    naive = [any(keyword in tweet for keyword in keywords) for tweet in tweets]
+    naive_elapsed = time.perf_counter() - started
+
+    for whole_words in (False, True):
+        keyword_filter = compile_filter(tuple(keywords), whole_words=whole_words)
+        started = time.perf_counter()
+        matched = [keyword_filter.matches(tweet) for tweet in tweets]
+        elapsed = time.perf_counter() - started
+
+        if whole_words:
+            assert matched == [
+                not keyword_set.isdisjoint(tweet.rstrip("!").split())
+                for tweet in tweets
+            ]
+        else:
+            assert matched == naive
+        # Several times faster than checking each keyword in turn
+        assert elapsed < naive_elapsed / 2
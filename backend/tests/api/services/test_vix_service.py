@@ -0,0 +1,158 @@
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+import yfinance as yf
+from app.api.services import vix_service as vix_module
+from app.api.services.vix_service import VIXService, percentile_rank
+
+TICKERS = ["^VIX9D", "^VIX", "^VIX3M", "^VIX6M", "^VVIX"]
+
+
+def download_frame(rows):
+    """A ``yf.download`` result for ``TICKERS`` with one row per day"""
+    dates = pd.date_range("2025-01-01", periods=len(rows), freq="D")
+    columns = pd.MultiIndex.from_product([["Close", "Open"], TICKERS])
+    values = np.array(rows, dtype=np.float64)
+    return pd.DataFrame(np.hstack([values, values]), index=dates, columns=columns)
+
+
+class FixedCalendar:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+
+    def cache_ttl(self, open_ttl: float) -> float:
+        return self.ttl
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(vix_module.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    calls = []
+    frame = download_frame(
+        [
+            [14.0, 16.0, 18.0, 19.0, 90.0],
+            [15.0, 17.0, 18.5, 19.5, 95.0],
+            [16.0, 18.0, 19.0, 20.0, 100.0],
+        ]
+    )
+
+    def download(tickers, **kwargs):
+        calls.append(tickers)
+        return frame
+
+    monkeypatch.setattr(yf, "download", download)
+    return calls
+
+
+class FakeTicker:
+    """``yf.Ticker`` stand-in recording history calls and their threads"""
+
+    calls = []
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, period):
+        FakeTicker.calls.append((self.symbol, period, threading.current_thread()))
+        dates = pd.date_range("2025-01-01", periods=3, freq="D", name="Date")
+        return pd.DataFrame(
+            {
+                "Open": [19.0, 20.5, 22.0],
+                "High": [21.0, 23.0, 22.5],
+                "Low": [18.5, 20.0, 20.75],
+                "Close": [20.0, 22.0, 21.0],
+                "Volume": [0, 0, 0],
+            },
+            index=dates,
+        )
+
+
+@pytest.mark.asyncio
+async def test_vix_data_downloads_once_per_ttl(monkeypatch, clock):
+    monkeypatch.setattr(FakeTicker, "calls", [])
+    monkeypatch.setattr(yf, "Ticker", FakeTicker)
+    service = VIXService(calendar=FixedCalendar(60))
+
+    data = await service.get_vix_data()
+    assert await service.get_vix_data() is data
+    # One 30-day download feeds both views, off the event loop thread
+    [(symbol, period, thread)] = FakeTicker.calls
+    assert (symbol, period) == ("^VIX", "30d")
+    assert thread is not threading.current_thread()
+
+    # Same payload as the separate 1d and 30d downloads produced
+    assert data == {
+        "current": {
+            "price": 21.0,
+            "change": -4.55,
+            "high": 22.5,
+            "low": 20.75,
+            "volume": 0,
+        },
+        "historical": [
+            {"Date": "2025-01-01", "Close": 20.0, "Change": 0.0},
+            {"Date": "2025-01-02", "Close": 22.0, "Change": 10.0},
+            {"Date": "2025-01-03", "Close": 21.0, "Change": -4.55},
+        ],
+    }
+
+    clock[0] += 61
+    await service.get_vix_data()
+    assert len(FakeTicker.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_volatility_complex_downloads_once_per_ttl(downloads, clock):
+    service = VIXService(calendar=FixedCalendar(60))
+
+    first = await service.get_volatility_complex()
+    again = await service.get_volatility_complex()
+    assert again is first
+    # Every index comes from one batched download
+    assert downloads == [TICKERS]
+
+    clock[0] += 61
+    await service.get_volatility_complex()
+    assert len(downloads) == 2
+
+
+def test_percentile_rank_ignores_missing_observations():
+    history = np.array([[1.0, np.nan], [3.0, 2.0], [2.0, 4.0]])
+    np.testing.assert_allclose(percentile_rank(history), [200 / 3, 100.0])
+
+
+@pytest.mark.asyncio
+async def test_volatility_complex_slope_ratios_and_structure(downloads):
+    data = await VIXService(calendar=FixedCalendar(60)).get_volatility_complex()
+
+    expected_slope = np.polyfit([9, 30, 93, 182], [16.0, 18.0, 19.0, 20.0], 1)[0]
+    term = data["term_structure"]
+    assert term["slope"] == pytest.approx(expected_slope, abs=1e-4)
+    assert term["values"] == [16.0, 18.0, 19.0, 20.0]
+    assert term["structure"] == "contango"
+    assert data["ratios"]["vix_vix3m"]["value"] == pytest.approx(18 / 19, abs=1e-4)
+    assert data["ratios"]["vix9d_vix"]["value"] == pytest.approx(16 / 18, abs=1e-4)
+    # The latest VIX is the highest of the three sessions
+    assert data["indices"]["^VIX"]["percentile"] == 100.0
+    assert data["indices"]["^VIX"]["change"] == pytest.approx(5.88)
+
+
+@pytest.mark.asyncio
+async def test_structure_is_unknown_without_vix3m(monkeypatch):
+    frame = download_frame(
+        [[14.0, 16.0, np.nan, 19.0, 90.0], [15.0, 17.0, np.nan, 19.5, 95.0]]
+    )
+    monkeypatch.setattr(yf, "download", lambda tickers, **kwargs: frame)
+
+    data = await VIXService(calendar=FixedCalendar(60)).get_volatility_complex()
+
+    assert data["term_structure"]["structure"] is None
+    assert data["term_structure"]["slope"] is None
+    assert data["ratios"]["vix_vix3m"]["value"] is None